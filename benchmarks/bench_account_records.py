@@ -0,0 +1,59 @@
+"""
+Compares the memory footprint of economy accounts held as nested dicts against
+the slotted `PlayerRecord` classes in cogs/economy/utils.py, along with the cost
+of converting between the two.
+
+Run from the repository root:
+    python -m benchmarks.bench_account_records --users 100000
+"""
+import argparse, gc, time, tracemalloc
+from typing import Any, Callable, Dict, Tuple
+
+from benchmarks.bench_json_writer import make_economy
+from bot_utils import dumps_json, loads_json
+from cogs.economy.utils import PlayerRecord
+
+def allocated(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Returns what `build` made and the bytes still allocated for it."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def timed(build: Callable[[], Any]) -> float:
+    """Returns how long `build` takes in ms (timed without tracemalloc, which slows allocation)."""
+    start = time.perf_counter()
+    build()
+    return (time.perf_counter() - start) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[100000])
+    args = parser.parse_args()
+
+    for users in args.users:
+        raw = dumps_json(make_economy(users))
+
+        def load_dicts() -> Dict[str, Any]:
+            return loads_json(raw)
+
+        def load_records() -> Dict[str, PlayerRecord]:
+            return {user_id: PlayerRecord.from_dict(player) for user_id, player in loads_json(raw).items()}
+
+        dicts, dict_size = allocated(load_dicts)
+        records, record_size = allocated(load_records)
+        dict_ms, record_ms = timed(load_dicts), timed(load_records)
+        to_dict_ms = timed(lambda: [player.to_dict() for player in records.values()])
+        dump_ms, record_dump_ms = timed(lambda: dumps_json(dicts)), timed(lambda: dumps_json(records))
+        assert loads_json(dumps_json(records)) == dicts
+
+        print(f"\n{users:,} accounts")
+        print(f"{'representation':<20}{'MiB':>10}{'B/account':>12}{'load ms':>10}{'dump ms':>10}")
+        print(f"{'dict':<20}{dict_size / 1024 / 1024:>10.1f}{dict_size / users:>12.0f}{dict_ms:>10.0f}{dump_ms:>10.0f}")
+        print(f"{'PlayerRecord':<20}{record_size / 1024 / 1024:>10.1f}{record_size / users:>12.0f}{record_ms:>10.0f}{record_dump_ms:>10.0f}")
+        print(f"records use {record_size / dict_size:.0%} of the dict memory; to_dict for all accounts takes {to_dict_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Drives the API-backed slash commands offline and reports latency and upstream calls.
+
+The cogs are loaded into a bot that never logs in, and each scenario's command
+callback is called directly with a fake interaction that records what the
+command sends. Upstream HTTP goes to the record/replay stand-in server from
+`benchmarks.http_replay`, so runs are repeatable and need no network.
+
+Record fixtures once against the live APIs (needs real keys in storage/secrets.env):
+    python -m benchmarks.bench_commands --record
+
+Then benchmark offline, optionally with added latency and injected errors:
+    python -m benchmarks.bench_commands --iterations 20
+    python -m benchmarks.bench_commands --latency 0.08 --jitter 0.04 --error-rate 0.1
+    python -m benchmarks.bench_commands --scenarios "hypixel profile" "roblox info" --concurrency 10
+
+Requests without a fixture are answered with a 404 and listed at the end. When
+replaying, the per-API rate limiters are lifted unless `--rate-limits` is given,
+so the numbers show the command and cache cost rather than the token bucket.
+
+To add a command, add it to `SCENARIOS` as its qualified name and keyword arguments.
+"""
+import argparse, asyncio, os, shutil, statistics, sys, tempfile, time, traceback
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.http_replay import FixtureStore, replay_http
+
+DEFAULT_FIXTURES = "benchmarks/fixtures/commands.json"
+
+# Qualified command name -> keyword arguments for its callback.
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "hypixel profile": {"username": "Technoblade"},
+    "hypixel skyblock profile": {"username": "Technoblade"},
+    "roblox info": {"username": "builderman"},
+    "roblox description": {"username": "builderman"},
+    "cgloves check": {"username": "builderman"},
+    "cr profile": {"tag": "#2PP"},
+    "cr clan": {"clantag": "#2PP"},
+    "btd6 races": {},
+    "gd profile": {"username": "RobTop"},
+    "fact": {},
+    "joke": {},
+    "cat": {},
+    "dog": {},
+}
+
+COGS = ["hypixel", "roblox", "cr", "btd6", "gd", "fun"]
+
+class FakeAsset:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+class FakeUser:
+    def __init__(self, user_id: int = 100000000000000001):
+        self.id = user_id
+        self.name = "benchmark"
+        self.display_name = "Benchmark"
+        self.mention = f"<@{user_id}>"
+        self.avatar = FakeAsset()
+        self.display_avatar = FakeAsset()
+        self.bot = False
+
+class FakeMessage:
+    """A sent message; edits and deletes are recorded on the interaction."""
+    def __init__(self, interaction: "FakeInteraction", content: Any = None, embed: Any = None):
+        self.interaction = interaction
+        self.id = len(interaction.sent)
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, content: Any = None, embed: Any = None, **kwargs: Any) -> "FakeMessage":
+        self.interaction._record(content, embed, kwargs)
+        return self
+
+    async def delete(self, **kwargs: Any) -> None:
+        pass
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._done = True
+
+    async def send_message(self, content: Any = None, embed: Any = None, **kwargs: Any) -> None:
+        self._done = True
+        self.interaction._record(content, embed, kwargs)
+
+    async def edit_message(self, content: Any = None, embed: Any = None, **kwargs: Any) -> None:
+        self._done = True
+        self.interaction._record(content, embed, kwargs)
+
+    async def send_modal(self, modal: Any) -> None:
+        self._done = True
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+
+    async def send(self, content: Any = None, embed: Any = None, **kwargs: Any) -> FakeMessage:
+        self.interaction._record(content, embed, kwargs)
+        return FakeMessage(self.interaction, content, embed)
+
+class FakeInteraction:
+    """
+    Stands in for a `discord.Interaction` in DMs, recording everything the command sends.
+
+    Attributes:
+        sent (List[Tuple[Any, Any]]): (content, embed) of every message sent or edited
+    """
+    def __init__(self, client: Any):
+        self.client = client
+        self.user = FakeUser()
+        self.guild = None
+        self.guild_id = None
+        self.channel = None
+        self.message = None
+        self.created_at = datetime.now(timezone.utc)
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent: List[Tuple[Any, Any]] = []
+
+    def _record(self, content: Any, embed: Any, kwargs: Dict[str, Any]) -> None:
+        embeds = kwargs.get("embeds") or []
+        self.sent.append((content, embed if embed is not None else (embeds[0] if embeds else None)))
+
+    async def original_response(self) -> FakeMessage:
+        return FakeMessage(self)
+
+    async def edit_original_response(self, content: Any = None, embed: Any = None, **kwargs: Any) -> FakeMessage:
+        self._record(content, embed, kwargs)
+        return FakeMessage(self, content, embed)
+
+    async def delete_original_response(self) -> None:
+        pass
+
+    async def send(self, content: Any = None, embed: Any = None, **kwargs: Any) -> FakeMessage:
+        # `handle_logs` treats anything that is not a real Interaction as a Context
+        self._record(content, embed, kwargs)
+        return FakeMessage(self, content, embed)
+
+    def failed(self) -> bool:
+        """Returns whether the command reported an error through `handle_logs`."""
+        return any(embed is not None and str(getattr(embed, "title", "")).startswith("An error occurred") for _, embed in self.sent)
+
+async def load_bot(cogs: List[str]) -> Any:
+    import discord
+    from discord.ext import commands
+
+    bot = commands.Bot(command_prefix="!", intents=discord.Intents.default())
+    for cog in cogs:
+        await bot.load_extension(f"cogs.{cog}")
+    return bot
+
+def find_command(bot: Any, qualified_name: str) -> Any:
+    """Looks up an app command by its qualified name, e.g. "hypixel skyblock profile"."""
+    parts = qualified_name.split()
+    command = bot.tree.get_command(parts[0])
+    for part in parts[1:]:
+        command = command.get_command(part) if command is not None else None
+    if command is None:
+        raise KeyError(f"No app command named {qualified_name!r}")
+    return command
+
+async def invoke(bot: Any, command: Any, kwargs: Dict[str, Any]) -> Tuple[float, bool]:
+    interaction = FakeInteraction(bot)
+    start = time.perf_counter()
+    try:
+        if command.binding is not None:
+            await command.callback(command.binding, interaction, **kwargs)
+        else:
+            await command.callback(interaction, **kwargs)
+        failed = interaction.failed()
+    except Exception:
+        traceback.print_exc()
+        failed = True
+    return (time.perf_counter() - start) * 1000, failed
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def lift_rate_limits() -> None:
+    from bot_utils import api_limiters
+
+    for limiter in api_limiters.values():
+        limiter.rate = limiter.burst = limiter.tokens = 1e9
+
+async def run(args: argparse.Namespace) -> None:
+    from bot_utils import http_client, json_cache
+
+    if not args.rate_limits and not args.record:
+        lift_rate_limits()
+    bot = await load_bot(args.cogs)
+    store = FixtureStore(args.fixtures)
+
+    # Commands read and write storage/ relative to the working directory, so run them on a copy
+    scratch = tempfile.mkdtemp(prefix="bench_commands_")
+    shutil.copytree("storage", os.path.join(scratch, "storage"), ignore=shutil.ignore_patterns("economy.db*", "fonts"))
+    os.chdir(scratch)
+
+    options = {"record": args.record, "latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate, "seed": args.seed}
+    async with replay_http(store, **options) as server:
+        print(f"{'command':<28}{'runs':>6}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'calls/run':>11}{'first run':>11}")
+        for name in args.scenarios:
+            command = find_command(bot, name)
+            kwargs = SCENARIOS.get(name, {})
+
+            before = server.stats()["calls"]
+            first_ms, first_failed = await invoke(bot, command, kwargs)
+            first_calls = server.stats()["calls"] - before
+
+            timings: List[float] = [first_ms]
+            errors = int(first_failed)
+            remaining = args.iterations - 1
+            while remaining > 0:
+                batch = min(args.concurrency, remaining)
+                results = await asyncio.gather(*(invoke(bot, command, kwargs) for _ in range(batch)))
+                timings.extend(ms for ms, _ in results)
+                errors += sum(failed for _, failed in results)
+                remaining -= batch
+            calls = server.stats()["calls"] - before
+
+            print(f"{name:<28}{len(timings):>6}{errors:>8}{statistics.median(timings):>10.2f}"
+                  f"{percentile(timings, 0.99):>10.2f}{statistics.fmean(timings):>10.2f}"
+                  f"{calls / len(timings):>11.2f}{first_calls:>11}")
+
+        stats = server.stats()
+        print(f"\nupstream calls per host: {stats['calls_per_host']}")
+        if stats["injected_errors"]:
+            print(f"injected errors: {stats['injected_errors']}")
+        if stats["missing_fixtures"]:
+            print(f"requests without a fixture ({len(stats['missing_fixtures'])}), record them with --record:")
+            for key, count in sorted(stats["missing_fixtures"].items()):
+                print(f"    {count:>4}  {key}")
+
+    if args.record:
+        print(f"\nSaved {len(store.responses)} fixtures to {args.fixtures}")
+    await http_client.close()
+    json_cache.flush()
+    json_cache.invalidate()
+    shutil.rmtree(scratch, ignore_errors=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--cogs", nargs="+", default=COGS)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--record", action="store_true", help="Forward to the live APIs and save the responses")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1, help="Invocations run at once after the first")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every replayed response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many random extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of replayed requests answered with a 503")
+    parser.add_argument("--rate-limits", action="store_true", help="Keep the per-API token buckets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    args.fixtures = os.path.abspath(args.fixtures)
+    if args.record:
+        args.iterations = 1
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Compares the JSON-backed command cooldown helpers with `CooldownManager`.
+
+Each case writes a synthetic member_info.json for N users to a scratch
+directory and replays random command uses: a cooldown check, then an update if
+the command may run. The legacy helpers are the member_info.json versions of
+`check_command_cooldown` and `update_command_cooldown` that the manager
+replaced. member_info.json is flushed every `--flush-every` operations, as the
+background flush would, to count the whole-file rewrites each approach causes.
+
+Run from the repository root:
+    python -m benchmarks.bench_cooldowns --users 1000 10000 100000 --ops 20000
+"""
+import argparse, os, random, statistics, sys, tempfile, time
+from typing import Callable, Dict, Any, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_storage import make_member_info
+from bot_utils import json_cache, open_json, save_json, write_json_atomic, CooldownManager
+
+MEMBER_PATH = "storage/member_info.json"
+
+# Command -> cooldown in seconds, with the relative weight of each command in the mix.
+COMMANDS = {
+    "beg": (10, 50),
+    "search": (30, 30),
+    "hunt": (15, 15),
+    "daily": (86400, 5),
+}
+
+def legacy_check_command_cooldown(user_id: str, command_name: str, cooldown_seconds: int) -> Tuple[bool, int]:
+    """check_command_cooldown before the cooldown manager."""
+    member_info = open_json(MEMBER_PATH)
+    current_time = int(time.time())
+
+    if str(user_id) not in member_info:
+        member_info[str(user_id)] = {"commands": {}}
+
+    user_data = member_info[str(user_id)]
+    if "commands" not in user_data:
+        user_data["commands"] = {}
+
+    cmd_data = user_data["commands"].get(command_name, {"uses": 0, "cooldown": 0})
+
+    if current_time - cmd_data["cooldown"] < cooldown_seconds:
+        remaining = cooldown_seconds - (current_time - cmd_data["cooldown"])
+        return True, remaining
+
+    return False, 0
+
+def legacy_update_command_cooldown(user_id: str, command_name: str) -> None:
+    """update_command_cooldown before the cooldown manager."""
+    member_info = open_json(MEMBER_PATH)
+    current_time = int(time.time())
+
+    if str(user_id) not in member_info:
+        member_info[str(user_id)] = {"commands": {}}
+
+    user_data = member_info[str(user_id)]
+    if "commands" not in user_data:
+        user_data["commands"] = {}
+
+    if command_name not in user_data["commands"]:
+        user_data["commands"][command_name] = {"uses": 0, "cooldown": 0}
+
+    user_data["commands"][command_name]["uses"] += 1
+    user_data["commands"][command_name]["cooldown"] = current_time
+
+    save_json(MEMBER_PATH, member_info)
+
+def legacy_use(user_id: str, command: str, cooldown: int) -> bool:
+    on_cooldown, _ = legacy_check_command_cooldown(user_id, command, cooldown)
+    if not on_cooldown:
+        legacy_update_command_cooldown(user_id, command)
+    return not on_cooldown
+
+def manager_use(manager: CooldownManager) -> Callable[[str, str, int], bool]:
+    def use(user_id: str, command: str, cooldown: int) -> bool:
+        on_cooldown, _ = manager.check(user_id, command, cooldown)
+        if not on_cooldown:
+            manager.hit(user_id, command, cooldown)
+        return not on_cooldown
+    return use
+
+def run(use: Callable[[str, str, int], bool], users: int, ops: int, flush_every: int, seed: int) -> Dict[str, float]:
+    rng = random.Random(seed)
+    names = list(COMMANDS)
+    weights = [weight for _, weight in COMMANDS.values()]
+    timings: List[float] = []
+    allowed = rewrites = written = 0
+
+    for i in range(ops):
+        user_id = str(100000000000000000 + rng.randrange(users))
+        command = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        allowed += use(user_id, command, COMMANDS[command][0])
+        timings.append((time.perf_counter() - start) * 1_000_000)
+
+        if (i + 1) % flush_every == 0 or i + 1 == ops:
+            if json_cache.flush(MEMBER_PATH):
+                rewrites += 1
+                written += os.path.getsize(MEMBER_PATH)
+
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "mean": statistics.fmean(timings),
+        "allowed": allowed,
+        "rewrites": rewrites,
+        "written": written,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--flush-every", type=int, default=1000, help="Operations between member_info.json flushes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cases = {
+        "legacy (member_info.json)": lambda: legacy_use,
+        "CooldownManager": lambda: manager_use(CooldownManager()),
+    }
+
+    root = os.getcwd()
+    for users in args.users:
+        print(f"\n{users:,} users, {args.ops:,} command uses")
+        print(f"{'helper':<28}{'p50 us':>10}{'p99 us':>10}{'mean us':>10}{'allowed':>10}{'rewrites':>10}{'written MiB':>13}")
+        for name, build in cases.items():
+            with tempfile.TemporaryDirectory() as directory:
+                os.chdir(directory)
+                os.makedirs("storage")
+                write_json_atomic(MEMBER_PATH, make_member_info(users, args.seed))
+                json_cache.invalidate()
+                try:
+                    result = run(build(), users, args.ops, args.flush_every, args.seed)
+                finally:
+                    json_cache.invalidate()
+                    os.chdir(root)
+            print(f"{name:<28}{result['p50']:>10.2f}{result['p99']:>10.2f}{result['mean']:>10.2f}"
+                  f"{result['allowed']:>10}{result['rewrites']:>10}{result['written'] / 2**20:>13.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares write latency and file size of the JSON writers in bot_utils.file_handler.
+
+Run from the repository root:
+    python -m benchmarks.bench_json_writer --users 10000 --rounds 20
+"""
+import argparse, json, os, random, statistics, tempfile, time
+from typing import Callable, Dict, Any, List
+
+from bot_utils import file_handler
+from bot_utils.file_handler import write_json_atomic, write_json_pretty
+
+def make_economy(users: int, seed: int = 0) -> Dict[str, Any]:
+    """Builds a synthetic economy.json with `users` PlayerData records."""
+    rng = random.Random(seed)
+    items = ["lifesaver", "fishing_rod", "candy", "bank_note", "fake_id", "stick", "string"]
+    eco = {}
+    for i in range(users):
+        eco[str(100000000000000000 + i)] = {
+            "playerID": i + 1,
+            "joinTimestamp": 1700000000 + i,
+            "levels": {"EXP": rng.randint(0, 10**6), "retire": 0, "prestige": 0, "rebirth": 0},
+            "balance": {"bank": rng.randint(0, 10**7), "purse": rng.randint(0, 10**6), "maxBank": 25000, "fish_tokens": 0},
+            "inventory": {name: rng.randint(1, 20) for name in rng.sample(items, 3)},
+            "boosts": {"coins": 100, "exp": 100},
+            "commands": {"beg": {"uses": rng.randint(0, 500), "cooldown": 1700000000}},
+        }
+    return eco
+
+def legacy_writer(filename: str, data: Dict[str, Any]) -> int:
+    """The save_json writer before the write modes were added."""
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=4, default=lambda o: o.to_dict() if hasattr(o, "to_dict") else o)
+    return os.path.getsize(filename)
+
+def stdlib_atomic_writer(filename: str, data: Dict[str, Any]) -> int:
+    """The atomic writer with orjson disabled."""
+    backend = file_handler.orjson
+    file_handler.orjson = None
+    try:
+        return write_json_atomic(filename, data)
+    finally:
+        file_handler.orjson = backend
+
+def run(writer: Callable[[str, Dict[str, Any]], int], data: Dict[str, Any], rounds: int) -> Dict[str, float]:
+    timings: List[float] = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "economy.json")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            size = writer(path, data)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p99": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        "mean": statistics.fmean(timings),
+        "size": size,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    writers = {
+        "legacy (indent=4, in place)": legacy_writer,
+        "pretty (indent=4, atomic)": write_json_pretty,
+        "atomic (stdlib)": stdlib_atomic_writer,
+    }
+    if file_handler.orjson is not None:
+        writers["atomic (orjson)"] = write_json_atomic
+
+    for users in args.users:
+        data = make_economy(users)
+        print(f"\n{users:,} users, {args.rounds} rounds")
+        print(f"{'writer':<30}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'size KiB':>12}")
+        for name, writer in writers.items():
+            result = run(writer, data, args.rounds)
+            print(f"{name:<30}{result['p50']:>10.2f}{result['p99']:>10.2f}{result['mean']:>10.2f}{result['size'] / 1024:>12.1f}")
+
+if __name__ == "__main__":
+    main()
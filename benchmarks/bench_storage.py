@@ -0,0 +1,299 @@
+"""
+Load-tests the storage layer with the bot's real read-modify-write helpers.
+
+Each case builds synthetic economy.json, member_info.json and server_info.json
+files for N users in a scratch directory, then replays a weighted mix of the
+operations the bot performs most (message EXP ticks, beg, deposit, market buys
+and modlog appends) through `open_json`/`save_json`, `json_transaction` and the
+economy helpers. Every case runs in a fresh process so peak RSS is per case.
+
+Run from the repository root:
+    python -m benchmarks.bench_storage --users 1000 10000 100000 --ops 2000
+    python -m benchmarks.bench_storage --backends json json-cache ledger --users 10000
+
+To compare another storage backend, add a setup function to `BACKENDS`. It is
+called inside the scratch directory after the synthetic files are written and
+should register its backend(s) with `json_cache.register_backend`.
+"""
+import argparse, asyncio, multiprocessing, os, queue, random, statistics, sys, tempfile, time
+from typing import Callable, Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_json_writer import make_economy
+
+SECTIONS = ["afk", "exp", "tempbans", "modlogs", "modstats", "warnings", "notes", "preferences"]
+GUILDS = 50
+ECO_PATH = "storage/economy/economy.json"
+MARKET_PATH = "storage/economy/market.json"
+MEMBER_PATH = "storage/member_info.json"
+SERVER_PATH = "storage/server_info.json"
+
+# Relative weights of each operation in the replayed mix.
+MIX = {
+    "exp_tick": 60,
+    "beg": 15,
+    "deposit": 10,
+    "market_buy": 5,
+    "modlog_append": 10,
+}
+
+def make_member_info(users: int, seed: int = 0) -> Dict[str, Any]:
+    """Builds a synthetic member_info.json with an EXP record per user."""
+    rng = random.Random(seed)
+    return {
+        str(100000000000000000 + i): {"EXP": {"total": rng.randint(0, 10**6), "cooldown": 1700000000}}
+        for i in range(users)
+    }
+
+def make_server_info(users: int, seed: int = 0) -> Dict[str, Any]:
+    """Builds a synthetic server_info.json with users spread across `GUILDS` guilds."""
+    rng = random.Random(seed)
+    server_info: Dict[str, Any] = {section: {} for section in SECTIONS}
+    for i in range(users):
+        guild = str(900000000000000000 + i % GUILDS)
+        member = str(100000000000000000 + i)
+        server_info["exp"].setdefault(guild, {})[member] = rng.randint(0, 10**5)
+        if i % 20 == 0:
+            server_info["modlogs"].setdefault(guild, {})[member] = {
+                "1": {"Type": "Warn", "User": member, "Moderator": "mod", "Reason": "spam", "Time": 1700000000}
+            }
+    return server_info
+
+def make_market(users: int, seed: int = 0) -> Dict[str, Any]:
+    """Builds a synthetic market.json with one listing per hundred users."""
+    rng = random.Random(seed)
+    return {
+        "listings": {
+            f"L{i:05d}": {"seller": 100000000000000000 + rng.randrange(users), "item": "candy", "amount": 10**6, "price": 5}
+            for i in range(max(1, users // 100))
+        }
+    }
+
+def setup_json(directory: str) -> None:
+    """Plain JSON files written through on every save (the pre-cache behaviour)."""
+    from bot_utils import json_cache
+    json_cache.flush_interval = 0
+
+def setup_json_cache(directory: str) -> None:
+    """Plain JSON files with the write-behind cache, flushed at the end of the run."""
+    from bot_utils import json_cache
+    json_cache.flush_interval = 30
+
+def setup_sharded(directory: str) -> None:
+    """server_info.json split per section and guild, write-through."""
+    from bot_utils import json_cache, ShardedJsonStore
+    json_cache.flush_interval = 0
+    json_cache.register_backend(SERVER_PATH, ShardedJsonStore("storage/server_info", SECTIONS, legacy_path=SERVER_PATH))
+
+def setup_sqlite(directory: str) -> None:
+    """The economy in SQLite, write-through."""
+    from bot_utils import json_cache
+    from cogs.economy.utils import EconomyStore, migrate_economy_json
+    json_cache.flush_interval = 0
+    db_path = "storage/economy/economy.db"
+    migrate_economy_json(ECO_PATH, db_path)
+    json_cache.register_backend(ECO_PATH, EconomyStore(db_path))
+
+def setup_ledger(directory: str) -> None:
+    """The economy as a snapshot plus append-only journal, write-through."""
+    from bot_utils import json_cache
+    from cogs.economy.utils import EconomyLedger
+    json_cache.flush_interval = 0
+    json_cache.register_backend(ECO_PATH, EconomyLedger("storage/economy/ledger", legacy_path=ECO_PATH))
+
+def setup_records(directory: str) -> None:
+    """economy.json held in memory as slotted PlayerRecords, write-through."""
+    from bot_utils import json_cache
+    from cogs.economy.utils import RecordJsonStore
+    json_cache.flush_interval = 0
+    json_cache.register_backend(ECO_PATH, RecordJsonStore(ECO_PATH))
+
+BACKENDS: Dict[str, Callable[[str], None]] = {
+    "json": setup_json,
+    "json-cache": setup_json_cache,
+    "sharded": setup_sharded,
+    "sqlite": setup_sqlite,
+    "ledger": setup_ledger,
+    "records": setup_records,
+}
+
+async def exp_tick(rng: random.Random, users: int) -> None:
+    """The EXP update from `on_message` in main.py."""
+    from bot_utils import json_transaction
+    member_id = str(100000000000000000 + rng.randrange(users))
+    server_id = str(900000000000000000 + rng.randrange(GUILDS))
+    exp_gain = rng.randint(1, 5)
+    async with json_transaction(MEMBER_PATH, SERVER_PATH) as (member_data, server_info):
+        if member_id not in member_data:
+            member_data[member_id] = {"EXP": {"total": 0, "cooldown": 0}}
+        member_data[member_id]["EXP"]["total"] = member_data[member_id].get("EXP", {}).get("total", 0) + exp_gain
+        member_data[member_id]["EXP"]["cooldown"] = int(time.time())
+
+        server_info.setdefault("exp", {}).setdefault(server_id, {}).setdefault(member_id, 0)
+        server_info["exp"][server_id][member_id] += exp_gain
+
+async def beg(rng: random.Random, users: int) -> None:
+    """`beg` in MainEconomyCog: a cooldown check followed by a purse top-up."""
+    from cogs.economy.utils import command_cooldown, change_balance
+    user_id = str(100000000000000000 + rng.randrange(users))
+    done, _ = command_cooldown(10, "beg", user_id)
+    if done:
+        change_balance(user_id, rng.randint(10, 100), reason="beg")
+
+async def deposit(rng: random.Random, users: int) -> None:
+    """`deposit` in MainEconomyCog."""
+    from cogs.economy.utils import process_transaction
+    user_id = str(100000000000000000 + rng.randrange(users))
+    await process_transaction(user_id, "deposit", rng.randint(1, 100))
+
+async def market_buy(rng: random.Random, users: int) -> None:
+    """The `/market buy` command body."""
+    from bot_utils import json_transaction
+    from cogs.economy.utils import change_balance, change_item
+    buyer = str(100000000000000000 + rng.randrange(users))
+    async with json_transaction(MARKET_PATH, ECO_PATH) as (market_data, economy_data):
+        listing_id = rng.choice(list(market_data["listings"]))
+        listing = market_data["listings"][listing_id]
+        seller = str(listing["seller"])
+        total_cost = listing["price"]
+        if buyer not in economy_data or economy_data[buyer]["balance"]["purse"] < total_cost:
+            return
+
+        change_balance(buyer, -total_cost, reason=f"market buy {listing_id}")
+        change_balance(seller, total_cost, reason=f"market sale {listing_id}")
+        change_item(buyer, listing["item"], 1, reason=f"market buy {listing_id}")
+        listing["amount"] -= 1
+
+async def modlog_append(rng: random.Random, users: int) -> None:
+    """The server_info update done by `store_modlog` in cogs/moderation/utils.py."""
+    from bot_utils import open_json, save_json
+    server_id = str(900000000000000000 + rng.randrange(GUILDS))
+    user_id = str(100000000000000000 + rng.randrange(users))
+    server_info = open_json(SERVER_PATH)
+    server_info.setdefault("modlogs", {}).setdefault(server_id, {}).setdefault(user_id, {})
+    cases = server_info["modlogs"][server_id][user_id]
+    case_number = max(map(int, cases.keys()), default=0) + 1
+    cases[str(case_number)] = {"Type": "Warn", "User": user_id, "Moderator": "mod", "Reason": "benchmark", "Time": int(time.time())}
+    save_json(SERVER_PATH, server_info)
+
+OPERATIONS: Dict[str, Callable[[random.Random, int], Any]] = {
+    "exp_tick": exp_tick,
+    "beg": beg,
+    "deposit": deposit,
+    "market_buy": market_buy,
+    "modlog_append": modlog_append,
+}
+
+def written_bytes(directory: str) -> int:
+    """Bytes written by this process so far, or the size of `directory` where /proc is unavailable."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(directory)
+        for name in files
+    )
+
+def peak_rss_mib() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def seed_files(users: int) -> None:
+    from bot_utils.file_handler import write_json_atomic
+    os.makedirs("storage/economy", exist_ok=True)
+    write_json_atomic(ECO_PATH, make_economy(users))
+    write_json_atomic(MARKET_PATH, make_market(users))
+    write_json_atomic(MEMBER_PATH, make_member_info(users))
+    write_json_atomic(SERVER_PATH, make_server_info(users))
+
+async def replay(users: int, ops: int, seed: int) -> Dict[str, List[float]]:
+    from bot_utils import json_cache
+    rng = random.Random(seed)
+    names = list(MIX)
+    weights = [MIX[name] for name in names]
+    timings: Dict[str, List[float]] = {name: [] for name in names}
+
+    for name in rng.choices(names, weights, k=ops):
+        start = time.perf_counter()
+        await OPERATIONS[name](rng, users)
+        timings[name].append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await json_cache.close()
+    timings["final flush"] = [(time.perf_counter() - start) * 1000]
+    return timings
+
+def run_case(backend: str, users: int, ops: int, seed: int, results: "multiprocessing.Queue") -> None:
+    """Runs one backend at one size in the current (fresh) process and reports through `results`."""
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        seed_files(users)
+        BACKENDS[backend](directory)
+
+        from bot_utils import json_cache
+        start = time.perf_counter()
+        for path in (ECO_PATH, MARKET_PATH, MEMBER_PATH, SERVER_PATH):
+            json_cache.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        before = written_bytes(directory)
+        timings = asyncio.run(replay(users, ops, seed))
+        results.put({
+            "timings": timings,
+            "load_ms": load_ms,
+            "bytes": written_bytes(directory) - before,
+            "rss": peak_rss_mib(),
+        })
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for users in args.users:
+        for backend in args.backends:
+            results = context.Queue()
+            process = context.Process(target=run_case, args=(backend, users, args.ops, args.seed, results))
+            process.start()
+            while True:
+                try:
+                    result = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    if not process.is_alive():
+                        raise RuntimeError(f"{backend} at {users:,} users exited with code {process.exitcode}")
+            process.join()
+
+            rss = f"{result['rss']:.1f} MiB" if result["rss"] is not None else "n/a"
+            print(f"\n{backend} | {users:,} users | {args.ops} ops | load {result['load_ms']:.0f} ms | "
+                  f"written {result['bytes'] / 1024 / 1024:.1f} MiB | peak RSS {rss}")
+            print(f"{'operation':<16}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+            for name, timings in result["timings"].items():
+                if not timings:
+                    continue
+                print(f"{name:<16}{len(timings):>8}{statistics.median(timings):>10.2f}"
+                      f"{percentile(timings, 0.99):>10.2f}{statistics.fmean(timings):>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Record/replay harness for the bot's upstream HTTP calls.
+
+Every API call the bot makes goes through `http_client.session` (directly,
+through `http_session()` or through `api_request`). `replay_http` swaps that
+session for one that sends each request to a local stand-in server instead,
+rewriting `https://api.hypixel.net/player?...` to
+`http://127.0.0.1:<port>/https/api.hypixel.net/player?...`.
+
+The stand-in server either:
+    - replays: answers from a fixture file, with optional added latency and
+      injected errors, and 404s requests it has no fixture for; or
+    - records: forwards the request to the real host and stores the response
+      in the fixture file (run once with real keys in storage/secrets.env).
+
+Fixtures are keyed by method and URL with secret query parameters (`key`)
+removed, and only the status, content type and body are stored, so fixture
+files do not contain API keys or cookies.
+
+Example:
+    ```
+    store = FixtureStore("benchmarks/fixtures/commands.json")
+    async with replay_http(store, latency=0.05, error_rate=0.1) as server:
+        await run_some_command()
+        print(server.stats())
+    ```
+"""
+import asyncio, base64, json, os, random, sys
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SECRET_PARAMS = {"key", "api_key", "token"}
+
+def fixture_key(method: str, url: str) -> str:
+    """Returns the fixture key of a request: the method and URL with secret query parameters dropped and the rest sorted."""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    path = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    return f"{method.upper()} {path}?{urlencode(query)}" if query else f"{method.upper()} {path}"
+
+class FixtureStore:
+    """
+    Captured responses, stored as one JSON file.
+
+    Attributes:
+        path (str): Path to the fixture file
+        responses (Dict[str, Dict[str, Any]]): Fixture key -> {"status", "content_type", "body", "encoding"}
+
+    ## Methods:
+        get(key: str):
+        Returns the captured response for a key, or None.
+
+        put(key: str, status: int, content_type: str, body: bytes):
+        Stores a response.
+
+        save():
+        Writes the fixtures back to `path`.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.responses = json.load(f)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.responses.get(key)
+
+    def put(self, key: str, status: int, content_type: str, body: bytes) -> None:
+        try:
+            encoded, encoding = body.decode("utf-8"), "text"
+        except UnicodeDecodeError:
+            encoded, encoding = base64.b64encode(body).decode("ascii"), "base64"
+        self.responses[key] = {"status": status, "content_type": content_type, "body": encoded, "encoding": encoding}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.responses, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def body(fixture: Dict[str, Any]) -> bytes:
+        if fixture.get("encoding") == "base64":
+            return base64.b64decode(fixture["body"])
+        return fixture["body"].encode("utf-8")
+
+class ReplayServer:
+    """
+    The local stand-in for every upstream host.
+
+    Attributes:
+        store (FixtureStore): Where responses are replayed from or recorded to
+        record (bool): Forward to the real hosts and capture, instead of replaying
+        latency (float): Seconds added before every replayed response
+        jitter (float): Extra random latency, up to this many seconds
+        error_rate (float): Fraction of replayed requests answered with `error_status`
+        error_status (int): Status used for injected errors
+        calls (Counter): Requests received per upstream host
+        missing (Counter): Replayed requests per fixture key that had no fixture
+
+    ## Methods:
+        start():
+        Starts listening on a free local port.
+
+        close():
+        Stops the server (and saves the fixtures when recording).
+
+        stats():
+        Returns the call, error and missing-fixture counters.
+    """
+    def __init__(
+        self,
+        store: FixtureStore,
+        record: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        self.store = store
+        self.record = record
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls: Counter = Counter()
+        self.missing: Counter = Counter()
+        self.errors = 0
+        self.base_url = ""
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._upstream: Optional[ClientSession] = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route("*", "/{scheme}/{host}/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        if self.record:
+            self._upstream = ClientSession()
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._upstream is not None:
+            await self._upstream.close()
+            self.store.save()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        # The raw path keeps escapes like %23 that the route's match_info would decode
+        _, scheme, host, rest = request.raw_path.split("/", 3)
+        url = f"{scheme}://{host}/{rest}"
+        key = fixture_key(request.method, url)
+        self.calls[host] += 1
+
+        if self.record:
+            headers = {k: v for k, v in request.headers.items() if k.lower() not in ("host", "content-length")}
+            async with self._upstream.request(request.method, url, headers=headers, data=await request.read()) as upstream:
+                body = await upstream.read()
+                content_type = upstream.headers.get("Content-Type", "application/octet-stream")
+                self.store.put(key, upstream.status, content_type, body)
+                return web.Response(status=upstream.status, body=body, headers={"Content-Type": content_type})
+
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text="injected error")
+
+        fixture = self.store.get(key)
+        if fixture is None:
+            self.missing[key] += 1
+            return web.json_response({"error": "no fixture", "key": key}, status=404)
+        return web.Response(status=fixture["status"], body=FixtureStore.body(fixture), headers={"Content-Type": fixture["content_type"]})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": sum(self.calls.values()),
+            "calls_per_host": dict(self.calls),
+            "injected_errors": self.errors,
+            "missing_fixtures": dict(self.missing),
+        }
+
+class ReplaySession:
+    """Wraps a ClientSession and sends every request to the stand-in server instead of the real host."""
+    def __init__(self, session: ClientSession, base_url: str):
+        self._session = session
+        self._base_url = base_url
+
+    def _rewrite(self, url: Any) -> str:
+        parts = urlsplit(str(url))
+        rewritten = f"{self._base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+    def request(self, method: str, url: Any, **kwargs: Any):
+        return self._session.request(method, self._rewrite(url), **kwargs)
+
+    def get(self, url: Any, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: Any, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: Any, **kwargs: Any):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: Any, **kwargs: Any):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: Any, **kwargs: Any):
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url: Any, **kwargs: Any):
+        return self.request("HEAD", url, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    async def close(self) -> None:
+        await self._session.close()
+
+@asynccontextmanager
+async def replay_http(store: FixtureStore, **options: Any) -> AsyncIterator[ReplayServer]:
+    """
+    Routes the bot's shared HTTP session through a stand-in server for the duration of the block.
+
+    Parameters:
+        store (FixtureStore): Fixtures to replay from (or record to)
+        **options: Passed on to `ReplayServer` (record, latency, jitter, error_rate, ...)
+
+    Returns:
+        ReplayServer: The running server, for its `stats()`
+    """
+    from bot_utils import http_client
+
+    server = ReplayServer(store, **options)
+    base_url = await server.start()
+    previous = http_client._session
+    http_client._session = ReplaySession(ClientSession(timeout=http_client.timeout), base_url)
+    try:
+        yield server
+    finally:
+        await http_client._session.close()
+        http_client._session = previous
+        await server.close()
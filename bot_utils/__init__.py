@@ -1,5 +1,12 @@
 from .file_handler import *
+from .http_client import *
+from .cache import *
+from .ratelimit import *
+from .resilience import *
 from .game_apis import *
+from .exp import *
+from .afk import *
+from .cooldowns import *
 from .logger import *
 from .utils import *
 
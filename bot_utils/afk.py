@@ -0,0 +1,156 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .file_handler import json_cache
+
+SERVER_PATH = "storage/server_info.json"
+
+class AfkRegistry:
+    """
+    In-memory index of who is AFK, kept in sync with server_info["afk"].
+
+    Every message checks whether its author is AFK and whether it mentions
+    someone who is. Both checks are answered from a per-guild set of AFK member
+    IDs, so a message from a guild (or by a member) with no AFK entries does no
+    file reads or writes. A guild's entries are read from server_info the first
+    time it is checked, and only if it has any. server_info.json is written only
+    when someone goes AFK or comes back.
+
+    Attributes:
+        members (Dict[str, Set[str]]): Guild ID -> IDs of the members who are AFK
+        entries (Dict[str, Dict[str, Dict]]): Guild ID -> member ID -> {"reason", "time", "original_name"}
+
+    ## Methods:
+        get(guild_id: str, member_id: str):
+        Returns a member's AFK entry, or None.
+
+        mentioned(guild_id: str, member_ids: Iterable[str]):
+        Returns the AFK entries of the given members.
+
+        set(guild_id: str, member_id: str, reason: Optional[str], original_name: str):
+        Marks a member as AFK.
+
+        clear(guild_id: str, member_id: str):
+        Removes a member's AFK entry.
+    """
+    def __init__(self):
+        self.members: Dict[str, Set[str]] = {}
+        self.entries: Dict[str, Dict[str, Dict]] = {}
+        self._counters: Dict[str, int] = {"checks": 0, "guild_loads": 0, "writes": 0}
+
+    def _guild(self, guild_id: str) -> Set[str]:
+        members = self.members.get(guild_id)
+        if members is None:
+            afk_section = json_cache.load(SERVER_PATH).get("afk", {})
+            # `in` only looks at the shard index, the guild's file is read only if it exists
+            entries = dict(afk_section[guild_id]) if guild_id in afk_section else {}
+            self.entries[guild_id] = entries
+            members = self.members[guild_id] = set(entries)
+            self._counters["guild_loads"] += 1
+        return members
+
+    def is_afk(self, guild_id: str, member_id: str) -> bool:
+        """Returns whether a member is AFK in a guild."""
+        self._counters["checks"] += 1
+        return member_id in self._guild(guild_id)
+
+    def get(self, guild_id: str, member_id: str) -> Optional[Dict]:
+        """Returns a member's AFK entry, or None if they are not AFK."""
+        if member_id not in self._guild(guild_id):
+            return None
+        return self.entries[guild_id][member_id]
+
+    def mentioned(self, guild_id: str, member_ids: Iterable[str]) -> List[Tuple[str, Dict]]:
+        """
+        Returns the AFK entries of the members in `member_ids` who are AFK.
+
+        Parameters:
+            guild_id (str): The guild the message was sent in
+            member_ids (Iterable[str]): The IDs mentioned in the message
+
+        Returns:
+            List[Tuple[str, Dict]]: (member ID, AFK entry) for every AFK member mentioned
+        """
+        self._counters["checks"] += 1
+        members = self._guild(guild_id)
+        if not members:
+            return []
+        entries = self.entries[guild_id]
+        return [(member_id, entries[member_id]) for member_id in members.intersection(member_ids)]
+
+    async def set(self, guild_id: str, member_id: str, reason: Optional[str], original_name: str) -> bool:
+        """
+        Marks a member as AFK and saves it to server_info.
+
+        Parameters:
+            guild_id (str): The guild the member is AFK in
+            member_id (str): The member going AFK
+            reason (Optional[str]): Shown when someone mentions them
+            original_name (str): Display name to restore when they come back
+
+        Returns:
+            bool: False if the member was already AFK
+        """
+        members = self._guild(guild_id)
+        if member_id in members:
+            return False
+
+        entry = {
+            "reason": reason,
+            "time": datetime.now(timezone.utc).isoformat(),
+            "original_name": original_name,
+        }
+        # Claimed before the write so a second /afk while it runs sees the member as AFK
+        members.add(member_id)
+        self.entries[guild_id][member_id] = entry
+        try:
+            async with json_cache.transaction(SERVER_PATH) as server_info:
+                server_info.setdefault("afk", {}).setdefault(guild_id, {})[member_id] = entry
+        except Exception:
+            members.discard(member_id)
+            self.entries[guild_id].pop(member_id, None)
+            raise
+        self._counters["writes"] += 1
+        return True
+
+    async def clear(self, guild_id: str, member_id: str) -> Optional[Dict]:
+        """
+        Removes a member's AFK entry from memory and server_info.
+
+        Parameters:
+            guild_id (str): The guild the member was AFK in
+            member_id (str): The member coming back
+
+        Returns:
+            Optional[Dict]: The removed entry, or None if the member was not AFK
+        """
+        members = self._guild(guild_id)
+        if member_id not in members:
+            return None
+
+        members.discard(member_id)
+        entry = self.entries[guild_id].pop(member_id)
+        async with json_cache.transaction(SERVER_PATH) as server_info:
+            afk_section = server_info.setdefault("afk", {})
+            if guild_id in afk_section:
+                guild_afk = afk_section[guild_id]
+                guild_afk.pop(member_id, None)
+                if not guild_afk:
+                    del afk_section[guild_id]
+        self._counters["writes"] += 1
+        return entry
+
+    def invalidate(self, guild_id: Optional[str] = None) -> None:
+        """Drops the cached entries of one guild (or all), so they are read from server_info again."""
+        if guild_id is None:
+            self.members.clear()
+            self.entries.clear()
+        else:
+            self.members.pop(guild_id, None)
+            self.entries.pop(guild_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the check, guild load and write counters and the number of AFK members."""
+        return {**self._counters, "afk": sum(len(members) for members in self.members.values())}
+
+afk_registry = AfkRegistry()
@@ -0,0 +1,390 @@
+import asyncio, os, time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .file_handler import json_cache
+
+class Uncached:
+    """
+    Wraps a fetched value that should be returned but not cached.
+
+    A `fetch` passed to `TTLCache.get_or_fetch` returns one of these for
+    responses that say nothing lasting about the key, such as a 5xx or a 429,
+    so the next lookup asks the API again instead of reusing the failure.
+
+    Attributes:
+        value (Any): The value handed back to the caller
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any = None):
+        self.value = value
+
+class TTLCache:
+    """
+    An in-memory cache for API responses with a time-to-live and stale-while-revalidate.
+
+    A fresh entry (younger than `ttl`) is returned as is. A stale entry (younger
+    than `ttl + stale_ttl`) is still returned immediately, while a background
+    task fetches a replacement. Anything older, or missing, is fetched before
+    returning. The least recently used entries are dropped past `maxsize`.
+    A fetch that returns `Uncached(value)` hands `value` back without storing it.
+
+    Attributes:
+        ttl (float): Seconds an entry is served without refreshing
+        stale_ttl (float): Extra seconds an entry is served while it refreshes
+        maxsize (int): Maximum number of entries kept
+        cache_none (bool): Whether a None result (not found / failed) is cached
+
+    ## Methods:
+        get_or_fetch(key: Hashable, fetch: Callable[[], Awaitable[Any]], fresh: bool = False):
+        Returns the cached value for a key, fetching it (now or in the background) as needed.
+
+        get(key: Hashable):
+        Returns a fresh or stale cached value without fetching, or None.
+
+        set(key: Hashable, value: Any):
+        Stores a value as fresh.
+
+        invalidate(key: Optional[Hashable] = None):
+        Drops one entry, or every entry.
+
+        stats():
+        Returns the hit/miss counters.
+    """
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, maxsize: int = 1024, cache_none: bool = False):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.cache_none = cache_none
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self._counters: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[float], Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        stored_at, value = entry
+        age = time.monotonic() - stored_at
+        if age >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None, None
+        self._entries.move_to_end(key)
+        return age, value
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the cached value for a key if it is fresh or stale, otherwise None."""
+        return self._lookup(key)[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value as fresh, unless it is None and `cache_none` is off."""
+        if value is None and not self.cache_none:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops one entry, or every entry if no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await fetch()
+            if isinstance(value, Uncached):
+                # A failed refresh keeps serving the stale value until it expires
+                self._counters["errors"] += 1
+                return
+            self.set(key, value)
+            self._counters["refreshes"] += 1
+        except Exception as e:
+            # Keep serving the stale value until it expires
+            self._counters["errors"] += 1
+            print(f"Error: Could not refresh cached entry {key!r}. {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], fresh: bool = False) -> Any:
+        """
+        Returns the cached value for a key, fetching it when it is missing or expired.
+
+        Parameters:
+            key (Hashable): The cache key
+            fetch (Callable[[], Awaitable[Any]]): Coroutine function that fetches the value,
+                                                  or returns `Uncached(value)` for a result not to store
+            fresh (bool): Skip the cache and fetch now (the result is still stored)
+
+        Returns:
+            Any: The cached or fetched value
+
+        Example:
+            ```
+            data = await cache.get_or_fetch(tag, lambda: fetch_player(tag))
+            ```
+        """
+        if not fresh:
+            age, value = self._lookup(key)
+            if age is not None:
+                if age < self.ttl:
+                    self._counters["hits"] += 1
+                    return value
+                self._counters["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.get_running_loop().create_task(self._refresh(key, fetch))
+                return value
+
+        self._counters["misses"] += 1
+        value = await fetch()
+        if isinstance(value, Uncached):
+            return value.value
+        self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, stale hit, miss, refresh and refresh error counters, plus the entry count."""
+        return {**self._counters, "size": len(self._entries)}
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one in-flight request.
+
+    While a call for a key is running, later callers for the same key await its
+    result instead of starting their own request. Nothing is kept once the call
+    finishes; pair it with `TTLCache` to also reuse finished results.
+
+    ## Methods:
+        do(key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        Runs `fetch`, or joins the call already running for `key`.
+
+        stats():
+        Returns how many calls were made and how many were deduplicated.
+    """
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._counters: Dict[str, int] = {"calls": 0, "deduplicated": 0}
+
+    async def do(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs `fetch` for a key, or waits for the identical call that is already running.
+
+        The shared call runs as its own task, so one caller being cancelled (for
+        example by a timeout) does not cancel it for the others.
+
+        Parameters:
+            key (Hashable): Identifies the request, e.g. ("cr_player", tag)
+            fetch (Callable[[], Awaitable[Any]]): Coroutine function that makes the request
+
+        Returns:
+            Any: The result (or exception) of the shared call
+
+        Example:
+            ```
+            data = await api_flight.do(("mojang_uuid", username.lower()), fetch)
+            ```
+        """
+        self._counters["calls"] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self._counters["deduplicated"] += 1
+        else:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the call and deduplicated call counters, plus the number of calls in flight."""
+        return {**self._counters, "inflight": len(self._inflight)}
+
+class BatchLoader:
+    """
+    Collects single-key lookups over a short window and loads them in one bulk call.
+
+    The first `load` starts a window of `window` seconds; every key asked for
+    during it (up to `max_batch`) is sent to `load_many` together, and each
+    caller gets the value for its own key. Duplicate keys in a window are sent
+    once. A batch that fills up is sent straight away.
+
+    Attributes:
+        load_many (Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]): Loads many keys
+            at once; keys missing from the returned dict resolve to None
+        window (float): Seconds to wait for more keys before sending a batch
+        max_batch (int): Maximum keys per bulk call
+
+    ## Methods:
+        load(key: Hashable):
+        Returns the value for one key, loaded as part of a batch.
+
+        stats():
+        Returns how many keys were asked for and how many bulk calls were made.
+    """
+    def __init__(self, load_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]], window: float = 0.01, max_batch: int = 100):
+        self.load_many = load_many
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Hashable, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._counters: Dict[str, int] = {"loads": 0, "batches": 0, "keys_sent": 0}
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Returns the value for a key, sent upstream together with the other keys of its window.
+
+        Parameters:
+            key (Hashable): The key to load
+
+        Returns:
+            Any: The loaded value, or None if `load_many` did not return the key
+
+        Example:
+            ```
+            user_id = await batcher.load(username.lower())
+            ```
+        """
+        loop = asyncio.get_running_loop()
+        self._counters["loads"] += 1
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        # A cancelled caller cancels only its own future; the batch still goes out
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._counters["batches"] += 1
+        self._counters["keys_sent"] += len(batch)
+        asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: Dict[Hashable, List[asyncio.Future]]) -> None:
+        try:
+            results = await self.load_many(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the load, bulk call and distinct keys sent counters."""
+        return dict(self._counters)
+
+class PersistentCache:
+    """
+    A string-keyed cache with a time-to-live that survives restarts.
+
+    Entries live in a JSON document served by `json_cache`, so changes are
+    written behind with everything else and the cache is read back on startup.
+    Timestamps are wall-clock, so an entry's age carries over a restart. A
+    stored None is a negative entry ("known not to exist") and expires after
+    `negative_ttl` instead of `ttl`.
+
+    Attributes:
+        filename (str): Path to the JSON document
+        ttl (float): Seconds a found value is kept
+        negative_ttl (float): Seconds a None value is kept
+        maxsize (int): Maximum number of entries kept; the oldest are dropped first
+
+    ## Methods:
+        load():
+        Reads the document and drops expired entries.
+
+        lookup(key: str):
+        Returns whether the key is cached, and its value.
+
+        set(key: str, value: Any):
+        Stores a value (or a negative entry for None).
+
+        stats():
+        Returns the hit/miss counters.
+    """
+    def __init__(self, filename: str, ttl: float, negative_ttl: float = 0.0, maxsize: int = 10000):
+        self.filename = filename
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self._entries: Optional[Dict[str, List[Any]]] = None
+        self._counters: Dict[str, int] = {"hits": 0, "negative_hits": 0, "misses": 0}
+
+    def _expired(self, entry: List[Any], now: float) -> bool:
+        value, stored_at = entry
+        return now - stored_at >= (self.ttl if value is not None else self.negative_ttl)
+
+    def load(self) -> Dict[str, List[Any]]:
+        """Reads the document (creating it if missing) and drops expired entries."""
+        if self._entries is not None:
+            return self._entries
+
+        if os.path.exists(self.filename):
+            try:
+                entries = json_cache.load(self.filename)
+            except Exception as e:
+                print(f"Error: Could not read {self.filename}, starting empty. {e}")
+                entries = {}
+        else:
+            entries = {}
+
+        now = time.time()
+        expired = [key for key, entry in entries.items() if self._expired(entry, now)]
+        for key in expired:
+            del entries[key]
+        json_cache.store(self.filename, entries)
+        self._entries = entries
+        return entries
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns whether a key is cached and not expired, and its value.
+
+        Parameters:
+            key (str): The cache key
+
+        Returns:
+            Tuple(bool, Any): (True, value) on a hit, where value may be None for
+                              a negative entry; (False, None) on a miss
+        """
+        entries = self.load()
+        entry = entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return False, None
+        if self._expired(entry, time.time()):
+            del entries[key]
+            json_cache.mark_dirty(self.filename)
+            self._counters["misses"] += 1
+            return False, None
+        self._counters["hits" if entry[0] is not None else "negative_hits"] += 1
+        return True, entry[0]
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores a value, or a negative entry if it is None, and marks the document dirty."""
+        if value is None and self.negative_ttl <= 0:
+            return
+        entries = self.load()
+        entries.pop(key, None)
+        entries[key] = [value, time.time()]
+        while len(entries) > self.maxsize:
+            # Dicts keep insertion order, so the first entry is the oldest write
+            del entries[next(iter(entries))]
+        json_cache.mark_dirty(self.filename)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, negative hit and miss counters, plus the entry count."""
+        return {**self._counters, "size": len(self.load())}
@@ -0,0 +1,195 @@
+import math, time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .file_handler import json_cache
+
+MEMBER_PATH = "storage/member_info.json"
+
+CooldownKey = Tuple[str, str]
+
+class CooldownManager:
+    """
+    Per-user command cooldowns held in memory.
+
+    Each (user, command) pair maps to the monotonic time it was last used and
+    the time its cooldown ends, so a check is one dict lookup and never touches
+    member_info.json. Expired entries are dropped lazily: an expired entry found
+    by a lookup is treated as absent, and every entry is also filed in a bucket of
+    a hashed timing wheel (`resolution` seconds per bucket), so whole buckets of
+    expired entries are removed at once as time passes instead of scanning
+    every entry.
+
+    Only cooldowns of at least `persist_after` seconds (daily, weekly, monthly)
+    are saved to member_info.json, as {"uses", "cooldown": Unix time}, and read
+    back from there the first time they are checked after a restart. Shorter
+    cooldowns start over when the bot restarts.
+
+    Attributes:
+        persist_after (float): Shortest cooldown, in seconds, that is saved to member_info.json
+        resolution (float): Seconds covered by one timing wheel bucket
+        durations (Dict[str, float]): Command -> the cooldown it was last checked with
+
+    ## Methods:
+        check(user_id: str, command: str, cooldown: float):
+        Returns whether the command is on cooldown and the seconds left.
+
+        hit(user_id: str, command: str, cooldown: float):
+        Starts the command's cooldown for the user.
+
+        try_use(user_id: str, command: str, cooldown: float):
+        Checks the cooldown and starts it if it has passed.
+
+        elapsed(user_id: str, command: str):
+        Returns the seconds since the user last used the command.
+
+        reset(user_id: str, command: str):
+        Clears the user's cooldown for the command.
+    """
+    def __init__(self, persist_after: float = 86400, resolution: float = 1.0):
+        self.persist_after = persist_after
+        self.resolution = resolution
+        self.durations: Dict[str, float] = {}
+        self._entries: Dict[CooldownKey, Tuple[float, float]] = {}
+        self._wheel: Dict[int, Set[CooldownKey]] = {}
+        self._swept = int(time.monotonic() // resolution)
+        self._counters: Dict[str, int] = {"checks": 0, "hits": 0, "evicted": 0, "persisted": 0, "restored": 0}
+
+    def _file(self, key: CooldownKey, last_used: float, expires: float) -> None:
+        self._entries[key] = (last_used, expires)
+        self._wheel.setdefault(int(expires // self.resolution), set()).add(key)
+
+    def _evict(self, now: float) -> None:
+        current = int(now // self.resolution)
+        if current <= self._swept:
+            return
+
+        # After a long idle stretch it is cheaper to look at the occupied buckets than every bucket passed
+        if current - self._swept > len(self._wheel):
+            buckets: Iterable[int] = [bucket for bucket in self._wheel if bucket < current]
+        else:
+            buckets = range(self._swept, current)
+
+        for bucket in buckets:
+            for key in self._wheel.pop(bucket, ()):
+                entry = self._entries.get(key)
+                # A key used again since it was filed here lives in a later bucket too
+                if entry is not None and entry[1] <= now:
+                    del self._entries[key]
+                    self._counters["evicted"] += 1
+        self._swept = current
+
+    def _persisted(self, user_id: str, command: str) -> Optional[Dict]:
+        member_info = json_cache.load(MEMBER_PATH)
+        return member_info.get(user_id, {}).get("commands", {}).get(command)
+
+    def _entry(self, key: CooldownKey, cooldown: float, now: float) -> Optional[Tuple[float, float]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry if entry[1] > now else None
+        if cooldown < self.persist_after:
+            return None
+
+        stored = self._persisted(*key)
+        if not stored or not stored.get("cooldown"):
+            return None
+        # Convert the saved Unix time to this process's monotonic clock
+        last_used = now - (time.time() - stored["cooldown"])
+        expires = last_used + cooldown
+        if expires <= now:
+            return None
+        self._file(key, last_used, expires)
+        self._counters["restored"] += 1
+        return self._entries[key]
+
+    def check(self, user_id: str, command: str, cooldown: float) -> Tuple[bool, int]:
+        """
+        Checks whether a command is on cooldown for a user.
+
+        Parameters:
+            user_id (str): The user to check
+            command (str): The command name
+            cooldown (float): The command's cooldown in seconds
+
+        Returns:
+            Tuple[bool, int]: Whether the command is on cooldown and the seconds left (0 if not)
+        """
+        now = time.monotonic()
+        self._evict(now)
+        self._counters["checks"] += 1
+        self.durations[command] = cooldown
+
+        entry = self._entry((str(user_id), command), cooldown, now)
+        if entry is None:
+            return False, 0
+        return True, math.ceil(entry[1] - now)
+
+    def hit(self, user_id: str, command: str, cooldown: float) -> None:
+        """
+        Starts a command's cooldown for a user.
+
+        Parameters:
+            user_id (str): The user who used the command
+            command (str): The command name
+            cooldown (float): The cooldown in seconds
+        """
+        user_id = str(user_id)
+        now = time.monotonic()
+        self._evict(now)
+        self._file((user_id, command), now, now + cooldown)
+        self._counters["hits"] += 1
+
+        if cooldown >= self.persist_after:
+            member_info = json_cache.load(MEMBER_PATH)
+            commands = member_info.setdefault(user_id, {}).setdefault("commands", {})
+            command_data = commands.setdefault(command, {"uses": 0, "cooldown": 0})
+            command_data["uses"] = command_data.get("uses", 0) + 1
+            command_data["cooldown"] = int(time.time())
+            json_cache.mark_dirty(MEMBER_PATH)
+            self._counters["persisted"] += 1
+
+    def try_use(self, user_id: str, command: str, cooldown: float) -> Tuple[bool, int]:
+        """
+        Starts a command's cooldown if it is not already running.
+
+        Returns:
+            Tuple[bool, int]: Whether the command may run and, if not, the seconds left
+        """
+        on_cooldown, remaining = self.check(user_id, command, cooldown)
+        if on_cooldown:
+            return False, remaining
+        self.hit(user_id, command, cooldown)
+        return True, 0
+
+    def elapsed(self, user_id: str, command: str) -> Optional[float]:
+        """
+        Returns the seconds since a user last used a command, or None if it is not known.
+
+        Short cooldowns are forgotten once they expire, so this only covers
+        running cooldowns and the saved long ones.
+        """
+        user_id = str(user_id)
+        now = time.monotonic()
+        self._evict(now)
+        entry = self._entries.get((user_id, command))
+        if entry is not None:
+            return now - entry[0]
+
+        stored = self._persisted(user_id, command)
+        if stored and stored.get("cooldown"):
+            return time.time() - stored["cooldown"]
+        return None
+
+    def reset(self, user_id: str, command: str) -> None:
+        """Clears a user's cooldown for a command, including a saved one."""
+        user_id = str(user_id)
+        self._entries.pop((user_id, command), None)
+        stored = self._persisted(user_id, command)
+        if stored and stored.get("cooldown"):
+            stored["cooldown"] = 0
+            json_cache.mark_dirty(MEMBER_PATH)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the check, hit, eviction and persistence counters and the number of running cooldowns."""
+        return {**self._counters, "active": len(self._entries), "buckets": len(self._wheel)}
+
+cooldown_manager = CooldownManager()
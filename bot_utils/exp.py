@@ -0,0 +1,262 @@
+import asyncio, time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from .file_handler import json_cache
+
+MEMBER_PATH = "storage/member_info.json"
+SERVER_PATH = "storage/server_info.json"
+
+class RankIndex:
+    """
+    Members ordered by score, highest first.
+
+    The order is kept as a sorted list of (-score, member ID), so a member's
+    rank is a binary search and a page of the leaderboard is a slice; changing a
+    score moves one entry instead of sorting everyone again. Members with the
+    same score share a rank.
+
+    Attributes:
+        scores (Dict[str, int]): Member ID -> score
+
+    ## Methods:
+        add(member_id: str, amount: int):
+        Adds to a member's score.
+
+        rank(member_id: str):
+        Returns a member's 1-based rank, or 0 if they have no score.
+
+        top(count: int, offset: int):
+        Returns a page of (member ID, score), highest first.
+    """
+    def __init__(self, scores: Optional[Dict[str, int]] = None):
+        self.scores: Dict[str, int] = dict(scores or {})
+        self._order: List[Tuple[int, str]] = sorted((-score, member_id) for member_id, score in self.scores.items())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, member_id: str, amount: int) -> int:
+        """Adds `amount` to a member's score and returns the new score."""
+        old = self.scores.get(member_id)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old, member_id))]
+        score = (old or 0) + amount
+        self.scores[member_id] = score
+        insort(self._order, (-score, member_id))
+        return score
+
+    def rank(self, member_id: str) -> int:
+        """Returns 1 + the number of members with a higher score, or 0 if the member has no score."""
+        score = self.scores.get(member_id)
+        if score is None:
+            return 0
+        return bisect_left(self._order, (-score, "")) + 1
+
+    def top(self, count: int = 10, offset: int = 0) -> List[Tuple[str, int]]:
+        """Returns up to `count` (member ID, score) pairs starting at position `offset`."""
+        return [(member_id, -score) for score, member_id in self._order[offset:offset + count]]
+
+class ExpTracker:
+    """
+    Message EXP kept in memory and written to storage in batches.
+
+    `award` checks the per-member cooldown and adds EXP with a few dict
+    operations; nothing is read from or written to the JSON documents on the
+    message path (except the first time a member's cooldown is looked up). The
+    gains collected since the last flush are applied to member_info.json (global
+    total and cooldown) and server_info.json (per-guild totals) in one
+    transaction every `flush_interval` seconds and on shutdown.
+
+    Anything that reads EXP from the documents should `await exp_tracker.flush()`
+    first, or add `pending_global`/`pending_guild` to what it reads.
+
+    Guild and global leaderboards (`ranks`) are built from server_info.json the
+    first time they are asked for and then updated by every `award`, so /level
+    never re-reads or re-sorts the EXP of a whole guild. Global EXP on the
+    leaderboard is the sum of a member's guild EXP.
+
+    Attributes:
+        cooldown (int): Seconds between two EXP awards for a member
+        flush_interval (float): Seconds between batched writes
+
+    ## Methods:
+        award(guild_id: str, member_id: str, amount: int):
+        Adds EXP if the member's cooldown has passed.
+
+        last_award_time(member_id: str):
+        Returns when the member was last awarded EXP.
+
+        flush():
+        Writes the pending gains to member_info.json and server_info.json.
+
+        start():
+        Starts the background flush task.
+
+        close():
+        Stops the background flush task and flushes.
+
+        ranks(guild_id: Optional[str]):
+        Returns the RankIndex of a guild, or the global one.
+    """
+    def __init__(self, cooldown: int = 60, flush_interval: float = 15.0):
+        self.cooldown = cooldown
+        self.flush_interval = flush_interval
+        self.last_award: Dict[str, int] = {}
+        self.pending_global: Dict[str, int] = defaultdict(int)
+        self.pending_guild: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.guild_ranks: Dict[str, RankIndex] = {}
+        self.global_ranks: Optional[RankIndex] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._counters: Dict[str, int] = {"awards": 0, "on_cooldown": 0, "flushes": 0, "flushed_awards": 0}
+
+    def last_award_time(self, member_id: str) -> int:
+        """Returns the Unix time a member was last awarded EXP, or 0 if never."""
+        last = self.last_award.get(member_id)
+        if last is None:
+            # First message since startup: seed the cooldown from member_info
+            member_info = json_cache.load(MEMBER_PATH)
+            last = int(member_info.get(member_id, {}).get("EXP", {}).get("cooldown", 0))
+            self.last_award[member_id] = last
+        return last
+
+    def award(self, guild_id: str, member_id: str, amount: int, now: Optional[int] = None) -> bool:
+        """
+        Adds EXP to a member's guild and global totals if their cooldown has passed.
+
+        Parameters:
+            guild_id (str): The guild the message was sent in
+            member_id (str): The member who sent it
+            amount (int): EXP to add
+            now (Optional[int]): Current Unix time, defaults to `time.time()`
+
+        Returns:
+            bool: Whether EXP was awarded
+        """
+        now = int(time.time()) if now is None else now
+        if now - self.last_award_time(member_id) < self.cooldown:
+            self._counters["on_cooldown"] += 1
+            return False
+
+        self.last_award[member_id] = now
+        self.pending_global[member_id] += amount
+        self.pending_guild[(guild_id, member_id)] += amount
+        guild_ranks = self.guild_ranks.get(guild_id)
+        if guild_ranks is not None:
+            guild_ranks.add(member_id, amount)
+        if self.global_ranks is not None:
+            self.global_ranks.add(member_id, amount)
+        self._counters["awards"] += 1
+        return True
+
+    async def flush(self) -> int:
+        """
+        Applies the pending EXP gains and cooldowns to the JSON documents.
+
+        Returns:
+            int: The number of members whose EXP changed
+        """
+        # One flush at a time, so a flush that returns has written every award made before it was called
+        async with self._flush_lock:
+            if not self.pending_global:
+                return 0
+
+            pending_global, self.pending_global = self.pending_global, defaultdict(int)
+            pending_guild, self.pending_guild = self.pending_guild, defaultdict(int)
+            try:
+                async with json_cache.transaction(MEMBER_PATH, SERVER_PATH) as (member_info, server_info):
+                    for member_id, amount in pending_global.items():
+                        exp = member_info.setdefault(member_id, {}).setdefault("EXP", {"total": 0, "cooldown": 0})
+                        exp["total"] = exp.get("total", 0) + amount
+                        exp["cooldown"] = self.last_award.get(member_id, exp.get("cooldown", 0))
+
+                    exp_section = server_info.setdefault("exp", {})
+                    for (guild_id, member_id), amount in pending_guild.items():
+                        guild_exp = exp_section.setdefault(guild_id, {})
+                        guild_exp[member_id] = guild_exp.get(member_id, 0) + amount
+            except Exception:
+                # Put the gains back so the next flush retries them
+                for member_id, amount in pending_global.items():
+                    self.pending_global[member_id] += amount
+                for key, amount in pending_guild.items():
+                    self.pending_guild[key] += amount
+                raise
+
+            self._counters["flushes"] += 1
+            self._counters["flushed_awards"] += len(pending_global)
+            return len(pending_global)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.flush_interval, 1))
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error: Could not flush EXP. {e}")
+
+    def start(self) -> asyncio.Task:
+        """Starts the background flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def close(self) -> None:
+        """Stops the background flush task and flushes the pending EXP."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def ranks(self, guild_id: Optional[str] = None) -> RankIndex:
+        """
+        Returns the EXP leaderboard of a guild, or the global one.
+
+        The first call for a guild (or the global board) flushes the pending EXP
+        and builds the index from server_info.json; later calls return the index
+        `award` keeps up to date.
+
+        Parameters:
+            guild_id (Optional[str]): The guild, or None for the global leaderboard
+
+        Returns:
+            RankIndex: Member ID -> EXP, in rank order
+        """
+        ranks = self.global_ranks if guild_id is None else self.guild_ranks.get(guild_id)
+        if ranks is not None:
+            return ranks
+
+        await self.flush()
+        # Awards made while the flush waited for its lock went into the new pending
+        # dicts and are not in server_info yet, so they are added on top. There is
+        # no await from here on, so nothing else can slip in before the index exists.
+        exp_section = json_cache.load(SERVER_PATH).get("exp", {})
+        if guild_id is not None:
+            if guild_id not in self.guild_ranks:
+                scores = dict(exp_section[guild_id]) if guild_id in exp_section else {}
+                for (pending_guild_id, member_id), amount in self.pending_guild.items():
+                    if pending_guild_id == guild_id:
+                        scores[member_id] = scores.get(member_id, 0) + amount
+                self.guild_ranks[guild_id] = RankIndex(scores)
+            return self.guild_ranks[guild_id]
+
+        if self.global_ranks is None:
+            totals: Dict[str, int] = defaultdict(int)
+            for guild_exp in exp_section.values():
+                for member_id, exp in guild_exp.items():
+                    totals[member_id] += exp
+            for member_id, amount in self.pending_global.items():
+                totals[member_id] += amount
+            self.global_ranks = RankIndex(totals)
+        return self.global_ranks
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the award, cooldown, flush counters and the number of members with pending EXP."""
+        return {**self._counters, "pending": len(self.pending_global)}
+
+exp_tracker = ExpTracker()
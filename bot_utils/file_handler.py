@@ -1,34 +1,166 @@
-import json, os
+import json, os, atexit, asyncio, threading, tempfile, time, queue, sqlite3, copy
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import MutableMapping
+from contextlib import asynccontextmanager, AsyncExitStack
+from urllib.parse import quote, unquote
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import Dict, Any, TypeVar, Union, List
+from typing import Dict, Any, TypeVar, Union, List, Optional, Set, Literal, AsyncIterator, Callable, Iterable, Iterator, Tuple, Protocol
 from typing_extensions import deprecated
 
 import mysql.connector
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily by `factory` up to `size`. When every connection
+    is in use, `acquire` blocks until one is released or `timeout` seconds pass.
+
+    ## Methods:
+        acquire():
+        Returns an idle connection, creating one if the pool is not full yet.
+
+        release(conn):
+        Returns a connection to the pool.
+
+        close():
+        Closes every idle connection.
+    """
+    def __init__(self, factory: Callable[[], Any], size: int = 5, timeout: float = 10.0):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Any:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self.factory()
+                except Exception:
+                    self._created -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection became available within {self.timeout} seconds")
+
+    def release(self, conn: Any, broken: bool = False) -> None:
+        if broken:
+            with self._lock:
+                self._created -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
 class DB:
-    def __init__(self, env_file: str = "storage/secrets.env"):
+    """
+    A MySQL (or SQLite stand-in) database client with a shared connection pool.
+
+    Every `DB()` with the same credentials shares one bounded pool and one thread-pool
+    executor, so creating a `DB` per command is cheap. The synchronous methods keep
+    their old behaviour; the `async_*` methods run on the executor so they do not
+    block the event loop. Queries are written with `%s` placeholders for both backends.
+
+    ## Methods:
+        query_db(query: str, params: tuple = ()) / async_query(...):
+        Runs a SELECT and returns rows as dictionaries.
+
+        execute(query: str, params: tuple = ()) / async_execute(...):
+        Runs an INSERT, UPDATE or DELETE and returns the affected row count.
+
+        insert_record(query: str, params: tuple = ()) / async_insert(...):
+        Runs an INSERT and returns the last inserted ID.
+
+        execute_many(query: str, seq_params: Iterable[tuple]) / async_execute_many(...):
+        Runs one statement for every parameter tuple in a single transaction.
+
+        query_stats():
+        Returns per-query timing stats.
+    """
+    _pools: Dict[Tuple[Any, ...], ConnectionPool] = {}
+    _executors: Dict[Tuple[Any, ...], ThreadPoolExecutor] = {}
+    _stats: Dict[str, Dict[str, float]] = {}
+    _class_lock = threading.Lock()
+
+    def __init__(self, env_file: str = "storage/secrets.env", pool_size: int = 5, sqlite_path: Optional[str] = None):
         """
         Initializes the DB class and loads credentials from a .env file.
+
+        Parameters:
+            env_file (str): Path of the .env file, relative to the repository root
+            pool_size (int): Maximum number of open connections (and executor threads)
+            sqlite_path (Optional[str]): Use an SQLite database at this path instead of MySQL
         """
-        root_dir = Path(__file__).parent.parent
-        secrets_path = root_dir / env_file
+        self.sqlite_path = sqlite_path
+
+        if sqlite_path is None:
+            root_dir = Path(__file__).parent.parent
+            secrets_path = root_dir / env_file
+
+            if not secrets_path.exists():
+                raise FileNotFoundError(f"secrets.env not found at {secrets_path}")
 
-        if not secrets_path.exists():
-            raise FileNotFoundError(f"secrets.env not found at {secrets_path}")
+            load_dotenv(secrets_path)
 
-        load_dotenv(secrets_path)
+            self.db_host = os.getenv("DB_HOST")
+            self.db_user = os.getenv("DB_USER")
+            self.db_pass = os.getenv("DB_PASS")
+            self.db_name = os.getenv("DB_NAME")
 
-        self.db_host = os.getenv("DB_HOST")
-        self.db_user = os.getenv("DB_USER")
-        self.db_pass = os.getenv("DB_PASS")
-        self.db_name = os.getenv("DB_NAME")
+            if not all([self.db_host, self.db_user, self.db_pass, self.db_name]):
+                raise ValueError("Missing one or more database credentials in the .env file")
 
-        if not all([self.db_host, self.db_user, self.db_pass, self.db_name]):
-            raise ValueError("Missing one or more database credentials in the .env file")
+            key = ("mysql", self.db_host, self.db_user, self.db_name)
+        else:
+            key = ("sqlite", sqlite_path)
+
+        with DB._class_lock:
+            if key not in DB._pools:
+                DB._pools[key] = ConnectionPool(self.get_db_connection, size=pool_size)
+                DB._executors[key] = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="db")
+        self.pool = DB._pools[key]
+        self.executor = DB._executors[key]
 
     def get_db_connection(self):
-        """Establishes and returns a connection to the MySQL database."""
+        """Establishes and returns a new connection to the database."""
+        if self.sqlite_path is not None:
+            conn = sqlite3.connect(self.sqlite_path, check_same_thread=False, uri=self.sqlite_path.startswith("file:"))
+            conn.row_factory = sqlite3.Row
+            return conn
+
         return mysql.connector.connect(
             host=self.db_host,
             user=self.db_user,
@@ -36,6 +168,60 @@ class DB:
             database=self.db_name
         )
 
+    def _acquire(self):
+        conn = self.pool.acquire()
+        if self.sqlite_path is None and not conn.is_connected():
+            conn.reconnect(attempts=2, delay=0)
+        return conn
+
+    def _cursor(self, conn, dictionary: bool = False):
+        if self.sqlite_path is not None:
+            return conn.cursor()
+        return conn.cursor(dictionary=dictionary)
+
+    def _prepare(self, query: str) -> str:
+        return query.replace("%s", "?") if self.sqlite_path is not None else query
+
+    def _record(self, query: str, elapsed: float) -> None:
+        key = " ".join(query.split())
+        with DB._class_lock:
+            stats = DB._stats.setdefault(key, {"calls": 0, "total": 0.0, "max": 0.0})
+            stats["calls"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def _run(self, query: str, params: Any, mode: str) -> Any:
+        conn = self._acquire()
+        broken = False
+        cursor = self._cursor(conn, dictionary=mode == "query")
+        start = time.perf_counter()
+        try:
+            if mode == "many":
+                cursor.executemany(self._prepare(query), params)
+            else:
+                cursor.execute(self._prepare(query), params)
+
+            if mode == "query":
+                return [dict(row) for row in cursor.fetchall()]
+
+            conn.commit()
+            return cursor.lastrowid if mode == "insert" else cursor.rowcount
+        except (mysql.connector.Error, sqlite3.Error) as err:
+            print(f"Error: {err}")
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            return [] if mode == "query" else 0
+        finally:
+            self._record(query, time.perf_counter() - start)
+            cursor.close()
+            self.pool.release(conn, broken=broken)
+
+    async def _run_async(self, query: str, params: Any, mode: str) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._run, query, params, mode)
+
     def query_db(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
         Executes a SELECT query and returns the results as a list of dictionaries.
@@ -47,18 +233,7 @@ class DB:
         Returns:
             List[Dict[str, Any]]: List of results, each represented as a dictionary
         """
-        conn = self.get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        try:
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            return results
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            return []
-        finally:
-            cursor.close()
-            conn.close()
+        return self._run(query, params, "query")
 
     def execute(self, query: str, params: tuple = ()) -> int:
         """
@@ -71,19 +246,21 @@ class DB:
         Returns:
             int: The number of rows affected by the query
         """
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.rowcount
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            conn.rollback()
-            return 0
-        finally:
-            cursor.close()
-            conn.close()
+        return self._run(query, params, "execute")
+
+    def execute_many(self, query: str, seq_params: Iterable[tuple]) -> int:
+        """
+        Executes one INSERT, UPDATE, or DELETE statement for every parameter tuple,
+        committed as a single transaction.
+        
+        Parameters:
+            query (str): SQL query to execute
+            seq_params (Iterable[tuple]): One parameter tuple per row
+            
+        Returns:
+            int: The number of rows affected
+        """
+        return self._run(query, list(seq_params), "many")
 
     def fetch_one(self, query: str, params: tuple = ()) -> Dict[str, Any]:
         """
@@ -123,26 +300,835 @@ class DB:
         Returns:
             int: The ID of the last inserted record
         """
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        try:
-            cursor.execute(query, params)
-            conn.commit()
-            return cursor.lastrowid
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            conn.rollback()
-            return 0
-        finally:
-            cursor.close()
-            conn.close()
+        return self._run(query, params, "insert")
+
+    async def async_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Awaitable `query_db`, run on the DB executor."""
+        return await self._run_async(query, params, "query")
+
+    async def async_fetch_one(self, query: str, params: tuple = ()) -> Dict[str, Any]:
+        """Awaitable `fetch_one`, run on the DB executor."""
+        results = await self.async_query(query, params)
+        return results[0] if results else {}
+
+    async def async_execute(self, query: str, params: tuple = ()) -> int:
+        """Awaitable `execute`, run on the DB executor."""
+        return await self._run_async(query, params, "execute")
+
+    async def async_insert(self, query: str, params: tuple = ()) -> int:
+        """Awaitable `insert_record`, run on the DB executor."""
+        return await self._run_async(query, params, "insert")
+
+    async def async_execute_many(self, query: str, seq_params: Iterable[tuple]) -> int:
+        """Awaitable `execute_many`, run on the DB executor."""
+        return await self._run_async(query, list(seq_params), "many")
+
+    @classmethod
+    def query_stats(cls) -> Dict[str, Dict[str, float]]:
+        """
+        Returns timing stats for every query run so far.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per whitespace-normalized query, the number
+                                         of calls and the total and maximum time in seconds
+        """
+        with cls._class_lock:
+            return {query: dict(stats) for query, stats in cls._stats.items()}
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Closes every pooled connection and shuts down the executors."""
+        with cls._class_lock:
+            for pool in cls._pools.values():
+                pool.close()
+            for executor in cls._executors.values():
+                executor.shutdown(wait=False)
+            cls._pools.clear()
+            cls._executors.clear()
 
 T = TypeVar('T')
 JsonData = Union[Dict[str, Any], List[Any], str, int, float, bool, None]
 
+def _json_default(o: Any) -> Any:
+    return o.to_dict() if hasattr(o, "to_dict") else o
+
+WriteMode = Literal["atomic", "pretty"]
+
+def loads_json(raw: Union[bytes, str]) -> JsonData:
+    """
+    Parses JSON text, using orjson when it is installed.
+
+    Parameters:
+        raw (Union[bytes, str]): The JSON text
+
+    Returns:
+        JsonData: The parsed document
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def dumps_json(data: JsonData, compact: bool = True) -> bytes:
+    """
+    Serializes data to UTF-8 JSON bytes.
+
+    Compact output uses orjson when it is installed, falling back to the stdlib
+    json module (for example for integers orjson cannot represent).
+
+    Parameters:
+        data (JsonData): Data to serialize
+        compact (bool): Write without whitespace instead of indenting by 4
+
+    Returns:
+        bytes: The encoded document
+    """
+    if not compact:
+        return json.dumps(data, indent=4, default=_json_default).encode("utf-8")
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=_json_default).encode("utf-8")
+
+def write_json_atomic(filename: str, data: JsonData, compact: bool = True) -> int:
+    """
+    Writes a JSON file so that a crash never leaves it truncated.
+
+    The document is written to a temporary file in the same directory, fsynced, and
+    then renamed over the original.
+
+    Parameters:
+        filename (str): Path where to save the file
+        data (JsonData): Data to be saved, must be JSON-serializable
+        compact (bool): Write without whitespace (default True)
+
+    Returns:
+        int: The number of bytes written
+    """
+    return _replace_file(filename, dumps_json(data, compact=compact))
+
+def _replace_file(filename: str, payload: bytes) -> int:
+    # Temporary file in the same directory, fsync, then rename over the original
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    return len(payload)
+
+def write_json_pretty(filename: str, data: JsonData) -> int:
+    """
+    Writes a JSON file with an indent of 4, like the original save_json, but crash-safe:
+    it goes through the same temporary file, fsync and rename as `write_json_atomic`.
+
+    Parameters:
+        filename (str): Path where to save the file
+        data (JsonData): Data to be saved, must be JSON-serializable
+
+    Returns:
+        int: The number of bytes written
+    """
+    return write_json_atomic(filename, data, compact=False)
+
+class StorageBackend(Protocol):
+    """
+    A storage backend that `JsonCache` can serve a path from.
+
+    `load` returns the document callers get from `open_json`, and `save` persists
+    it (or a replacement passed to `save_json`) and returns the number of bytes or
+    rows written.
+    """
+    def load(self) -> JsonData: ...
+
+    def save(self, data: JsonData) -> int: ...
+
+_MISSING = object()
+
+class TransactionView(MutableMapping):
+    """
+    A document as seen inside `JsonCache.transaction`, able to undo the block's changes.
+
+    The view reads and writes straight through to the cached document, but the
+    first time a key is touched its original value is kept, so a block that
+    raises can be rolled back. Copies are taken lazily and per key: a value
+    `depth` levels down is deep-copied, and the mappings above it are wrapped in
+    nested views. Touching one player in economy.json copies that player's
+    sections, not the whole file.
+
+    ## Methods:
+        rollback():
+        Puts every touched key back to its value before the transaction.
+    """
+    def __init__(self, data: Any, depth: int = 2):
+        self._data = data
+        self._depth = depth
+        self._original: Dict[Any, Any] = {}
+        self._children: Dict[Any, "TransactionView"] = {}
+
+    def _touch(self, key: Any) -> None:
+        if key in self._original:
+            return
+        value = self._data[key] if key in self._data else _MISSING
+        if value is not _MISSING and self._depth > 1 and isinstance(value, MutableMapping):
+            # Keep the object itself, the nested view records what changes inside it
+            self._original[key] = value
+            self._children[key] = TransactionView(value, self._depth - 1)
+        else:
+            self._original[key] = value if value is _MISSING else copy.deepcopy(value)
+
+    def __getitem__(self, key: Any) -> Any:
+        self._touch(key)
+        child = self._children.get(key)
+        if child is not None and self._data.get(key, _MISSING) is child._data:
+            return child
+        return self._data[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._touch(key)
+        self._data[key] = value._data if isinstance(value, TransactionView) else value
+
+    def __delitem__(self, key: Any) -> None:
+        self._touch(key)
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __reversed__(self) -> Iterator[Any]:
+        # Callers like create_account read the newest key with next(reversed(doc))
+        return reversed(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def rollback(self) -> None:
+        """Puts every touched key back to its value before the transaction."""
+        for key, original in self._original.items():
+            child = self._children.get(key)
+            if child is not None:
+                child.rollback()
+            if original is _MISSING:
+                if key in self._data:
+                    del self._data[key]
+            elif self._data.get(key, _MISSING) is not original:
+                self._data[key] = original
+
+# Cache key -> the view of the transaction running in the current task, so
+# `open_json` inside a transaction body sees (and can roll back) the same changes.
+_transaction_views: ContextVar[Dict[str, TransactionView]] = ContextVar("json_transaction_views", default={})
+
+class JsonCache:
+    """
+    An in-process cache of parsed JSON documents with write-behind flushing.
+
+    Documents are parsed once and kept in memory. `save_json` only marks a document
+    as dirty, and dirty documents are written back every `flush_interval` seconds
+    and on shutdown. A `flush_interval` of 0 or less writes through on every save.
+
+    Attributes:
+        flush_interval (float): Seconds between background flushes.
+        write_mode (WriteMode): "pretty" (default) for the original indented format, "atomic"
+                                for compact output. Both write a temporary file and rename it
+                                over the original, so a crash never truncates a document.
+                                Hand-edited files like storage/bot_data.json should stay
+                                "pretty"; large data files can opt in to "atomic" with
+                                `set_write_mode`.
+
+    ## Methods:
+        load(filename: str):
+        Returns the cached document, parsing it from disk on first access.
+
+        store(filename: str, data: JsonData):
+        Replaces the cached document and marks it as dirty.
+
+        flush(filename: Optional[str] = None):
+        Writes dirty documents (or only `filename`) back to disk, blocking.
+
+        flush_async():
+        Writes every dirty document back to disk on a worker thread.
+
+        start():
+        Starts the background flush task on the running event loop.
+
+        close():
+        Stops the background flush task and flushes everything.
+
+        transaction(*filenames: str, flush: bool = False):
+        Locks one or more documents for an exclusive read-modify-write.
+
+        register_backend(filename: str, backend: StorageBackend):
+        Serves a path from a custom storage backend instead of a JSON file.
+
+        set_write_mode(filename: str, write_mode: WriteMode):
+        Overrides `write_mode` for one file.
+    """
+    def __init__(self, flush_interval: float = 30.0, write_mode: WriteMode = "pretty"):
+        self.flush_interval = flush_interval
+        self.write_mode = write_mode
+        self._write_modes: Dict[str, WriteMode] = {}
+        self._documents: Dict[str, JsonData] = {}
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        self._task: Optional[asyncio.Task] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_stats: Dict[str, Dict[str, float]] = {}
+        self._backends: Dict[str, StorageBackend] = {}
+        # Per file: the newest snapshot taken and the newest one on disk, so a slow
+        # write of an older snapshot never lands after a newer one
+        self._versions: Dict[str, int] = {}
+        self._written: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _key(filename: str) -> str:
+        return os.path.abspath(filename)
+
+    def load(self, filename: str) -> JsonData:
+        """
+        Returns the cached document for a file, parsing it from disk on first access.
+
+        The returned object is shared between callers, so mutate it and then pass it
+        to `save_json` (or `mark_dirty`) to persist the change. Inside a transaction
+        on the same file, the transaction's view of the document is returned.
+
+        Parameters:
+            filename (str): Path to the JSON file
+
+        Returns:
+            JsonData: The parsed document
+
+        Raises:
+            OSError: If the file cannot be read
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        key = self._key(filename)
+        view = _transaction_views.get().get(key)
+        if view is not None:
+            return view
+
+        with self._lock:
+            if key in self._documents:
+                return self._documents[key]
+
+            if key in self._backends:
+                data = self._backends[key].load()
+            else:
+                with open(key, "rb") as f:
+                    data = loads_json(f.read())
+            self._documents[key] = data
+            return data
+
+    def store(self, filename: str, data: JsonData) -> None:
+        """
+        Replaces the cached document for a file and marks it as dirty.
+
+        Parameters:
+            filename (str): Path to the JSON file
+            data (JsonData): The new document
+        """
+        key = self._key(filename)
+        if isinstance(data, TransactionView):
+            data = data._data
+        with self._lock:
+            self._documents[key] = data
+            self._dirty.add(key)
+
+        if self.flush_interval <= 0:
+            self.flush(filename, raise_errors=True)
+
+    def mark_dirty(self, filename: str) -> None:
+        """Marks a cached document as changed so the next flush writes it."""
+        key = self._key(filename)
+        with self._lock:
+            if key in self._documents:
+                self._dirty.add(key)
+
+    def is_dirty(self, filename: str) -> bool:
+        """Returns whether a cached document has unflushed changes."""
+        return self._key(filename) in self._dirty
+
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """
+        Flushes and drops a document (or every document) from the cache, so the
+        next `load` re-reads it from disk.
+        """
+        self.flush(filename)
+        with self._lock:
+            if filename is None:
+                self._documents.clear()
+            else:
+                self._documents.pop(self._key(filename), None)
+
+    def register_backend(self, filename: str, backend: "StorageBackend") -> None:
+        """
+        Serves a path from a custom storage backend instead of a JSON file.
+
+        `open_json` and `save_json` on the path keep working, but documents are
+        loaded with `backend.load()` and written with `backend.save(data)`.
+        Register backends at startup, before anything opens the path.
+
+        Parameters:
+            filename (str): The path callers use for the document
+            backend (StorageBackend): The backend that stores it
+        """
+        key = self._key(filename)
+        self.flush(filename)
+        with self._lock:
+            self._documents.pop(key, None)
+            self._backends[key] = backend
+
+    def backend_for(self, filename: str) -> Optional["StorageBackend"]:
+        """Returns the backend registered for a path, or None if it is a plain JSON file."""
+        return self._backends.get(self._key(filename))
+
+    def set_write_mode(self, filename: str, write_mode: WriteMode) -> None:
+        """
+        Overrides `write_mode` for one file.
+
+        Parameters:
+            filename (str): Path to the JSON file
+            write_mode (WriteMode): "atomic" or "pretty"
+        """
+        self._write_modes[self._key(filename)] = write_mode
+
+    def _snapshot(self, key: str) -> Tuple[int, bytes]:
+        # Compact serialisation is the cheapest consistent copy of a document that is still being mutated
+        version = self._versions[key] = self._versions.get(key, 0) + 1
+        return version, dumps_json(self._documents[key])
+
+    def _write_snapshot(self, key: str, version: int, payload: bytes) -> int:
+        with self._write_lock:
+            if self._written.get(key, 0) > version:
+                return 0
+            if self._write_modes.get(key, self.write_mode) == "pretty":
+                payload = dumps_json(loads_json(payload), compact=False)
+            size = _replace_file(key, payload)
+            self._written[key] = version
+            return size
+
+    def _write(self, key: str, data: JsonData) -> int:
+        if key in self._backends:
+            return self._backends[key].save(data)
+        return self._write_snapshot(key, *self._snapshot(key))
+
+    def flush(self, filename: Optional[str] = None, raise_errors: bool = False) -> int:
+        """
+        Writes dirty documents back to disk.
+
+        Parameters:
+            filename (Optional[str]): Only flush this file (default flushes every dirty file)
+            raise_errors (bool): Raise write errors instead of printing them and
+                                 keeping the document dirty for the next flush
+
+        Returns:
+            int: The number of documents written
+        """
+        written = 0
+        with self._lock:
+            keys = list(self._dirty) if filename is None else [self._key(filename)]
+            for key in keys:
+                if key not in self._dirty:
+                    continue
+                try:
+                    self._write(key, self._documents[key])
+                    self._dirty.discard(key)
+                    written += 1
+                except Exception as e:
+                    if raise_errors:
+                        raise Exception(f"Error: Could not save data to '{key}'. {e}")
+                    print(f"Error: Could not flush '{key}'. {e}")
+        return written
+
+    async def flush_async(self) -> int:
+        """
+        Writes every dirty document back to disk without blocking the event loop.
+
+        Each JSON document is snapshotted on the loop, then indented (for "pretty"
+        files), written and fsynced on a worker thread. Storage backends save on the
+        loop, since they compare against the live document. A document changed
+        while its write runs stays dirty for the next flush.
+
+        Returns:
+            int: The number of documents written
+        """
+        written = 0
+        snapshots: List[Tuple[str, int, bytes]] = []
+        with self._lock:
+            for key in list(self._dirty):
+                try:
+                    if key in self._backends:
+                        self._backends[key].save(self._documents[key])
+                        written += 1
+                    else:
+                        snapshots.append((key, *self._snapshot(key)))
+                    self._dirty.discard(key)
+                except Exception as e:
+                    print(f"Error: Could not flush '{key}'. {e}")
+
+        for i, (key, version, payload) in enumerate(snapshots):
+            try:
+                await asyncio.to_thread(self._write_snapshot, key, version, payload)
+                written += 1
+            except Exception as e:
+                with self._lock:
+                    self._dirty.add(key)
+                print(f"Error: Could not flush '{key}'. {e}")
+            except BaseException:
+                # Cancelled (e.g. by close): leave the unwritten documents dirty for the final flush
+                with self._lock:
+                    self._dirty.update(key for key, _, _ in snapshots[i:])
+                raise
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.flush_interval, 1))
+            await self.flush_async()
+
+    def start(self) -> asyncio.Task:
+        """Starts the background flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def close(self) -> None:
+        """Stops the background flush task and flushes every dirty document."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_async()
+
+    def _get_lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _record_wait(self, key: str, waited: float) -> None:
+        stats = self._lock_stats.setdefault(key, {"transactions": 0, "total_wait": 0.0, "max_wait": 0.0})
+        stats["transactions"] += 1
+        stats["total_wait"] += waited
+        stats["max_wait"] = max(stats["max_wait"], waited)
+
+    @asynccontextmanager
+    async def transaction(self, *filenames: str, flush: bool = False) -> AsyncIterator[Any]:
+        """
+        Locks one or more documents for an exclusive read-modify-write.
+
+        Transactions on the same file run one at a time. Locks for several files are
+        taken in a fixed order so overlapping transactions cannot deadlock. Every
+        mutation made inside the block is saved once when the block exits without
+        an error; if the block raises, the changes it made (including through
+        `open_json` on the same file) are rolled back. Transactions are not
+        reentrant, so do not nest two on the same file.
+
+        Keep Discord sends and other network calls out of the block, they would
+        hold the file's lock for the whole round-trip.
+
+        Parameters:
+            *filenames (str): Paths to the JSON files
+            flush (bool): Write the documents to disk on exit instead of waiting
+                          for the next background flush
+
+        Yields:
+            TransactionView: The document, or a tuple of documents when several files are given
+
+        Example:
+            ```
+            async with json_transaction("storage/economy/economy.json") as eco:
+                eco[user_id]["balance"]["purse"] += 100
+            ```
+        """
+        if not filenames:
+            raise ValueError("json_transaction needs at least one filename.")
+
+        async with AsyncExitStack() as stack:
+            start = time.perf_counter()
+            for key in sorted({self._key(filename) for filename in filenames}):
+                await stack.enter_async_context(self._get_lock(key))
+            waited = time.perf_counter() - start
+
+            for key in {self._key(filename) for filename in filenames}:
+                self._record_wait(key, waited)
+
+            documents = [self.load(filename) for filename in filenames]
+            views = [TransactionView(document) for document in documents]
+            token = _transaction_views.set({
+                **_transaction_views.get(),
+                **{self._key(filename): view for filename, view in zip(filenames, views)},
+            })
+            try:
+                yield views[0] if len(views) == 1 else tuple(views)
+            except BaseException:
+                # Undo whatever the block changed before it failed, so the next flush does not save it
+                for view in views:
+                    view.rollback()
+                raise
+            finally:
+                _transaction_views.reset(token)
+
+            for filename, document in zip(filenames, documents):
+                self.store(filename, document)
+            if flush:
+                for filename in filenames:
+                    self.flush(filename, raise_errors=True)
+
+    def lock_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns how long transactions waited for each file's lock.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Per path, the number of transactions and the
+                                         total and maximum wait in seconds
+        """
+        return {key: dict(stats) for key, stats in self._lock_stats.items()}
+
+class ShardedSection(MutableMapping):
+    """
+    One section of a `ShardedDocument`, with each key stored in its own JSON file.
+
+    Shards are read from `directory/<key>.json` on first access and kept in memory.
+    Only shards whose data changed since they were loaded are written on flush.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._known: Set[str] = set()
+        self._shards: Dict[str, JsonData] = {}
+        self._snapshots: Dict[str, bytes] = {}
+        self._deleted: Set[str] = set()
+
+        if os.path.isdir(directory):
+            self._known = {unquote(name[:-5]) for name in os.listdir(directory) if name.endswith(".json")}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, quote(str(key), safe="") + ".json")
+
+    def __getitem__(self, key: str) -> JsonData:
+        if key in self._shards:
+            return self._shards[key]
+        if key not in self._known:
+            raise KeyError(key)
+
+        with open(self._path(key), "rb") as f:
+            raw = f.read()
+        self._shards[key] = loads_json(raw)
+        self._snapshots[key] = dumps_json(self._shards[key])
+        return self._shards[key]
+
+    def __setitem__(self, key: str, value: JsonData) -> None:
+        self._shards[key] = value
+        self._known.add(key)
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._shards.pop(key, None)
+        self._snapshots.pop(key, None)
+        self._known.discard(key)
+        self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._known
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._known))
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def copy(self) -> Dict[str, JsonData]:
+        return dict(self.items())
+
+    def to_dict(self) -> Dict[str, JsonData]:
+        return self.copy()
+
+    def flush(self) -> int:
+        """
+        Writes changed shards and removes deleted ones.
+
+        Returns:
+            int: The number of bytes written
+        """
+        written = 0
+        for key, value in self._shards.items():
+            snapshot = dumps_json(value)
+            if snapshot == self._snapshots.get(key):
+                continue
+            os.makedirs(self.directory, exist_ok=True)
+            written += write_json_atomic(self._path(key), value)
+            self._snapshots[key] = snapshot
+
+        for key in self._deleted:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self._deleted.clear()
+        return written
+
+class ShardedDocument(MutableMapping):
+    """
+    A dict-like document whose large sections are split into per-key shards.
+
+    Sections named in `sections` are `ShardedSection`s, so `doc["exp"][guild_id]`
+    only loads that guild's file. Every other top-level key is kept in `_root.json`.
+    """
+    def __init__(self, directory: str, sections: Iterable[str]):
+        self.directory = directory
+        self.sections: Dict[str, ShardedSection] = {
+            name: ShardedSection(os.path.join(directory, name)) for name in sections
+        }
+
+        root_path = os.path.join(directory, "_root.json")
+        if os.path.exists(root_path):
+            with open(root_path, "rb") as f:
+                self.root: Dict[str, JsonData] = loads_json(f.read())
+        else:
+            self.root = {}
+        self._root_snapshot = dumps_json(self.root)
+
+    def __getitem__(self, key: str) -> JsonData:
+        if key in self.sections:
+            return self.sections[key]
+        return self.root[key]
+
+    def __setitem__(self, key: str, value: JsonData) -> None:
+        if key in self.sections:
+            section = self.sections[key]
+            if value is section:
+                return
+            for shard in list(section):
+                del section[shard]
+            for shard, data in dict(value).items():
+                section[shard] = data
+        else:
+            self.root[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.sections:
+            self[key] = {}
+        else:
+            del self.root[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.sections
+        yield from self.root
+
+    def __len__(self) -> int:
+        return len(self.sections) + len(self.root)
+
+    def to_dict(self) -> Dict[str, JsonData]:
+        return dict(self.items())
+
+    def flush(self) -> int:
+        """
+        Writes changed shards and, if it changed, `_root.json`.
+
+        Returns:
+            int: The number of bytes written
+        """
+        written = sum(section.flush() for section in self.sections.values())
+
+        snapshot = dumps_json(self.root)
+        if snapshot != self._root_snapshot:
+            os.makedirs(self.directory, exist_ok=True)
+            written += write_json_atomic(os.path.join(self.directory, "_root.json"), self.root)
+            self._root_snapshot = snapshot
+        return written
+
+class ShardedJsonStore:
+    """
+    A `StorageBackend` that stores a JSON document as per-key shards in a directory.
+
+    On first load, if the directory does not exist yet and `legacy_path` does, the
+    legacy single-file document is split into shards once.
+
+    Attributes:
+        directory (str): Directory holding the shards.
+        sections (Tuple[str, ...]): Top-level keys whose values are sharded by key.
+        legacy_path (Optional[str]): Single-file document to migrate from.
+    """
+    def __init__(self, directory: str, sections: Iterable[str], legacy_path: Optional[str] = None):
+        self.directory = directory
+        self.sections = tuple(sections)
+        self.legacy_path = legacy_path
+        self.document: Optional[ShardedDocument] = None
+
+    def load(self) -> ShardedDocument:
+        if not os.path.isdir(self.directory) and self.legacy_path and os.path.exists(self.legacy_path):
+            with open(self.legacy_path, "rb") as f:
+                legacy = loads_json(f.read())
+            self.save(legacy)
+
+        self.document = ShardedDocument(self.directory, self.sections)
+        return self.document
+
+    def save(self, data: JsonData) -> int:
+        if isinstance(data, ShardedDocument):
+            return data.flush()
+
+        document = ShardedDocument(self.directory, self.sections)
+        for key in list(document.root):
+            del document[key]
+        for key, value in data.items():
+            document[key] = value
+        for key in self.sections:
+            if key not in data:
+                document[key] = {}
+        written = document.flush()
+        self.document = document
+        return written
+
+json_cache = JsonCache()
+atexit.register(json_cache.flush)
+
+def json_transaction(*filenames: str, flush: bool = False):
+    """
+    Opens a transactional read-modify-write on one or more JSON files.
+
+    See `JsonCache.transaction`.
+
+    Example:
+        ```
+        async with json_transaction("storage/economy/market.json", "storage/economy/economy.json") as (market, eco):
+            del market["listings"][listing_id]
+            eco[user_id]["inventory"][item] += amount
+        ```
+    """
+    return json_cache.transaction(*filenames, flush=flush)
+
 def open_json(filename: str) -> Dict[str, Any]:
     """
     Opens and parses a JSON file.
+
+    Documents are served from `json_cache`, so repeated calls do not touch the disk.
     
     Parameters:
         filename (str): Path to the JSON file
@@ -151,9 +1137,7 @@ def open_json(filename: str) -> Dict[str, Any]:
         Dict(str, Any): Parsed JSON data as dictionary
     """
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            file_data = json.load(f)
-        return file_data
+        return json_cache.load(filename)
     except Exception as e:
         print(e)
         return None
@@ -161,6 +1145,8 @@ def open_json(filename: str) -> Dict[str, Any]:
 def save_json(filename: str, data: JsonData) -> None:
     """
     Saves data to a JSON file with proper formatting.
+
+    The document is updated in `json_cache` and written to disk by the next flush.
     
     Parameters:
         filename (str): Path where to save the file
@@ -169,8 +1155,4 @@ def save_json(filename: str, data: JsonData) -> None:
     Raises:
         Exception: If file cannot be written or data cannot be serialized
     """
-    try:
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=4, default=lambda o: o.to_dict() if hasattr(o, "to_dict") else o)
-    except Exception as e:
-        raise Exception(f"Error: Could not save data to '{filename}'. {e}")
\ No newline at end of file
+    json_cache.store(filename, data)
@@ -1,10 +1,19 @@
-import discord
-from aiohttp import ClientSession
-from typing import Optional, Union, Dict, Any, TypedDict
+import discord, asyncio, threading, time, sqlite3, zlib
+from array import array
+from typing import Optional, Union, Dict, Any, TypedDict, Tuple, AsyncIterator, Callable, List, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 
+from .http_client import http_client
+from .cache import TTLCache, Uncached, SingleFlight, BatchLoader, PersistentCache
+from .ratelimit import RateLimiter, INTERACTIVE, BACKGROUND, parse_retry_after
+from .resilience import CircuitBreaker, CircuitOpenError, RateLimitedError, backoff_delay
+from contextlib import asynccontextmanager
+from aiohttp import ClientResponse, ClientError, ClientTimeout
+from urllib.parse import urlsplit
 from ossapi import UserLookupKey, Ossapi
 
 root_dir = Path(__file__).parent.parent
@@ -45,29 +54,293 @@ class OsuAPI:
     """
     A class to interact with the osu! API.
 
+    Ossapi is a blocking client, so every call runs on a small thread pool of its
+    own instead of on the event loop. User lookups are cached for `osu_user_ttl`
+    seconds (secrets.env, default 300), and identical lookups in flight share
+    one request.
+
     Attributes:
-        api (Ossapi): An instance of the Ossapi class for making API requests.
+        api (Ossapi): An instance of the Ossapi class for making API requests,
+                      created on first use.
+        executor (ThreadPoolExecutor): The threads blocking Ossapi calls run on.
 
     ## Methods:
         user(username: str, key: UserLookupKey):
         Fetches user data from the osu! API based on the provided username and lookup key.
+
+        users(usernames: List[str], key: UserLookupKey):
+        Fetches several users concurrently.
     """
-    def __init__(self, client_id: str, client_secret: str):
-        self.api = Ossapi(client_id, client_secret)
+    def __init__(self, client_id: str, client_secret: str, max_workers: int = 4):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="osu")
+        self.user_cache = TTLCache(
+            ttl=float(os.getenv("osu_user_ttl", 300)),
+            stale_ttl=float(os.getenv("osu_user_stale_ttl", 0)),
+            maxsize=512,
+        )
+        self._api: Optional[Ossapi] = None
+        self._api_lock = threading.Lock()
+
+    @property
+    def api(self) -> Ossapi:
+        # Creating the client can authenticate, so it also happens on the pool
+        with self._api_lock:
+            if self._api is None:
+                self._api = Ossapi(self.client_id, self.client_secret)
+            return self._api
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
 
     async def user(self, username: str, key: UserLookupKey):
-        return self.api.user(username, key=key)
+        """
+        Fetches an osu! user without blocking the event loop.
+
+        Parameters:
+            username (str): The username or ID to look up
+            key (UserLookupKey): Whether `username` is a username or an ID
+
+        Returns:
+            User: The Ossapi user model
+
+        Raises:
+            ValueError: If the user does not exist
+        """
+        cache_key = (str(username).lower(), key)
+
+        def fetch():
+            return self._run(lambda: self.api.user(username, key=key))
+
+        return await self.user_cache.get_or_fetch(cache_key, lambda: api_flight.do(("osu_user", *cache_key), fetch))
+
+    async def users(self, usernames: List[str], key: UserLookupKey) -> List[Any]:
+        """
+        Fetches several osu! users concurrently.
+
+        Parameters:
+            usernames (List[str]): The usernames or IDs to look up
+            key (UserLookupKey): Whether the entries are usernames or IDs
+
+        Returns:
+            List[Any]: The users in the same order, or the exception raised for each failed lookup
+        """
+        return await asyncio.gather(*(self.user(username, key) for username in usernames), return_exceptions=True)
+
+    def close(self) -> None:
+        """Stops the thread pool once the running lookups finish."""
+        self.executor.shutdown(wait=False)
+
+osu_api = OsuAPI(osuAPI, osuSecret, max_workers=int(os.getenv("osu_workers", 4)))
+
+# Identical concurrent upstream requests share one call; see `api_flight.stats()`
+api_flight = SingleFlight()
+
+API_RETRIES = int(os.getenv("api_retries", 2))
+API_DEADLINE = float(os.getenv("api_deadline", 10))
+
+def _limiter(name: str, rate: float, burst: int) -> RateLimiter:
+    return RateLimiter(
+        name,
+        rate=float(os.getenv(f"{name}_rate", rate)),
+        burst=int(os.getenv(f"{name}_burst", burst)),
+    )
+
+# Requests per second and burst size per upstream API, overridable in secrets.env
+# (e.g. hypixel_rate=1, hypixel_burst=5). Hypixel allows 300 requests per 5 minutes.
+api_limiters: Dict[str, RateLimiter] = {
+    "hypixel": _limiter("hypixel", 1.0, 5),
+    "clashroyale": _limiter("clashroyale", 5.0, 10),
+    "roblox": _limiter("roblox", 10.0, 20),
+    "ninjakiwi": _limiter("ninjakiwi", 2.0, 5),
+    "mojang": _limiter("mojang", 1.0, 10),
+}
+
+# Requests to a host that keeps failing are refused for a while instead of timing out one by one
+host_breakers: Dict[str, CircuitBreaker] = {}
+
+def _breaker(url: str) -> CircuitBreaker:
+    host = urlsplit(url).hostname or url
+    breaker = host_breakers.get(host)
+    if breaker is None:
+        breaker = host_breakers[host] = CircuitBreaker(
+            host,
+            failure_threshold=int(os.getenv("breaker_failures", 5)),
+            reset_timeout=float(os.getenv("breaker_reset", 30)),
+        )
+    return breaker
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+@asynccontextmanager
+async def api_request(
+    api: str,
+    method: str,
+    url: str,
+    priority: int = INTERACTIVE,
+    retries: Optional[int] = None,
+    deadline: Optional[float] = None,
+    **kwargs: Any,
+) -> AsyncIterator[ClientResponse]:
+    """
+    Makes a request through the rate limiter and circuit breaker of an upstream API.
+
+    The request waits for a token from `api_limiters[api]`, queued by priority.
+    A 429 (or 503 with Retry-After) pauses that API's limiter for the time the
+    server asks, and the request is retried once if that is at most 10 seconds;
+    otherwise `RateLimitedError` is raised, so a throttled response is never
+    mistaken for an empty result.
+
+    Connection errors, request timeouts and 5xx responses count against the
+    host's circuit breaker; a timeout while waiting in our own rate limiter
+    queue, or a cancelled request, does not. Idempotent requests (GET/HEAD)
+    are retried with jittered exponential backoff. Everything, retries included, has to finish
+    within `deadline` seconds, so a slow host cannot outlast the interaction.
+
+    Parameters:
+        api (str): Key in `api_limiters`, e.g. "roblox"
+        method (str): HTTP method
+        url (str): Request URL
+        priority (int): INTERACTIVE for commands, BACKGROUND for polling
+        retries (Optional[int]): Retries after a failure; defaults to `api_retries`
+                                 (2) for idempotent methods and 0 otherwise
+        deadline (Optional[float]): Seconds for the whole call; defaults to `api_deadline` (10)
+        **kwargs: Passed on to `ClientSession.request`
+
+    Raises:
+        CircuitOpenError: If the host's circuit breaker is open
+        RateLimitedError: If the host is still rate limiting after the retry
+        aiohttp.ClientError: If the request failed on every attempt
+        asyncio.TimeoutError: If the deadline passed
+
+    Example:
+        ```
+        async with api_request("ninjakiwi", "GET", "https://data.ninjakiwi.com/btd6/races") as response:
+            data = await response.json()
+        ```
+    """
+    limiter = api_limiters[api]
+    breaker = _breaker(url)
+    method = method.upper()
+    if retries is None:
+        retries = API_RETRIES if method in IDEMPOTENT_METHODS else 0
+    expires = time.monotonic() + (deadline if deadline is not None else API_DEADLINE)
+    throttled = False
+    attempt = 0
+
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.host, breaker.retry_in())
+
+        try:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            await asyncio.wait_for(limiter.acquire(priority), remaining)
+        except BaseException:
+            # Timed out (or cancelled) in our own queue: the host was never asked, so it is not its failure
+            breaker.release()
+            raise
+
+        try:
+            remaining = expires - time.monotonic()
+            api_timeout = http_client.api_timeout
+            timeout = ClientTimeout(
+                total=max(min(remaining, api_timeout.total or remaining), 0.1),
+                connect=api_timeout.connect,
+                sock_read=api_timeout.sock_read,
+            )
+            response = await http_client.session.request(method, url, **{"timeout": timeout, **kwargs})
+        except (ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            if attempt < retries and expires - time.monotonic() > 0:
+                await asyncio.sleep(min(backoff_delay(attempt), max(expires - time.monotonic(), 0)))
+                attempt += 1
+                continue
+            raise
+        except BaseException:
+            # Cancelled mid-request: free a half-open trial so the breaker does not stay stuck
+            breaker.release()
+            raise
+
+        if response.status == 429 or (response.status == 503 and "Retry-After" in response.headers):
+            # Rate limited: the host is up, so this does not count against the breaker
+            breaker.record_success()
+            delay = parse_retry_after(response.headers)
+            limiter.pause(delay)
+            response.release()
+            if not throttled and delay <= min(10, expires - time.monotonic()):
+                throttled = True
+                continue
+            raise RateLimitedError(breaker.host, delay)
+        elif response.status >= 500 and response.status != 501:
+            breaker.record_failure()
+            if attempt < retries and expires - time.monotonic() > 0:
+                response.release()
+                await asyncio.sleep(min(backoff_delay(attempt), max(expires - time.monotonic(), 0)))
+                attempt += 1
+                continue
+        else:
+            breaker.record_success()
+        break
+
+    try:
+        yield response
+    finally:
+        response.release()
+
+def api_scheduler_stats() -> Dict[str, Dict[str, float]]:
+    """Returns queue depth, wait time and throttling stats for each upstream API."""
+    return {name: limiter.stats() for name, limiter in api_limiters.items()}
+
+def api_breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Returns the circuit breaker state and counters for each host that has been called."""
+    return {host: breaker.stats() for host, breaker in host_breakers.items()}
 
 """
 CLASH ROYALE COMMANDS
 """
 
-async def cr_fetchPlayerData(tag: str) -> Optional[Dict[str, Any]]:
+cr_player_cache = TTLCache(
+    ttl=float(os.getenv("cr_player_ttl", 120)),
+    stale_ttl=float(os.getenv("cr_player_stale_ttl", 600)),
+)
+cr_clan_cache = TTLCache(
+    ttl=float(os.getenv("cr_clan_ttl", 300)),
+    stale_ttl=float(os.getenv("cr_clan_stale_ttl", 1800)),
+)
+
+def cr_normalizeTag(tag: str) -> str:
+    """
+    Normalizes a Clash Royale tag to its bare upper-case form, so "#abc", "%23ABC"
+    and " abc " share one cache entry. Tags never contain the letter O, so it is
+    read as a zero.
+
+    Parameters:
+        tag (str): Player or clan tag, with or without "#"/"%23"
+
+    Returns:
+        str: The normalized tag without a leading "#"
+    """
+    tag = str(tag).strip().upper()
+    if tag.startswith("%23"):
+        tag = tag[3:]
+    return tag.lstrip("#").replace("O", "0")
+
+async def cr_fetchPlayerData(tag: str, fresh: bool = False, priority: int = INTERACTIVE) -> Optional[Dict[str, Any]]:
     """
     Fetches Clash Royale player data from the official API.
+
+    Successful responses are cached per normalized tag (see `cr_player_cache`): a
+    recent response is reused, and an older one is served while it refreshes in the
+    background. Any other status is returned without being cached.
     
     Parameters:
         tag (str): Player's unique identifier
+        fresh (bool): Bypass the cache, e.g. when polling for a change
+        priority (int): INTERACTIVE, or BACKGROUND when polling
         
     Returns:
         Optional(Dict[str, Any]): Player data if found, None if not found
@@ -75,33 +348,40 @@ async def cr_fetchPlayerData(tag: str) -> Optional[Dict[str, Any]]:
     Raises:
         aiohttp.ClientError: On API connection issues
     """
-    api_url = f"https://api.clashroyale.com/v1/players/{tag}"  
-    headers = {"Authorization": f"Bearer {crAPI}"}
+    tag = cr_normalizeTag(tag)
 
-    async with ClientSession() as session:
-        async with session.get(api_url, headers=headers) as response:
-            response_json = await response.json()
+    async def fetch() -> Optional[Dict[str, Any]]:
+        api_url = f"https://api.clashroyale.com/v1/players/%23{tag}"
+        headers = {"Authorization": f"Bearer {crAPI}"}
 
+        async with api_request("clashroyale", "GET", api_url, headers=headers, priority=priority) as response:
             if response.status == 200:
-                return response_json
+                return await response.json()
             if response.status == 400:
-                return True
+                return Uncached(True)
+            return Uncached(None)
+
+    return await cr_player_cache.get_or_fetch(tag, lambda: api_flight.do(("cr_player", tag), fetch), fresh=fresh)
 
-async def cr_fetchClanData(clan_tag: str) -> Optional[ClanData]:
+async def cr_fetchClanData(clan_tag: str, fresh: bool = False) -> Optional[ClanData]:
     """
-    Fetches Clash Royale clan data from the official API.
+    Fetches Clash Royale clan data from the official API, cached like `cr_fetchPlayerData`
+    (only successful responses are kept).
     
     Parameters:
         clan_tag (str): Clan's unique identifier
+        fresh (bool): Bypass the cache
         
     Returns:
         Optional(ClanData): Structured clan data if found, None if not found
     """
-    api_url = f"https://api.clashroyale.com/v1/clans/{clan_tag}"
-    headers = {"Authorization": f"Bearer {crAPI}"}
+    clan_tag = cr_normalizeTag(clan_tag)
 
-    async with ClientSession() as session:
-        async with session.get(api_url, headers=headers) as response:
+    async def fetch() -> Optional[ClanData]:
+        api_url = f"https://api.clashroyale.com/v1/clans/%23{clan_tag}"
+        headers = {"Authorization": f"Bearer {crAPI}"}
+
+        async with api_request("clashroyale", "GET", api_url, headers=headers) as response:
             if response.status == 200:
                 clan_data = await response.json()
                 return {
@@ -116,57 +396,432 @@ async def cr_fetchClanData(clan_tag: str) -> Optional[ClanData]:
                     "type": clan_data.get("type", "N/A"),
                 }
             else:
-                return None
+                return Uncached(None)
+
+    return await cr_clan_cache.get_or_fetch(clan_tag, lambda: api_flight.do(("cr_clan", clan_tag), fetch), fresh=fresh)
 
 """
 ROBLOX COMMANDS
 """
 
-async def rbx_fetchUserBio(roblox_user_id) -> Optional[str]:
+async def rbx_fetchUserBio(roblox_user_id, priority: int = INTERACTIVE) -> Optional[str]:
     """
     Fetches a Roblox user bio based on user ID.
     
     Args: 
         roblox_user_id (int): The ID to the account.
+        priority (int): INTERACTIVE, or BACKGROUND when polling
         
     Returns:
         Optional(str): The Roblox bio of the user.
         """
-    async with ClientSession() as session:
-        url = f"https://users.roblox.com/v1/users/{roblox_user_id}"
-        async with session.get(url) as response:
-            data = await response.json()
-            return data.get("description", "")
+    data = await rbx_fetchUserInfo(roblox_user_id, priority)
+    return (data or {}).get("description", "")
+
+async def rbx_fetchUserInfo(roblox_user_id, priority: int = INTERACTIVE) -> Optional[Dict[str, Any]]:
+    """
+    Fetches a Roblox user's profile (name, display name, bio, creation date).
+
+    Args:
+        roblox_user_id (int): The ID to the account.
+        priority (int): INTERACTIVE, or BACKGROUND when polling
+
+    Returns:
+        Optional(Dict[str, Any]): The user's profile, None if the request failed.
+    """
+    async def fetch() -> Optional[Dict[str, Any]]:
+        async with api_request("roblox", "GET", f"https://users.roblox.com/v1/users/{roblox_user_id}", priority=priority) as response:
+            if response.status == 200:
+                return await response.json()
+            return None
+
+    return await api_flight.do(("rbx_user", int(roblox_user_id)), fetch)
+
+async def rbx_fetchCount(roblox_user_id, type: str) -> Optional[int]:
+    """
+    Fetches how many friends, followers or followings a Roblox user has.
+
+    Args:
+        roblox_user_id (int): The ID to the account.
+        type (str): "friends", "followers" or "followings".
+
+    Returns:
+        Optional(int): The count, None if the request failed.
+    """
+    async def fetch() -> Optional[int]:
+        async with api_request("roblox", "GET", f"https://friends.roblox.com/v1/users/{roblox_user_id}/{type}/count") as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("count", 0)
+
+    return await api_flight.do(("rbx_count", int(roblox_user_id), type), fetch)
+
+async def rbx_fetchPresence(roblox_user_id) -> Optional[Dict[str, Any]]:
+    """
+    Fetches a Roblox user's online presence.
+
+    Args:
+        roblox_user_id (int): The ID to the account.
+
+    Returns:
+        Optional(Dict[str, Any]): The user's presence, None if unavailable.
+    """
+    async def fetch() -> Optional[Dict[str, Any]]:
+        async with api_request("roblox", "POST", "https://presence.roblox.com/v1/presence/users", json={"userIds": [roblox_user_id]}) as response:
+            if response.status == 200:
+                data = await response.json()
+                if data.get("userPresences") and len(data["userPresences"]) > 0:
+                    return data["userPresences"][0]
+            return None
+
+    return await api_flight.do(("rbx_presence", int(roblox_user_id)), fetch)
+
+async def _rbx_resolveUsernames(usernames: List[str], priority: int) -> Dict[str, int]:
+    # One bulk request for every username collected in a batching window
+    async with api_request(
+        "roblox", "POST",
+        "https://users.roblox.com/v1/usernames/users",
+        json={"usernames": usernames, "excludeBannedUsers": True},
+        priority=priority,
+    ) as response:
+        if response.status != 200:
+            return {}
+        data = await response.json()
+    return {entry["requestedUsername"].lower(): entry["id"] for entry in data.get("data", [])}
+
+# Usernames asked for within `rbx_batch_window` seconds go out in one request (the endpoint takes 100)
+rbx_id_batchers: Dict[int, BatchLoader] = {
+    priority: BatchLoader(
+        partial(_rbx_resolveUsernames, priority=priority),
+        window=float(os.getenv("rbx_batch_window", 0.02)),
+        max_batch=100,
+    )
+    for priority in (INTERACTIVE, BACKGROUND)
+}
+# Resolved username -> ID pairs, least recently used dropped first
+rbx_id_cache = TTLCache(ttl=float(os.getenv("rbx_id_ttl", 86400)), maxsize=4096)
 
-async def rbx_fetchUserID(roblox_username) -> Optional[int]:
+async def rbx_fetchUserID(roblox_username, priority: int = INTERACTIVE) -> Optional[int]:
     """
     Fetches a Roblox user ID based on username via API.
+
+    Lookups made at about the same time are sent together in one bulk request,
+    and resolved IDs are cached.
     
     Args:
         roblox_username (str): The username to the account.
+        priority (int): INTERACTIVE, or BACKGROUND when polling
 
     Returns:
         Optional(int): The user ID.
     """
-    async with ClientSession() as session:
-        response = await session.post(
-            "https://users.roblox.com/v1/usernames/users",
-            json={"usernames": [roblox_username], "excludeBannedUsers": True},
-        )
-        if response.status != 200:
-            return None
-        data = await response.json()
-        if not data["data"]:
-            return None
-        return data["data"][0]["id"]
+    username = str(roblox_username).lower()
+    batcher = rbx_id_batchers[BACKGROUND if priority >= BACKGROUND else INTERACTIVE]
+    return await rbx_id_cache.get_or_fetch(
+        username, lambda: api_flight.do(("rbx_username", username), lambda: batcher.load(username))
+    )
+
+async def rbx_fetchUserIDs(roblox_usernames: List[str], priority: int = INTERACTIVE) -> Dict[str, Optional[int]]:
+    """
+    Fetches the Roblox user IDs of several usernames, batched into as few requests as possible.
+
+    Args:
+        roblox_usernames (List[str]): The usernames to the accounts.
+        priority (int): INTERACTIVE, or BACKGROUND when polling
+
+    Returns:
+        Dict[str, Optional[int]]: Each username mapped to its user ID, or None if it was not found.
+    """
+    ids = await asyncio.gather(*(rbx_fetchUserID(username, priority) for username in roblox_usernames))
+    return dict(zip(roblox_usernames, ids))
+
+# User ID -> badge ID -> (time fetched, awarded date or None if not owned); reruns of /cgloves
+# check and compare reuse it. Each badge expires `rbx_badge_ttl` seconds after it was fetched.
+RBX_BADGE_TTL = float(os.getenv("rbx_badge_ttl", 300))
+rbx_badge_cache = TTLCache(ttl=RBX_BADGE_TTL, maxsize=1024)
+RBX_BADGE_CHUNK = 99
+RBX_BADGE_CONCURRENCY = int(os.getenv("rbx_badge_concurrency", 4))
+
+async def rbx_fetchBadgeAwards(roblox_user_id, badge_ids: List[int], priority: int = INTERACTIVE) -> Optional[Dict[int, Optional[str]]]:
+    """
+    Fetches which of the given badges a Roblox user owns, and when they were awarded.
+
+    Badge IDs are requested in chunks of 99 (the endpoint's limit), up to
+    `rbx_badge_concurrency` chunks at a time, and merged as they arrive.
+    Results are cached per user and badge, so only badges not already known (or
+    expired) are requested, and storing new ones leaves the age of the rest alone.
+
+    Args:
+        roblox_user_id (int): The ID to the account.
+        badge_ids (List[int]): The badges to check.
+        priority (int): INTERACTIVE, or BACKGROUND when polling
+
+    Returns:
+        Optional(Dict[int, Optional[str]]): Each badge ID mapped to its awarded date, or None if
+        it is not owned. None if any request failed.
+    """
+    user_id = int(roblox_user_id)
+    now = time.monotonic()
+    known: Dict[int, Optional[str]] = {
+        badge_id: awarded
+        for badge_id, (fetched_at, awarded) in (rbx_badge_cache.get(user_id) or {}).items()
+        if now - fetched_at < RBX_BADGE_TTL
+    }
+    missing = list(dict.fromkeys(int(badge_id) for badge_id in badge_ids if int(badge_id) not in known))
+    semaphore = asyncio.Semaphore(RBX_BADGE_CONCURRENCY)
+
+    async def fetch_chunk(chunk: List[int]) -> Optional[Dict[int, Optional[str]]]:
+        url = f"https://badges.roblox.com/v1/users/{user_id}/badges/awarded-dates?badgeIds={','.join(map(str, chunk))}"
+        async with semaphore:
+            async with api_request("roblox", "GET", url, priority=priority) as response:
+                if response.status != 200:
+                    return None
+                data = await response.json()
+        awards: Dict[int, Optional[str]] = dict.fromkeys(chunk)
+        awards.update({badge["badgeId"]: badge["awardedDate"] for badge in data["data"]})
+        return awards
+
+    chunks = [missing[i:i + RBX_BADGE_CHUNK] for i in range(0, len(missing), RBX_BADGE_CHUNK)]
+    tasks = [asyncio.create_task(fetch_chunk(chunk)) for chunk in chunks]
+    fetched: Dict[int, Optional[str]] = {}
+    failed = False
+    try:
+        for result in asyncio.as_completed(tasks):
+            awards = await result
+            if awards is None:
+                failed = True
+            else:
+                fetched.update(awards)
+    except BaseException:
+        # One chunk raised (or we were cancelled): stop the others and collect their outcomes
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        if fetched:
+            # Merge with whatever a concurrent call for the same user stored meanwhile, dropping expired badges
+            now = time.monotonic()
+            entries = {
+                badge_id: entry
+                for badge_id, entry in (rbx_badge_cache.get(user_id) or {}).items()
+                if now - entry[0] < RBX_BADGE_TTL
+            }
+            entries.update((badge_id, (now, awarded)) for badge_id, awarded in fetched.items())
+            rbx_badge_cache.set(user_id, entries)
+
+    if failed:
+        return None
+    known.update(fetched)
+    return {int(badge_id): known[int(badge_id)] for badge_id in badge_ids}
+
+class FriendGraphCache:
+    """
+    A persistent cache of Roblox friend lists (the friend graph's adjacency lists).
+
+    Each user's friend list is one SQLite row: the friend IDs packed as 64-bit
+    integers and the names as a zlib-compressed, newline-separated string, with
+    the time it was fetched. Rows older than `ttl` are treated as missing and
+    refetched. The file is shared by every /roblox friendswith search, so
+    accounts that show up in many searches are fetched once per `ttl`.
+
+    Every SQLite call runs on a single worker thread, so lookups and writes
+    never block the event loop and the one connection is never shared between
+    threads. Expired rows are deleted every `prune_interval` seconds once `start`
+    has been called.
+
+    Attributes:
+        path (str): Path to the SQLite file
+        ttl (float): Seconds a friend list is reused
+        prune_interval (float): Seconds between deletions of expired rows
+        executor (ThreadPoolExecutor): The thread the SQLite calls run on
+
+    ## Methods:
+        get_many(user_ids: Iterable[int]):
+        Returns the cached, unexpired friend lists of the given users.
+
+        put_many(friend_lists: Dict[int, Dict[int, str]]):
+        Stores friend lists in one transaction.
+
+        prune():
+        Deletes expired friend lists.
+
+        start():
+        Starts the background prune task.
+
+        close():
+        Stops the prune task and closes the SQLite connection.
+
+        stats():
+        Returns the hit/miss/write counters.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS friends (
+            user_id INTEGER PRIMARY KEY,
+            fetched_at REAL NOT NULL,
+            ids BLOB NOT NULL,
+            names BLOB NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, ttl: float, prune_interval: float = 3600):
+        self.path = path
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="friend_graph")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._counters: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "pruned": 0}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def _encode(friends: Dict[int, str]) -> Tuple[bytes, bytes]:
+        return array("q", friends.keys()).tobytes(), zlib.compress("\n".join(friends.values()).encode("utf-8"))
+
+    @staticmethod
+    def _decode(ids: bytes, names: bytes) -> Dict[int, str]:
+        friend_ids = array("q")
+        friend_ids.frombytes(ids)
+        friend_names = zlib.decompress(names).decode("utf-8").split("\n") if friend_ids else []
+        return dict(zip(friend_ids, friend_names))
+
+    async def _run_in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args))
+
+    def _get_many(self, user_ids: List[int]) -> Dict[int, Dict[int, str]]:
+        oldest = time.time() - self.ttl
+        found: Dict[int, Dict[int, str]] = {}
+        try:
+            for i in range(0, len(user_ids), 500):
+                chunk = user_ids[i:i + 500]
+                rows = self.conn.execute(
+                    f"SELECT user_id, ids, names FROM friends WHERE fetched_at > ? AND user_id IN ({','.join('?' * len(chunk))})",
+                    (oldest, *chunk),
+                )
+                for user_id, ids, names in rows:
+                    found[user_id] = self._decode(ids, names)
+        except sqlite3.Error as e:
+            print(f"Error: Could not read the friend graph cache. {e}")
+        self._counters["hits"] += len(found)
+        self._counters["misses"] += len(user_ids) - len(found)
+        return found
+
+    async def get_many(self, user_ids: Iterable[int]) -> Dict[int, Dict[int, str]]:
+        """
+        Returns the cached friend lists of the given users that have not expired.
+
+        Parameters:
+            user_ids (Iterable[int]): The users to look up
+
+        Returns:
+            Dict[int, Dict[int, str]]: User ID -> {friend ID: friend name}, only for cache hits
+        """
+        user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        if not user_ids:
+            return {}
+        return await self._run_in_thread(self._get_many, user_ids)
+
+    async def get(self, user_id: int) -> Optional[Dict[int, str]]:
+        """Returns one user's cached friend list, or None if it is missing or expired."""
+        return (await self.get_many([user_id])).get(int(user_id))
+
+    def _put_many(self, friend_lists: Dict[int, Dict[int, str]]) -> None:
+        now = time.time()
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO friends (user_id, fetched_at, ids, names) VALUES (?, ?, ?, ?)",
+                    [(int(user_id), now, *self._encode(friends)) for user_id, friends in friend_lists.items()],
+                )
+            self._counters["writes"] += len(friend_lists)
+        except sqlite3.Error as e:
+            print(f"Error: Could not write the friend graph cache. {e}")
+
+    async def put_many(self, friend_lists: Dict[int, Dict[int, str]]) -> None:
+        """Stores (or replaces) the friend lists of several users in one transaction."""
+        if not friend_lists:
+            return
+        await self._run_in_thread(self._put_many, dict(friend_lists))
+
+    def _prune(self) -> int:
+        with self.conn:
+            removed = self.conn.execute("DELETE FROM friends WHERE fetched_at <= ?", (time.time() - self.ttl,)).rowcount
+        self._counters["pruned"] += removed
+        return removed
+
+    async def prune(self) -> int:
+        """Deletes expired friend lists and returns how many were removed."""
+        return await self._run_in_thread(self._prune)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.prune()
+            except sqlite3.Error as e:
+                print(f"Error: Could not prune the friend graph cache. {e}")
+            await asyncio.sleep(max(self.prune_interval, 1))
+
+    def start(self) -> asyncio.Task:
+        """Starts the background prune task on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self) -> None:
+        """Stops the prune task, closes the SQLite connection and stops the thread."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._run_in_thread(self._close)
+        self.executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit, miss, write and prune counters."""
+        return dict(self._counters)
+
+# Friend lists for /roblox friendswith, kept across searches and restarts
+rbx_friend_graph = FriendGraphCache(
+    str(root_dir / "storage" / "roblox_friends.db"),
+    ttl=float(os.getenv("rbx_friends_ttl", 6 * 3600)),
+    prune_interval=float(os.getenv("rbx_friends_prune_interval", 3600)),
+)
 
 """
 MINECRAFT COMMANDS
 """
 
+# Username -> UUID, shared by the Minecraft and Hypixel cogs and kept across restarts.
+# Unknown names are remembered for `mc_uuid_negative_ttl` seconds so they are not retried upstream.
+mc_uuid_cache = PersistentCache(
+    "storage/mc_uuids.json",
+    ttl=float(os.getenv("mc_uuid_ttl", 7 * 86400)),
+    negative_ttl=float(os.getenv("mc_uuid_negative_ttl", 3600)),
+)
+
 async def mc_fetchUUID(interaction: discord.Interaction, username: str) -> Union[str, False]:
     """
     Fetches a Minecraft UUID based on username via API.
+
+    Results are served from `mc_uuid_cache` when possible, including names that
+    are known not to exist.
     
     Args:
         interaction (discord.Interaction): The interaction it was called from.
@@ -175,10 +830,65 @@ async def mc_fetchUUID(interaction: discord.Interaction, username: str) -> Union
     Returns:
         Union(str, False): The UUID of the account.
     """
-    async with ClientSession() as session:
-        async with session.get(f"https://api.mojang.com/users/profiles/minecraft/{username}") as response:
+    key = username.lower()
+    cached, uuid = mc_uuid_cache.lookup(key)
+    if cached:
+        if uuid is None:
+            await interaction.followup.send(f"No Minecraft account is named {username}.")
+            return False
+        return uuid
+
+    async def fetch() -> Tuple[int, Optional[str]]:
+        async with api_request("mojang", "GET", f"https://api.mojang.com/users/profiles/minecraft/{username}") as response:
+            if response.status == 200:
+                return response.status, (await response.json())["id"]
+            return response.status, None
+
+    status, uuid = await api_flight.do(("mojang_uuid", key), fetch)
+    if status in (200, 204, 404):
+        # Unknown names are cached too; rate limits and outages are not
+        mc_uuid_cache.set(key, uuid)
+    if uuid is None:
+        await interaction.followup.send(f"The usename is incorrect or the minecraft API is down. Exiting with status: {status}")
+        return False
+    return uuid
+
+"""
+HYPIXEL COMMANDS
+"""
+
+async def hy_fetchPlayerData(uuid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    Fetches a player's Hypixel stats.
+
+    Args:
+        uuid (str): The player's Minecraft UUID.
+
+    Returns:
+        Tuple(int, Optional(Dict[str, Any])): The response status, and the data if it was 200.
+    """
+    async def fetch() -> Tuple[int, Optional[Dict[str, Any]]]:
+        async with api_request("hypixel", "GET", f"https://api.hypixel.net/player?key={hypixelAPI}&uuid={uuid}") as response:
             if response.status == 200:
-                return (await response.json())["id"]
-            else:
-                await interaction.followup.send(f"The usename is incorrect or the minecraft API is down. Exiting with status: {response.status}")
-                return False
\ No newline at end of file
+                return response.status, await response.json()
+            return response.status, None
+
+    return await api_flight.do(("hypixel_player", uuid), fetch)
+
+async def hy_fetchSkyblockProfiles(uuid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    Fetches a player's Hypixel Skyblock profiles.
+
+    Args:
+        uuid (str): The player's Minecraft UUID.
+
+    Returns:
+        Tuple(int, Optional(Dict[str, Any])): The response status, and the data if it was 200.
+    """
+    async def fetch() -> Tuple[int, Optional[Dict[str, Any]]]:
+        async with api_request("hypixel", "GET", f"https://api.hypixel.net/v2/skyblock/profiles?key={hypixelAPI}&uuid={uuid}") as response:
+            if response.status == 200:
+                return response.status, await response.json()
+            return response.status, None
+
+    return await api_flight.do(("hypixel_skyblock", uuid), fetch)
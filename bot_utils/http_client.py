@@ -0,0 +1,87 @@
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from contextlib import asynccontextmanager
+from typing import Optional, AsyncIterator
+
+class HttpClient:
+    """
+    The bot-owned aiohttp session shared by every API call.
+
+    One session keeps TCP/TLS connections alive between requests and caches DNS
+    lookups, instead of paying for both on every command. The session is created
+    in `botMain.setup_hook` and closed when the bot shuts down; if something asks
+    for it earlier (or after a restart of the loop) it is created on demand.
+
+    Attributes:
+        limit (int): Maximum open connections in total
+        limit_per_host (int): Maximum open connections to a single host
+        dns_ttl (int): Seconds to cache DNS lookups for
+        keepalive (float): Seconds to keep an idle connection open
+        timeout (ClientTimeout): Default timeouts for every request, lenient (aiohttp's own
+                                 5 minutes) so media downloads from slow hosts still finish
+        api_timeout (ClientTimeout): The short connect/read timeouts `api_request` uses for API calls
+
+    ## Methods:
+        start():
+        Creates the shared session if it is not open yet.
+
+        close():
+        Closes the shared session and its connections.
+
+        session:
+        The shared ClientSession.
+    """
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_ttl: int = 300,
+        keepalive: float = 30.0,
+        timeout: ClientTimeout = ClientTimeout(total=300, sock_connect=30),
+        api_timeout: ClientTimeout = ClientTimeout(total=30, connect=10, sock_read=20),
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.api_timeout = api_timeout
+        self._session: Optional[ClientSession] = None
+
+    async def start(self) -> ClientSession:
+        """Creates the shared session if it is not open yet and returns it."""
+        return self.session
+
+    @property
+    def session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            self._session = ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """Closes the shared session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+http_client = HttpClient()
+
+@asynccontextmanager
+async def http_session() -> AsyncIterator[ClientSession]:
+    """
+    Yields the shared session. It is a drop-in for `async with ClientSession() as session:`
+    that leaves the session (and its pooled connections) open afterwards.
+
+    Example:
+        ```
+        async with http_session() as session:
+            async with session.get(url) as response:
+                data = await response.json()
+        ```
+    """
+    yield http_client.session
@@ -0,0 +1,129 @@
+import asyncio, heapq, itertools, time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional, Tuple
+
+INTERACTIVE = 0
+BACKGROUND = 10
+
+class RateLimiter:
+    """
+    A token bucket with a priority queue in front of it, for one upstream API.
+
+    Tokens refill at `rate` per second up to `burst`. A request takes a token
+    immediately when one is free and nobody is queued; otherwise it waits in
+    the queue, where lower priority values go first (INTERACTIVE before
+    BACKGROUND) and equal priorities go in arrival order. `pause` stops handing
+    out tokens for a while, e.g. when the API answers with Retry-After.
+
+    Attributes:
+        name (str): The API this limiter is for
+        rate (float): Tokens added per second
+        burst (int): Maximum tokens stored
+
+    ## Methods:
+        acquire(priority: int = INTERACTIVE):
+        Waits for a token.
+
+        pause(seconds: float):
+        Hands out no tokens for `seconds`.
+
+        stats():
+        Returns queue depth, wait times and throttling counters.
+    """
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._counters: Dict[str, float] = {"requests": 0, "queued": 0, "throttled": 0, "total_wait": 0.0, "max_wait": 0.0}
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if now < self.paused_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    async def _dispatch(self) -> None:
+        while self._waiters:
+            if self._waiters[0][2].done():
+                # The waiter was cancelled
+                heapq.heappop(self._waiters)
+                continue
+            if self._take():
+                heapq.heappop(self._waiters)[2].set_result(None)
+                continue
+            now = time.monotonic()
+            await asyncio.sleep(max(self.paused_until - now, (1 - self.tokens) / self.rate, 0.001))
+
+    async def acquire(self, priority: int = INTERACTIVE) -> None:
+        """
+        Waits until a token is available for this request.
+
+        Parameters:
+            priority (int): Lower values are served first; use INTERACTIVE for
+                            commands a user is waiting on and BACKGROUND for polling
+        """
+        start = time.monotonic()
+        self._counters["requests"] += 1
+        if not self._waiters and self._take():
+            return
+
+        self._counters["queued"] += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        await future
+
+        waited = time.monotonic() - start
+        self._counters["total_wait"] += waited
+        self._counters["max_wait"] = max(self._counters["max_wait"], waited)
+
+    def pause(self, seconds: float) -> None:
+        """Stops handing out tokens for `seconds` (queued requests keep their place)."""
+        self._counters["throttled"] += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns the queue depth, request/queued/throttled counts and average and max wait in seconds."""
+        queued = self._counters["queued"]
+        return {
+            "queue_depth": sum(1 for *_, future in self._waiters if not future.done()),
+            "requests": self._counters["requests"],
+            "queued": queued,
+            "throttled": self._counters["throttled"],
+            "avg_wait": self._counters["total_wait"] / queued if queued else 0.0,
+            "max_wait": self._counters["max_wait"],
+            "paused_for": max(0.0, self.paused_until - time.monotonic()),
+        }
+
+def parse_retry_after(headers: Mapping[str, str], default: float = 5.0) -> float:
+    """
+    Reads how long to back off from a Retry-After header (seconds or an HTTP date).
+
+    Parameters:
+        headers (Mapping[str, str]): The response headers
+        default (float): Seconds to use when the header is missing or invalid
+
+    Returns:
+        float: Seconds to wait
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
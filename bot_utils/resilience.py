@@ -0,0 +1,136 @@
+import random, time
+from typing import Dict, Any
+
+from .logger import warn
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit breaker is open."""
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"{host} is not responding right now, try again in {max(1, round(retry_in))} seconds.")
+
+class RateLimitedError(Exception):
+    """Raised when a host is still rate limiting a request after the one retry it gets."""
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"{host} is rate limiting requests right now, try again in {max(1, round(retry_after))} seconds.")
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a host that keeps failing.
+
+    The breaker starts "closed". After `failure_threshold` failures in a row
+    it "opens" and `allow` refuses every request for `reset_timeout` seconds,
+    so callers fail fast instead of each waiting out a timeout. It then goes
+    "half_open" and lets one trial request through: a success closes it again,
+    a failure opens it for another `reset_timeout`.
+
+    Attributes:
+        host (str): The host this breaker guards
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds the breaker stays open before a trial request
+
+    ## Methods:
+        allow():
+        Returns whether a request may be sent now.
+
+        record_success():
+        Closes the breaker and resets the failure count.
+
+        record_failure():
+        Counts a failure, opening the breaker at the threshold.
+
+        release():
+        Frees a half-open trial that ended without an answer from the host.
+
+        stats():
+        Returns the state and counters.
+    """
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_running = False
+        self._counters: Dict[str, int] = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def retry_in(self) -> float:
+        """Returns the seconds until an open breaker lets a trial request through."""
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now; an open breaker rejects it."""
+        if self.state == "open" and self.retry_in() <= 0:
+            self.state = "half_open"
+            self._trial_running = False
+
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self._trial_running:
+            self._trial_running = True
+            return True
+
+        self._counters["rejected"] += 1
+        return False
+
+    def record_success(self) -> None:
+        """Records a successful response, closing the breaker."""
+        self._counters["successes"] += 1
+        if self.state != "closed":
+            warn(f"{self.host} is responding again, circuit closed.")
+        self.state = "closed"
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Records a failed request (connection error, timeout or 5xx)."""
+        self._counters["failures"] += 1
+        self.failures += 1
+        self._trial_running = False
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            if self.state == "closed":
+                self._counters["opened"] += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            warn(f"{self.host} failed {self.failures} times in a row, circuit open for {self.reset_timeout:.0f}s.")
+
+    def release(self) -> None:
+        """
+        Frees the half-open trial slot without counting a success or failure.
+
+        Used when a request ends before the host answered for reasons of our own,
+        such as the request being cancelled or timing out in the local rate limiter
+        queue, so the next request can be the trial instead of the breaker
+        rejecting the host forever.
+        """
+        self._trial_running = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the state, consecutive failures, seconds until a trial request and the counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": self.retry_in() if self.state == "open" else 0.0,
+            **self._counters,
+        }
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Returns how long to wait before retry number `attempt` (0 for the first retry).
+
+    Uses "full jitter": a random delay between 0 and the exponential backoff,
+    so clients that failed together do not all retry at the same moment.
+
+    Parameters:
+        attempt (int): How many retries have been made already
+        base (float): Upper bound of the first delay in seconds
+        cap (float): Largest upper bound in seconds
+
+    Returns:
+        float: Seconds to sleep
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
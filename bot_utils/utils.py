@@ -1,7 +1,7 @@
-from .file_handler import (
-    open_json,
-    save_json
-)
+from .file_handler import open_json
+from .http_client import http_session
+from .cooldowns import cooldown_manager
+from .exp import exp_tracker
 
 import discord
 from discord import app_commands
@@ -11,7 +11,6 @@ import asyncio
 
 from datetime import timedelta
 from typing import Optional, TypeVar, Generic, Union, Dict, Any, Tuple, List
-from aiohttp import ClientSession
 from PIL import Image
 
 def parse_duration(duration_str: str) -> Optional[timedelta]:
@@ -297,7 +296,7 @@ async def get_dominant_color(url: str = None, buffer: io.BytesIO = None, timeout
             if buffer:
                 image = Image.open(buffer)
             else:
-                async with ClientSession() as session:
+                async with http_session() as session:
                     async with session.get(url) as response:
                         if response.status != 200:
                             return 0x808080
@@ -333,31 +332,22 @@ def get_member_cooldown(user_id: discord.User, command: str = None, exp: bool =
         ```
     """
 
-    current_time = int(time.time())
-    user_id = str(user_id)
-    
-    member_info = open_json("storage/member_info.json")
-
+    user_id = str(getattr(user_id, "id", user_id))
 
-    user_data = member_info.setdefault(user_id, {})
     if exp:
-        user_exp = user_data.setdefault("EXP", {})
-        exp_cooldown = user_exp.setdefault("cooldown", 0)
-        save_json("storage/member_info.json", member_info)
+        return int(time.time()) - exp_tracker.last_award_time(user_id)
 
-        return current_time - exp_cooldown
-    
     if command:
-        commands = user_data.setdefault("commands", {})
-        command_data = commands.setdefault(command, {"cooldown": 0})
-        save_json("storage/member_info.json", member_info)
-        
-        return current_time - command_data["cooldown"]
+        elapsed = cooldown_manager.elapsed(user_id, command)
+        # Never used (or a short cooldown that already ran out): same as a cooldown stamp of 0
+        return int(time.time()) if elapsed is None else int(elapsed)
 
 def check_command_cooldown(user_id: str, command_name: str, cooldown_seconds: int) -> Tuple[bool, int]:
     """
     Checks if a command is on cooldown.
 
+    Cooldowns are answered from `cooldown_manager` in memory, see `CooldownManager`.
+
     Args:
         user_id (str): The ID of the user to check the cooldown for.
         command_name (str): The name of the command to check the cooldown for.
@@ -373,43 +363,11 @@ def check_command_cooldown(user_id: str, command_name: str, cooldown_seconds: in
             is_on_cooldown, remaining_time = check_command_cooldown(interaction.user.id, "test", 10)
         ```
     """
-    member_info = open_json("storage/member_info.json")
-    current_time = int(time.time())
-    
-    if str(user_id) not in member_info:
-        member_info[str(user_id)] = {"commands": {}}
-    
-    user_data = member_info[str(user_id)]
-    if "commands" not in user_data:
-        user_data["commands"] = {}
-        
-    cmd_data = user_data["commands"].get(command_name, {"uses": 0, "cooldown": 0})
-    
-    if current_time - cmd_data["cooldown"] < cooldown_seconds:
-        remaining = cooldown_seconds - (current_time - cmd_data["cooldown"])
-        return True, remaining
-        
-    return False, 0
+    return cooldown_manager.check(str(user_id), command_name, cooldown_seconds)
 
-def update_command_cooldown(user_id: str, command_name: str):
-    """Update the command cooldown timestamp"""
-    member_info = open_json("storage/member_info.json")
-    current_time = int(time.time())
-    
-    if str(user_id) not in member_info:
-        member_info[str(user_id)] = {"commands": {}}
-    
-    user_data = member_info[str(user_id)]
-    if "commands" not in user_data:
-        user_data["commands"] = {}
-        
-    if command_name not in user_data["commands"]:
-        user_data["commands"][command_name] = {"uses": 0, "cooldown": 0}
-        
-    user_data["commands"][command_name]["uses"] += 1
-    user_data["commands"][command_name]["cooldown"] = current_time
-    
-    save_json("storage/member_info.json", member_info)
+def update_command_cooldown(user_id: str, command_name: str, cooldown_seconds: int):
+    """Starts the command's cooldown of `cooldown_seconds` (only daily and longer cooldowns are saved to member_info.json)"""
+    cooldown_manager.hit(str(user_id), command_name, cooldown_seconds)
     
 async def get_command_help_embed(command_name: str) -> discord.Embed:
     command_help = open_json("storage/command_help.json")
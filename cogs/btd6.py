@@ -1,4 +1,5 @@
 from bot_utils import (
+    api_request,
     open_json,
     save_json,
     handle_logs,
@@ -9,7 +10,6 @@ from discord.ext import commands
 from discord import app_commands
 
 import re
-from aiohttp import ClientSession
 
 @app_commands.allowed_installs(guilds=True, users=True)
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
@@ -52,47 +52,46 @@ class BloonsTD6CommandGroup(app_commands.Group):
     async def btd6racedata(self, interaction: discord.Interaction, race_id: str):
         await interaction.response.defer()
         try:
-            async with ClientSession() as session:
-                async with session.get("https://data.ninjakiwi.com/btd6/races") as response:
-                    if response.status == 200:
-                        races_data = await response.json()
+            async with api_request("ninjakiwi", "GET", "https://data.ninjakiwi.com/btd6/races") as response:
+                if response.status == 200:
+                    races_data = await response.json()
                         
-                        if (races_data.get("success") and races_data.get("body")):
-                            found_race = None
-                            for race in races_data["body"]:
-                                if (str(race["id"]) == race_id or race["name"].lower() == race_id.lower()):
-                                    found_race = race
-                                    break
+                    if (races_data.get("success") and races_data.get("body")):
+                        found_race = None
+                        for race in races_data["body"]:
+                            if (str(race["id"]) == race_id or race["name"].lower() == race_id.lower()):
+                                found_race = race
+                                break
                             
-                            if found_race:
-                                embed = discord.Embed(
-                                    title=f"<:btd6Race:1312989026147631154> BTD6 Race: {found_race['name']}",
-                                    description=f"Race ID: {found_race['id']}",
-                                    color=discord.Color.red()
-                                )
+                        if found_race:
+                            embed = discord.Embed(
+                                title=f"<:btd6Race:1312989026147631154> BTD6 Race: {found_race['name']}",
+                                description=f"Race ID: {found_race['id']}",
+                                color=discord.Color.red()
+                            )
                                 
-                                start_time = int(found_race['start'] / 1000)
-                                end_time = int(found_race['end'] / 1000)
+                            start_time = int(found_race['start'] / 1000)
+                            end_time = int(found_race['end'] / 1000)
                                 
-                                embed.add_field(
-                                    name="Time Information",
-                                    value=f"Start: <t:{start_time}:F>\nEnd: <t:{end_time}:F>",
-                                    inline=False
-                                )
+                            embed.add_field(
+                                name="Time Information",
+                                value=f"Start: <t:{start_time}:F>\nEnd: <t:{end_time}:F>",
+                                inline=False
+                            )
                                 
-                                embed.add_field(
-                                    name="Participation",
-                                    value=f"Total Scores: {found_race.get('totalScores', 'Unknown'):,}",
-                                    inline=False
-                                )
+                            embed.add_field(
+                                name="Participation",
+                                value=f"Total Scores: {found_race.get('totalScores', 'Unknown'):,}",
+                                inline=False
+                            )
                                 
-                                await interaction.followup.send(embed=embed)
-                            else:
-                                await interaction.followup.send("Race not found. Please check the race ID or name and try again.", ephemeral=True)
+                            await interaction.followup.send(embed=embed)
                         else:
-                            await interaction.followup.send("Failed to retrieve race data.", ephemeral=True)
+                            await interaction.followup.send("Race not found. Please check the race ID or name and try again.", ephemeral=True)
                     else:
-                        await interaction.followup.send(f"Error occurred while fetching race data. Status code: {response.status}", ephemeral=True)
+                        await interaction.followup.send("Failed to retrieve race data.", ephemeral=True)
+                else:
+                    await interaction.followup.send(f"Error occurred while fetching race data. Status code: {response.status}", ephemeral=True)
         except Exception as e:
             print(f"Exception in racedata command: {str(e)}")
             await handle_logs(interaction, e)
@@ -104,38 +103,37 @@ class BloonsTD6CommandGroup(app_commands.Group):
         try:
             emoji_data = open_json("storage/bot_data.json")["emoji_data"]
 
-            async with ClientSession() as session:
-                async with session.get(f"https://data.ninjakiwi.com/btd6/races/{race_id}/leaderboard") as response:
-                    if response.status == 200:
-                        data = await response.json()            
-
-                        if 'body' in data:
-                            leaderboard = data['body']
-                            embed = discord.Embed(
-                                title=f"<:btd6Race:1312989026147631154> BTD6 Race Leaderboard: {race_id}",
-                                color=discord.Color.orange(),
+            async with api_request("ninjakiwi", "GET", f"https://data.ninjakiwi.com/btd6/races/{race_id}/leaderboard") as response:
+                if response.status == 200:
+                    data = await response.json()            
+
+                    if 'body' in data:
+                        leaderboard = data['body']
+                        embed = discord.Embed(
+                            title=f"<:btd6Race:1312989026147631154> BTD6 Race Leaderboard: {race_id}",
+                            color=discord.Color.orange(),
+                        )
+
+                        for i, player in enumerate(leaderboard[:9]):
+                            display_name = player['displayName']
+                            score = f"{player['score']:,}"
+                            profile_url = player['profile']
+
+                            emoji_key = f"btd6Race{['First', 'Second', 'Third', 'Fourth', 'Fifth', 'Sixth', 'Seventh', 'Eighth', 'Ninth'][i]}"
+                            emoji_id = emoji_data.get(emoji_key, "")
+                            emoji = f"<:{emoji_key}:{emoji_id}>"
+
+                            embed.add_field(
+                                name=f"{emoji} {i + 1}. {display_name}",
+                                value=f"<:btd6Trophy:1312993305038032966> **Score**: {score}\n[Profile]({profile_url})",
+                                inline=False
                             )
 
-                            for i, player in enumerate(leaderboard[:9]):
-                                display_name = player['displayName']
-                                score = f"{player['score']:,}"
-                                profile_url = player['profile']
-
-                                emoji_key = f"btd6Race{['First', 'Second', 'Third', 'Fourth', 'Fifth', 'Sixth', 'Seventh', 'Eighth', 'Ninth'][i]}"
-                                emoji_id = emoji_data.get(emoji_key, "")
-                                emoji = f"<:{emoji_key}:{emoji_id}>"
-
-                                embed.add_field(
-                                    name=f"{emoji} {i + 1}. {display_name}",
-                                    value=f"<:btd6Trophy:1312993305038032966> **Score**: {score}\n[Profile]({profile_url})",
-                                    inline=False
-                                )
-
-                            await interaction.followup.send(embed=embed)
-                        else:
-                            await interaction.followup.send("Unexpected response structure. Did you type the wrong race ID?")
+                        await interaction.followup.send(embed=embed)
                     else:
-                        await interaction.followup.send("Failed to fetch data. Please try again later.")
+                        await interaction.followup.send("Unexpected response structure. Did you type the wrong race ID?")
+                else:
+                    await interaction.followup.send("Failed to fetch data. Please try again later.")
 
         except Exception as e:
             await handle_logs(interaction, e)
@@ -144,38 +142,37 @@ class BloonsTD6CommandGroup(app_commands.Group):
     async def btd6races(self, interaction: discord.Interaction):
         await interaction.response.defer()
         try:
-            async with ClientSession() as session:
-                async with session.get("https://data.ninjakiwi.com/btd6/races") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if 'body' in data:
-                            body = data['body']
-                            embed = discord.Embed(
-                                title="BTD6 Race Events",
-                                color=discord.Color.blue(),
+            async with api_request("ninjakiwi", "GET", "https://data.ninjakiwi.com/btd6/races") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if 'body' in data:
+                        body = data['body']
+                        embed = discord.Embed(
+                            title="BTD6 Race Events",
+                            color=discord.Color.blue(),
+                        )
+
+                        for _, race in enumerate(body):
+                            race_name = race['name']
+                            race_id = race['id']
+                            race_start = f"<t:{int(race['start'] / 1000)}:F>"
+                            race_end = f"<t:{int(race['end'] / 1000)}:F>"
+                            total_scores = f"{race['totalScores']:,}"
+
+                            embed.add_field(
+                                name=f"<:btd6Race:1312989026147631154> Race: {race_name} (ID: {race_id})",
+                                value=(
+                                    f"**Start Time**: {race_start}\n"
+                                    f"**End Time**: {race_end}\n"
+                                    f"<:btd6Trophy:1312993305038032966> **Total Scores Submitted**: {total_scores}\n"
+                                ),
+                                inline=False
                             )
-
-                            for _, race in enumerate(body):
-                                race_name = race['name']
-                                race_id = race['id']
-                                race_start = f"<t:{int(race['start'] / 1000)}:F>"
-                                race_end = f"<t:{int(race['end'] / 1000)}:F>"
-                                total_scores = f"{race['totalScores']:,}"
-
-                                embed.add_field(
-                                    name=f"<:btd6Race:1312989026147631154> Race: {race_name} (ID: {race_id})",
-                                    value=(
-                                        f"**Start Time**: {race_start}\n"
-                                        f"**End Time**: {race_end}\n"
-                                        f"<:btd6Trophy:1312993305038032966> **Total Scores Submitted**: {total_scores}\n"
-                                    ),
-                                    inline=False
-                                )
-                            await interaction.followup.send(embed=embed)
-                        else:
-                            await interaction.followup.send("Unexpected response structure.")
+                        await interaction.followup.send(embed=embed)
                     else:
-                        await interaction.followup.send("Failed to fetch data. Please try again later.")
+                        await interaction.followup.send("Unexpected response structure.")
+                else:
+                    await interaction.followup.send("Failed to fetch data. Please try again later.")
         except Exception as e:
             await handle_logs(interaction, e)
 
@@ -192,71 +189,70 @@ class BloonsTD6CommandGroup(app_commands.Group):
                 else:
                     oak_key = member_info[discord_user_id]["btd6oakkey"]
 
-            async with ClientSession() as session:
-                async with session.get(f"https://data.ninjakiwi.com/btd6/users/{oak_key}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        if 'body' in data:
-                            body = data['body']
-
-                            display_name = body.get("displayName", "N/A")
-                            rank = body.get("rank", "N/A")
-                            veteran_rank = body.get("veteranRank", "N/A")
-                            achievements = body.get("achievements", "N/A")
-                            most_experienced_monkey = body.get("mostExperiencedMonkey", "N/A")
-                            avatar_url = body.get("avatarURL", "https://example.com/default-avatar.png")
-                            followers = body.get("followers", "N/A")
-
-                            embed = discord.Embed(
-                                title=f"{display_name}'s Profile",
-                                color=discord.Color.green()
-                            )
-                            embed.set_thumbnail(url=avatar_url)
-                            embed.add_field(name="Rank", value=str(rank))
-                            if int(rank) > 155:
-                                embed.add_field(name="Veteran Rank", value=str(veteran_rank))
+            async with api_request("ninjakiwi", "GET", f"https://data.ninjakiwi.com/btd6/users/{oak_key}") as response:
+                if response.status == 200:
+                    data = await response.json()
+
+                    if 'body' in data:
+                        body = data['body']
+
+                        display_name = body.get("displayName", "N/A")
+                        rank = body.get("rank", "N/A")
+                        veteran_rank = body.get("veteranRank", "N/A")
+                        achievements = body.get("achievements", "N/A")
+                        most_experienced_monkey = body.get("mostExperiencedMonkey", "N/A")
+                        avatar_url = body.get("avatarURL", "https://example.com/default-avatar.png")
+                        followers = body.get("followers", "N/A")
+
+                        embed = discord.Embed(
+                            title=f"{display_name}'s Profile",
+                            color=discord.Color.green()
+                        )
+                        embed.set_thumbnail(url=avatar_url)
+                        embed.add_field(name="Rank", value=str(rank))
+                        if int(rank) > 155:
+                            embed.add_field(name="Veteran Rank", value=str(veteran_rank))
                                 
-                            embed.add_field(name="Achievements", value=f"{str(achievements)}/150")
-                            embed.add_field(name="Most Experienced Monkey", value=most_experienced_monkey)
-                            embed.add_field(name="Followers", value=str(followers))
-
-                            gameplay = body.get("gameplay", {})
-                            total_cash_earned = gameplay.get("cashEarned", "N/A")
-                            highest_round = gameplay.get("highestRound", "N/A")
-                            total_games_won = gameplay.get("gamesWon", "N/A")
-                            total_games_played = gameplay.get("gameCount", "N/A")
-                            total_monkeys_placed = gameplay.get("monkeysPlaced", "N/A")
-
-                            def format_number(num):
-                                if isinstance(num, int):
-                                    return f"{num:,}"
-                                return num
-
-                            embed.add_field(name="Total Cash Earned", value=f"${format_number(total_cash_earned)}")
-                            embed.add_field(name="Highest Round", value=str(highest_round))
-                            embed.add_field(name="Total Games Won", value=f"{str(total_games_won)}/{str(total_games_played)}")
-                            embed.add_field(name="Total Monkeys Placed", value=format_number(total_monkeys_placed))
-
-                            towers_placed = body.get("towersPlaced", {})
-                            tower_lines = ""
-                            if total_monkeys_placed != "N/A" and isinstance(total_monkeys_placed, int):
-                                for tower, count in towers_placed.items():
-                                    if isinstance(count, int):
-                                        percentage = (count / total_monkeys_placed) * 100
-                                        tower_lines += f"{re.sub(r'([A-Z])', r' \1', tower).strip().title()}: {format_number(count)} ({percentage:.2f}%)\n"
-
-                            embed.add_field(name="Monkeys Placed by Type", value=tower_lines if tower_lines else "N/A", inline=False)
-
-                            bloons_popped = body.get("bloonsPopped", {})
-                            bloon_lines = "\n".join([f"{re.sub(r'([A-Z])', r' \1', bloon_type.replace('Popped', '').replace('Leaked', ' Leaks')).strip().title()}: {format_number(count)}" for bloon_type, count in bloons_popped.items()])
-                            embed.add_field(name="Bloons Popped Stats", value=bloon_lines if bloon_lines else "N/A", inline=False)
-
-                            await interaction.followup.send(embed=embed)
-                        else:
-                            await interaction.followup.send("Unexpected response structure.")
+                        embed.add_field(name="Achievements", value=f"{str(achievements)}/150")
+                        embed.add_field(name="Most Experienced Monkey", value=most_experienced_monkey)
+                        embed.add_field(name="Followers", value=str(followers))
+
+                        gameplay = body.get("gameplay", {})
+                        total_cash_earned = gameplay.get("cashEarned", "N/A")
+                        highest_round = gameplay.get("highestRound", "N/A")
+                        total_games_won = gameplay.get("gamesWon", "N/A")
+                        total_games_played = gameplay.get("gameCount", "N/A")
+                        total_monkeys_placed = gameplay.get("monkeysPlaced", "N/A")
+
+                        def format_number(num):
+                            if isinstance(num, int):
+                                return f"{num:,}"
+                            return num
+
+                        embed.add_field(name="Total Cash Earned", value=f"${format_number(total_cash_earned)}")
+                        embed.add_field(name="Highest Round", value=str(highest_round))
+                        embed.add_field(name="Total Games Won", value=f"{str(total_games_won)}/{str(total_games_played)}")
+                        embed.add_field(name="Total Monkeys Placed", value=format_number(total_monkeys_placed))
+
+                        towers_placed = body.get("towersPlaced", {})
+                        tower_lines = ""
+                        if total_monkeys_placed != "N/A" and isinstance(total_monkeys_placed, int):
+                            for tower, count in towers_placed.items():
+                                if isinstance(count, int):
+                                    percentage = (count / total_monkeys_placed) * 100
+                                    tower_lines += f"{re.sub(r'([A-Z])', r' \1', tower).strip().title()}: {format_number(count)} ({percentage:.2f}%)\n"
+
+                        embed.add_field(name="Monkeys Placed by Type", value=tower_lines if tower_lines else "N/A", inline=False)
+
+                        bloons_popped = body.get("bloonsPopped", {})
+                        bloon_lines = "\n".join([f"{re.sub(r'([A-Z])', r' \1', bloon_type.replace('Popped', '').replace('Leaked', ' Leaks')).strip().title()}: {format_number(count)}" for bloon_type, count in bloons_popped.items()])
+                        embed.add_field(name="Bloons Popped Stats", value=bloon_lines if bloon_lines else "N/A", inline=False)
+
+                        await interaction.followup.send(embed=embed)
                     else:
-                        await interaction.followup.send("Failed to fetch data. Please check the user ID or try again later.")
+                        await interaction.followup.send("Unexpected response structure.")
+                else:
+                    await interaction.followup.send("Failed to fetch data. Please check the user ID or try again later.")
         except Exception as e:
             await handle_logs(interaction, e)
 
@@ -1,6 +1,9 @@
 from bot_utils import (
     cr_fetchClanData,
     cr_fetchPlayerData,
+    BACKGROUND,
+    CircuitOpenError,
+    RateLimitedError,
 
     open_json,
     save_json,
@@ -12,7 +15,7 @@ from discord.ext import commands
 from discord.ui import View, Button
 from discord import app_commands, ButtonStyle
 
-import asyncio, random, re
+import asyncio, aiohttp, random, re
 from datetime import datetime, timedelta
 
 class ProfileView(View):
@@ -204,7 +207,16 @@ class ClashRoyaleCommandGroup(app_commands.Group):
 
             end_time = datetime.now() + timedelta(minutes=15)
             while datetime.now() < end_time:
-                player_data = await cr_fetchPlayerData(tag.replace("#", "%23"))
+                try:
+                    player_data = await cr_fetchPlayerData(tag.replace("#", "%23"), fresh=True, priority=BACKGROUND)
+                except (CircuitOpenError, RateLimitedError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # The API being down for a minute should not end the 15 minute window
+                    print(f"Error: Could not poll Clash Royale player {tag}. {e}")
+                    player_data = None
+                if not isinstance(player_data, dict):
+                    await asyncio.sleep(60)
+                    continue
+
                 current_deck = player_data.get("currentDeck", [])
                 player_deck_names = [card.get("name", "Unknown") for card in current_deck]
 
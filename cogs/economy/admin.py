@@ -1,14 +1,21 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
 from bot_utils import (
     open_json, 
     save_json,
+    json_cache,
     handle_logs
 )
 from .utils import (
     check_user_stat,
-    get_item_suggestions
+    get_item_suggestions,
+    migrate_economy_json,
+    change_balance,
+    change_item,
+    eco_path,
+    eco_db_path
 )
 from main import botAdmins
 from .shop import SHOP_DATA
@@ -35,10 +42,7 @@ class EconomyAdminCog(commands.Cog):
                 return await interaction.response.send_message("That item does not exist!", ephemeral=True)
             
             user_id = str(user.id)
-            check_user_stat(["inventory", item], user_id, 0)
-            eco = open_json("storage/economy/economy.json")
-            eco[user_id]["inventory"][item] += amount
-            save_json("storage/economy/economy.json", eco)
+            change_item(user_id, item, amount, reason=f"give_items by {interaction.user.id}")
 
             await interaction.response.send_message(f"Successfully added {amount} {item}/s to {user.mention}")
         except Exception as e:
@@ -51,10 +55,7 @@ class EconomyAdminCog(commands.Cog):
                 return await interaction.response.send_message("You do not have permission to use this command!", ephemeral=True)
 
             user_id = str(user.id)
-            check_user_stat(["balance", "purse"], user_id, 0)
-            eco = open_json("storage/economy/economy.json")
-            eco[user_id]["balance"]["purse"] += amount
-            save_json("storage/economy/economy.json", eco)
+            change_balance(user_id, amount, reason=f"give_coins by {interaction.user.id}")
 
             await interaction.response.send_message(f"Successfully added {amount} coins to {user.mention}")
         except Exception as e:
@@ -101,5 +102,26 @@ class EconomyAdminCog(commands.Cog):
         except Exception as e:
             await handle_logs(interaction, e)
 
+    @app_commands.command(name="migrate_economy")
+    async def migrate_economy(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            if self.is_not_admin(interaction.user.id):
+                return await interaction.followup.send("You do not have permission to use this command!", ephemeral=True)
+
+            if json_cache.backend_for(eco_path) is not None:
+                return await interaction.followup.send("The economy is already served from SQLite.", ephemeral=True)
+
+            json_cache.flush(eco_path)
+            players = await asyncio.to_thread(migrate_economy_json, eco_path, eco_db_path)
+
+            await interaction.followup.send(
+                f"Imported {players:,} players into `{eco_db_path}`. "
+                "Set `economy_backend=sqlite` in secrets.env and restart the bot to use it.",
+                ephemeral=True
+            )
+        except Exception as e:
+            await handle_logs(interaction, e)
+
 async def setup(bot):
     await bot.add_cog(EconomyAdminCog(bot))
\ No newline at end of file
@@ -1,24 +1,29 @@
 import random
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from bot_utils import (
     send_cooldown,
     open_json,
     save_json,
+    json_cache,
     handle_logs
 )
 from .utils import (
     check_user_stat,
     command_cooldown,
     get_item_name,
-    process_transaction
+    process_transaction,
+    change_balance,
+    EconomyLedger,
+    eco_path
 )
 
 class MainEconomyCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.eco_path = "storage/economy/economy.json"
+        self.compact_ledger.start()
         self.crimes = {
         "Robbery": {
             "Success": [
@@ -135,11 +140,19 @@ class MainEconomyCog(commands.Cog):
     def add_money(self, id: str, amount: int):
         check_user_stat(["balance", "purse"], id, 0)
         coin_multi = check_user_stat(["boosts", "coin"], id, 100)
-        eco = open_json(self.eco_path)
-        eco[id]["balance"]["purse"] += amount * (coin_multi / 100)
-        save_json(self.eco_path, eco)
+        change_balance(id, amount * (coin_multi / 100), reason="add_money")
         return amount, (coin_multi / 100)
 
+    def cog_unload(self):
+        self.compact_ledger.cancel()
+
+    @tasks.loop(minutes=30)
+    async def compact_ledger(self):
+        ledger = json_cache.backend_for(eco_path)
+        if isinstance(ledger, EconomyLedger):
+            json_cache.flush(eco_path)
+            await ledger.compact()
+
     @commands.hybrid_command(name="beg")
     async def beg(self, ctx: commands.Context):
         try:
@@ -6,6 +6,7 @@ from bot_utils import (
     send_cooldown,
     open_json, 
     save_json,
+    json_transaction,
     handle_logs
 )
 from .utils import (
@@ -161,8 +162,6 @@ class FishingCommands(app_commands.Group):
         async def catch_button(self, interaction: discord.Interaction, button: discord.ui.Button):
             try:
                 user_id = str(interaction.user.id)
-                check_user_stat(["commands"], user_id, {})
-                check_user_stat(["commands", "fish_catch"], user_id, {"cooldown": 0, "uses": 0})
                 cooldown_result = command_cooldown(3, "fish_catch", user_id)
                 
                 if isinstance(cooldown_result, tuple):
@@ -176,89 +175,79 @@ class FishingCommands(app_commands.Group):
                 check_user_stat(["fishing", "boat"], user_id, None)
                 check_user_stat(["balance", "fish_tokens"], user_id, 0)
                 
-                eco = open_json(self.bot_self.eco_path)
-                fish_data = open_json(self.bot_self.fish_path)
-                
-                if "inventory" not in eco[user_id]:
-                    eco[user_id]["inventory"] = {}
+                # Only the bookkeeping runs under the lock, the reply is sent after it is released
+                error_embed = None
+                caught_fish = []
+                async with json_transaction(self.bot_self.eco_path) as eco:
+                    fish_data = open_json(self.bot_self.fish_path)
                 
-                for fish_name in fish_data["fish"].keys():
-                    if fish_name not in eco[user_id]["inventory"]:
-                        eco[user_id]["inventory"][fish_name] = 0
+                    if "inventory" not in eco[user_id]:
+                        eco[user_id]["inventory"] = {}
                 
-                save_json(self.bot_self.eco_path, eco)
-                eco = open_json(self.bot_self.eco_path)
+                    for fish_name in fish_data["fish"].keys():
+                        if fish_name not in eco[user_id]["inventory"]:
+                            eco[user_id]["inventory"][fish_name] = 0
                 
-                current_rod = self.bot_self.get_current_rod(user_id, eco)
-                current_boat = self.bot_self.get_current_boat(user_id, eco)
+                    current_rod = self.bot_self.get_current_rod(user_id, eco)
+                    current_boat = self.bot_self.get_current_boat(user_id, eco)
                 
-                if not current_rod and not current_boat:
-                    embed = discord.Embed(
-                        title="No Fishing Equipment!",
-                        description="You need a fishing rod and boat to fish! Buy one from the shop.",
-                        color=discord.Color.red()
-                    )
-                    return await interaction.response.send_message(embed=embed, ephemeral=True)
-
-                fishing_level = eco[user_id]["fishing"]["level"]
-                rod_level = self.bot_self.get_rod_level(current_rod, fish_data) if current_rod else 0
-                boat_level = self.bot_self.get_boat_level(current_boat, fish_data) if current_boat else 0
-
-                eco[user_id]["fishing"]["exp"] += 1
-                leveled_up = self.bot_self.check_level_up(user_id, eco)
+                    if not current_rod and not current_boat:
+                        error_embed = discord.Embed(
+                            title="No Fishing Equipment!",
+                            description="You need a fishing rod and boat to fish! Buy one from the shop.",
+                            color=discord.Color.red()
+                        )
+                    else:
+                        fishing_level = eco[user_id]["fishing"]["level"]
+                        rod_level = self.bot_self.get_rod_level(current_rod, fish_data) if current_rod else 0
+                        boat_level = self.bot_self.get_boat_level(current_boat, fish_data) if current_boat else 0
+
+                        eco[user_id]["fishing"]["exp"] += 1
+                        leveled_up = self.bot_self.check_level_up(user_id, eco)
+
+                        available_fish = []
+                        for fish_name, fish_info in fish_data["fish"].items():
+                            if (fish_info["rod_level"] <= rod_level and fish_info["boat_level"] <= boat_level):
+                                weight = fish_info.get("weight", 1000000000)
+                                available_fish.append((fish_name, weight))
+
+                        if not available_fish:
+                            error_embed = discord.Embed(
+                                title="No Fish Available!",
+                                description="You can't catch any fish with your current equipment.",
+                                color=discord.Color.red()
+                            )
+                        else:
+                            success_rate = min(80 + (fishing_level / 2), 95)
+                        
+                            base_token = 1
+                            token_multiplier = self.bot_self.get_token_multiplier(user_id, eco)
+                            catch_multiplier = self.bot_self.get_catch_multiplier(user_id, eco)
+                            rarity_modifier = self.bot_self.get_rarity_modifier(user_id, eco)
+                        
+                            total_tokens = base_token * (1 + token_multiplier)
+                            attempts = max(1, int(random.randint(1, 50) * catch_multiplier))
 
-                available_fish = []
-                for fish_name, fish_info in fish_data["fish"].items():
-                    if (fish_info["rod_level"] <= rod_level and fish_info["boat_level"] <= boat_level):
-                        weight = fish_info.get("weight", 1000000000)
-                        available_fish.append((fish_name, weight))
+                            fish_names = [f[0] for f in available_fish]
+                            weights = [f[1] for f in available_fish]
+                            if rarity_modifier > 0:
+                                total_weight = sum(weights)
+                                weights = [weight * (1 + (rarity_modifier * 0.05 * (1 - (weight / total_weight)))) for weight in weights]
 
-                if not available_fish:
-                    embed = discord.Embed(
-                        title="No Fish Available!",
-                        description="You can't catch any fish with your current equipment.",
-                        color=discord.Color.red()
-                    )
-                    return await interaction.response.send_message(embed=embed, ephemeral=True)
+                            inventory = eco[user_id].setdefault("inventory", {})
+                            for _ in range(attempts):
+                                if random.random() * 100 <= success_rate:
+                                    fish_name = random.choices(fish_names, weights=weights, k=1)[0]
+                                    caught_fish.append(fish_name)
+                                    inventory[fish_name] = inventory.get(fish_name, 0) + 1
 
-                success_rate = min(80 + (fishing_level / 2), 95)
-                
-                base_token = 1
-                token_multiplier = self.bot_self.get_token_multiplier(user_id, eco)
-                catch_multiplier = self.bot_self.get_catch_multiplier(user_id, eco)
-                rarity_modifier = self.bot_self.get_rarity_modifier(user_id, eco)
-                
-                total_tokens = base_token * (1 + token_multiplier)
-                attempts = max(1, int(random.randint(1, 50) * catch_multiplier))
+                            eco[user_id]["balance"]["fish_tokens"] += total_tokens
 
-                caught_fish = []
-                for _ in range(attempts):
-                    if random.random() * 100 <= success_rate:
-                        fish_names = [f[0] for f in available_fish]
-                        weights = [f[1] for f in available_fish]
-                        
-                        if rarity_modifier > 0:
-                            total_weight = sum(weights)
-                            modified_weights = []
-                            for weight in weights:
-                                rarity = 1 - (weight / total_weight)
-                                modifier = 1 + (rarity_modifier * 0.05 * rarity)
-                                modified_weights.append(weight * modifier)
-                            weights = modified_weights
-
-                        try:
-                            fish_name = random.choices(fish_names, weights=weights, k=1)[0]
-                            caught_fish.append(fish_name)
-                            if "inventory" not in eco[user_id]:
-                                eco[user_id]["inventory"] = {}
-                            if fish_name not in eco[user_id]["inventory"]:
-                                eco[user_id]["inventory"][fish_name] = 0
-                            eco[user_id]["inventory"][fish_name] += 1
-                        except Exception as e:
-                            await handle_logs(interaction, e)
+                        new_level = eco[user_id]["fishing"]["level"]
+                        new_exp = eco[user_id]["fishing"]["exp"]
 
-                eco[user_id]["balance"]["fish_tokens"] += total_tokens
-                save_json(self.bot_self.eco_path, eco)
+                if error_embed is not None:
+                    return await interaction.response.send_message(embed=error_embed, ephemeral=True)
 
                 if caught_fish:
                     fish_counts = {}
@@ -268,7 +257,7 @@ class FishingCommands(app_commands.Group):
                     description = "You caught:\n" + "\n".join(f"{count}x {display_item_name(fish)}" for fish, count in fish_counts.items())
                     description += f"\n\nGained {total_tokens} fish tokens!"
                     if leveled_up:
-                        description += f"\n🎉 Level Up! You are now level {eco[user_id]['fishing']['level']}!"
+                        description += f"\n🎉 Level Up! You are now level {new_level}!"
                     
                     embed = discord.Embed(
                         title=f"🎣 {interaction.user.name}",
@@ -278,7 +267,7 @@ class FishingCommands(app_commands.Group):
                     
                     embed.add_field(
                         name="Stats",
-                        value=f"Level: {fishing_level}\nEXP: {eco[user_id]['fishing']['exp']}/{self.bot_self.calculate_required_exp(fishing_level)}"
+                        value=f"Level: {fishing_level}\nEXP: {new_exp}/{self.bot_self.calculate_required_exp(fishing_level)}"
                     )
 
                     await interaction.response.send_message(embed=embed, view=self.bot_self.AllView("catch", self.bot_self))
@@ -289,7 +278,7 @@ class FishingCommands(app_commands.Group):
                         color=discord.Color.red()
                     )
                     if leveled_up:
-                        embed.description += f"\n🎉 But you leveled up! You are now level {eco[user_id]['fishing']['level']}!"
+                        embed.description += f"\n🎉 But you leveled up! You are now level {new_level}!"
 
                     await interaction.response.send_message(embed=embed, view=self.bot_self.AllView("catch", self.bot_self))
             except Exception as e:
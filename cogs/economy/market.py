@@ -11,14 +11,17 @@ from bot_utils import (
     convert_number,
     handle_logs,
     open_json,
-    save_json
+    save_json,
+    json_transaction
 )
 
 from .utils import (
     check_user_stat,
     get_item_name,
     display_item_name,
-    get_item_suggestions
+    get_item_suggestions,
+    change_balance,
+    change_item
 )
 
 async def auto_suggest_items(interaction: discord.Interaction, string: str):
@@ -69,12 +72,8 @@ class ListingButton(discord.ui.Button):
                 del market_data["listings"][self.listing_id]
                 save_json("storage/economy/market.json", market_data)
                 
-                user_data = open_json("storage/economy/economy.json")
                 seller = str(listing["seller"])
-                if listing["item"] not in user_data[seller]["inventory"]:
-                    user_data[seller]["inventory"][listing["item"]] = 0
-                user_data[seller]["inventory"][listing["item"]] += listing["amount"]
-                save_json("storage/economy/economy.json", user_data)
+                change_item(seller, listing["item"], listing["amount"], reason=f"market unlist {self.listing_id}")
                 
                 await interaction.response.send_message(f"Listing removed and {listing['amount']}x {display_item_name(listing['item'])} returned to your inventory.")
             else:
@@ -101,32 +100,35 @@ class ListingButton(discord.ui.Button):
             try:
                 amount = int(modal.interaction_value)
                 if 1 <= amount <= max_affordable:
-                    market_data = open_json("storage/economy/market.json")
-                    listing = market_data["listings"].get(self.listing_id)
-                    
-                    if not listing or listing["amount"] < amount:
-                        await interaction.followup.send("This listing is no longer available.", ephemeral=True)
+                    # Only the bookkeeping runs under the lock, the replies are sent after it is released
+                    error_message = None
+                    async with json_transaction("storage/economy/market.json", "storage/economy/economy.json") as (market_data, economy_data):
+                        listing = market_data["listings"].get(self.listing_id)
+                        
+                        if not listing or listing["amount"] < amount:
+                            error_message = "This listing is no longer available."
+                        else:
+                            item = listing["item"]
+                            total_cost = listing["price"] * amount
+                            seller = str(listing["seller"])
+
+                            if economy_data[buyer]["balance"]["purse"] < total_cost:
+                                error_message = "You can't afford this item."
+                            else:
+                                change_balance(buyer, -total_cost, reason=f"market buy {self.listing_id}")
+                                change_balance(seller, total_cost, reason=f"market sale {self.listing_id}")
+                                change_item(buyer, item, amount, reason=f"market buy {self.listing_id}")
+                                
+                                listing["amount"] -= amount
+                                if listing["amount"] <= 0:
+                                    del market_data["listings"][self.listing_id]
+
+                    if error_message:
+                        await interaction.followup.send(error_message, ephemeral=True)
                         return
                     
-                    total_cost = listing["price"] * amount
-                    seller = str(listing["seller"])
-                    
-                    economy_data[buyer]["balance"]["purse"] -= total_cost
-                    economy_data[seller]["balance"]["purse"] += total_cost
-                    
-                    if listing["item"] not in economy_data[buyer]["inventory"]:
-                        economy_data[buyer]["inventory"][listing["item"]] = 0
-                    economy_data[buyer]["inventory"][listing["item"]] += amount
-                    
-                    listing["amount"] -= amount
-                    if listing["amount"] <= 0:
-                        del market_data["listings"][self.listing_id]
-                    
-                    save_json("storage/economy/market.json", market_data)
-                    save_json("storage/economy/economy.json", economy_data)
-                    
                     await interaction.followup.send(
-                        f"Successfully bought {amount}x {display_item_name(listing['item'])} "
+                        f"Successfully bought {amount}x {display_item_name(item)} "
                         f"for {total_cost:,} coins."
                     )
                 else:
@@ -265,15 +267,12 @@ class MarketCommandGroup(app_commands.Group):
             if amount > current_amount:
                 return await interaction.response.send_message("You don't have enough of this item.")
 
-            user_data = open_json("storage/economy/economy.json")
-            user_data[str(interaction.user.id)]["inventory"][item_name] -= amount
-            save_json("storage/economy/economy.json", user_data)
-
             market_data = open_json(self.market)
             if "listings" not in market_data:
                 market_data["listings"] = {}
                 
             unique_id = "".join(random.choices(ascii_letters + digits, k=6))
+            change_item(interaction.user.id, item_name, -amount, reason=f"market list {unique_id}")
             market_data["listings"][unique_id] = {
                 "seller": interaction.user.id,
                 "item": item_name,
@@ -358,46 +357,41 @@ class MarketCommandGroup(app_commands.Group):
     @app_commands.command(name="buy")
     async def buy(self, interaction: discord.Interaction, listing_id: str, amount: int):
         try:
-            market_data = open_json(self.market)
-            if "listings" not in market_data:
-                market_data["listings"] = {}
-            
-            listing = market_data["listings"].get(listing_id)
-            
-            if not listing:
-                return await interaction.response.send_message("Invalid listing ID.")
-            
-            if listing["seller"] == interaction.user.id:
-                return await interaction.response.send_message("You can't buy your own listing.")
-
-            if amount > listing["amount"]:
-                return await interaction.response.send_message(f"Only {listing['amount']} available.")
-
-            total_cost = listing["price"] * amount
-            
-            economy_data = open_json("storage/economy/economy.json")
-            buyer = str(interaction.user.id)
-            seller = str(listing["seller"])
-            
-            if economy_data[buyer]["balance"]["purse"] < total_cost:
-                return await interaction.response.send_message("You can't afford this.")
+            # Only the bookkeeping runs under the lock, the reply is sent after it is released
+            error_message = None
+            async with json_transaction(self.market, "storage/economy/economy.json") as (market_data, economy_data):
+                if "listings" not in market_data:
+                    market_data["listings"] = {}
+                
+                listing = market_data["listings"].get(listing_id)
+                buyer = str(interaction.user.id)
+                
+                if not listing:
+                    error_message = "Invalid listing ID."
+                elif listing["seller"] == interaction.user.id:
+                    error_message = "You can't buy your own listing."
+                elif amount > listing["amount"]:
+                    error_message = f"Only {listing['amount']} available."
+                elif economy_data[buyer]["balance"]["purse"] < listing["price"] * amount:
+                    error_message = "You can't afford this."
+                else:
+                    item = listing["item"]
+                    total_cost = listing["price"] * amount
+                    seller = str(listing["seller"])
 
-            economy_data[buyer]["balance"]["purse"] -= total_cost
-            economy_data[seller]["balance"]["purse"] += total_cost
+                    change_balance(buyer, -total_cost, reason=f"market buy {listing_id}")
+                    change_balance(seller, total_cost, reason=f"market sale {listing_id}")
+                    change_item(buyer, item, amount, reason=f"market buy {listing_id}")
+                    
+                    listing["amount"] -= amount
+                    if listing["amount"] <= 0:
+                        del market_data["listings"][listing_id]
 
-            if listing["item"] not in economy_data[buyer]["inventory"]:
-                economy_data[buyer]["inventory"][listing["item"]] = 0
-            economy_data[buyer]["inventory"][listing["item"]] += amount
-            
-            listing["amount"] -= amount
-            if listing["amount"] <= 0:
-                del market_data["listings"][listing_id]
-            
-            save_json("storage/economy/economy.json", economy_data)
-            save_json(self.market, market_data)
+            if error_message:
+                return await interaction.response.send_message(error_message)
 
             await interaction.response.send_message(
-                f"Successfully bought {amount}x {display_item_name(listing['item'])} "
+                f"Successfully bought {amount}x {display_item_name(item)} "
                 f"for {total_cost} coins from <@{seller}>."
             )
 
@@ -450,13 +444,8 @@ class MarketCommandGroup(app_commands.Group):
             del market_data["listings"][listing_id]
             save_json(self.market, market_data)
             
-            user_data = open_json("storage/economy/economy.json")
             seller = str(interaction.user.id)
-            
-            if listing["item"] not in user_data[seller]["inventory"]:
-                user_data[seller]["inventory"][listing["item"]] = 0
-            user_data[seller]["inventory"][listing["item"]] += listing["amount"]
-            save_json("storage/economy/economy.json", user_data)
+            change_item(seller, listing["item"], listing["amount"], reason=f"market unlist {listing_id}")
             
             await interaction.response.send_message(
                 f"Removed listing and returned {listing['amount']}x "
@@ -1,5 +1,6 @@
-import time
+import os, time, sqlite3, threading, asyncio
 import discord
+from collections.abc import MutableMapping
 from discord import app_commands
 from typing import (
     TypedDict,
@@ -10,11 +11,20 @@ from typing import (
     TypeAlias,
     Literal,
     Tuple,
+    Iterable,
+    Iterator,
+    Set,
 )
 
 from bot_utils import (
     open_json,
     save_json,
+    json_cache,
+    dumps_json,
+    loads_json,
+    write_json_atomic,
+    cooldown_manager,
+    TransactionView,
 )
 
 class LevelsData(TypedDict):
@@ -75,6 +85,911 @@ PlayerId: TypeAlias = str
 EconomyData: TypeAlias = Dict[PlayerId, PlayerData]
 
 eco_path: str = "storage/economy/economy.json"
+eco_db_path: str = "storage/economy/economy.db"
+eco_ledger_dir: str = "storage/economy/ledger"
+
+_TABLE = "__table__"
+_BALANCE_COLUMNS = {"purse": "purse", "bank": "bank", "maxBank": "max_bank", "fish_tokens": "fish_tokens"}
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and abs(value) < 2 ** 63
+
+class AccountRecord(MutableMapping):
+    """
+    Base class for slotted, dict-compatible economy account records.
+
+    Known fields live in `__slots__` instead of a per-instance dict, and any other
+    key goes to a small overflow dict, so a record round-trips every player file
+    losslessly. A field listed in `_defaults` is only created when it is first
+    read as an attribute (`player.balance.purse`), so untouched defaults cost
+    nothing and are not written back. A default may be a value, or a callable
+    (such as `dict` or a record class) for mutable values. Item access
+    (`record["key"]`, `record.get("key", default)`) behaves like a dict: a missing
+    field raises KeyError or returns the caller's default, and nothing is filled in.
+
+    Records support the same `record["key"]` access as the dicts they replace, and
+    `to_dict` is picked up by `save_json`, so they can be stored in the economy
+    document directly.
+
+    ## Methods:
+        from_dict(data: Dict[str, Any]):
+        Builds a record (and its nested records) from a parsed JSON dict.
+
+        to_dict():
+        Returns the record as plain nested dicts, without unread defaults.
+    """
+    __slots__ = ("_extra", "_set")
+    _defaults: Dict[str, Any] = {}
+    _nested: Dict[str, type] = {}
+    _bits: Dict[str, int] = {}
+    _setters: Dict[str, Tuple[int, Any]] = {}
+    _getters: Tuple[Tuple[str, int, Any], ...] = ()
+    _record_types: set = set()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # `_set` is a bitmask of the filled slots, so checking for a field never
+        # has to raise and catch AttributeError
+        cls._bits = {name: 1 << i for i, name in enumerate(cls.__slots__)}
+        cls._getters = tuple((name, cls._bits[name], cls.__dict__[name].__get__) for name in cls.__slots__)
+        cls._setters = {name: (cls._bits[name], cls.__dict__[name].__set__) for name in cls.__slots__}
+        # Exact type checks, as isinstance against an ABC is slow on the to_dict hot path
+        AccountRecord._record_types.add(cls)
+
+    def __init__(self, **values: Any):
+        self._extra = None
+        self._set = 0
+        for key, value in values.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AccountRecord":
+        record = cls.__new__(cls)
+        extra = None
+        filled = 0
+        setters, nested = cls._setters, cls._nested
+        for key, value in data.items():
+            slot = setters.get(key)
+            if slot is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+            if key in nested and type(value) is dict:
+                value = nested[key].from_dict(value)
+            slot[1](record, value)
+            filled |= slot[0]
+        object.__setattr__(record, "_extra", extra)
+        object.__setattr__(record, "_set", filled)
+        return record
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Copy and pickle through to_dict so unread defaults stay unread
+        return (type(self).from_dict, (self.to_dict(),))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        bit = self._bits.get(name)
+        if bit is not None:
+            object.__setattr__(self, "_set", self._set | bit)
+
+    def __delattr__(self, name: str) -> None:
+        object.__delattr__(self, name)
+        bit = self._bits.get(name)
+        if bit is not None:
+            object.__setattr__(self, "_set", self._set & ~bit)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for empty slots (and unknown names)
+        if name not in self._defaults:
+            raise AttributeError(f"{type(self).__name__!r} has no field {name!r}")
+        default = self._defaults[name]
+        value = default() if callable(default) else default
+        setattr(self, name, value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        bit = self._bits.get(key)
+        if bit is not None:
+            if not self._set & bit:
+                raise KeyError(key)
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._bits:
+            nested = self._nested.get(key)
+            if nested is not None and type(value) is dict:
+                value = nested.from_dict(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._bits:
+            if not self._set & self._bits[key]:
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        bit = self._bits.get(key)
+        if bit is not None:
+            return bool(self._set & bit)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        filled = self._set
+        for name, bit, _ in self._getters:
+            if filled & bit:
+                yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return bin(self._set).count("1") + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        filled = self._set
+        record_types = self._record_types
+        for name, bit, get in self._getters:
+            if filled & bit:
+                value = get(self)
+                data[name] = value.to_dict() if type(value) in record_types else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+class LevelsRecord(AccountRecord):
+    __slots__ = ("EXP", "retire", "prestige", "rebirth")
+    _defaults = {"EXP": 0, "retire": 0, "prestige": 0, "rebirth": 0}
+
+class BalanceRecord(AccountRecord):
+    __slots__ = ("purse", "bank", "maxBank", "fish_tokens")
+    _defaults = {"purse": 0, "bank": 5000, "maxBank": 25000, "fish_tokens": 0}
+
+class GearRecord(AccountRecord):
+    __slots__ = ("helmet", "chestplate", "leggings", "boots", "rune", "ring", "weapon")
+    _defaults = dict.fromkeys(__slots__)
+
+class BoostsRecord(AccountRecord):
+    __slots__ = ("coins", "exp")
+    _defaults = {"coins": 100, "exp": 100}
+
+class PointsRecord(AccountRecord):
+    __slots__ = ("health", "damage", "speed", "extra")
+    _defaults = dict.fromkeys(__slots__, 0)
+
+class StreakRecord(AccountRecord):
+    __slots__ = ("streak", "last_claimed")
+    _defaults = {"streak": 0, "last_claimed": "2000-01-01 00:00:00.000000+00:00"}
+
+class StreaksRecord(AccountRecord):
+    __slots__ = ("daily", "weekly", "monthly")
+    _defaults = dict.fromkeys(__slots__, StreakRecord)
+    _nested = dict.fromkeys(__slots__, StreakRecord)
+
+class PlayerRecord(AccountRecord):
+    """
+    A slotted, dict-compatible PlayerData.
+
+    Example:
+        ```
+        player = PlayerRecord.from_dict(eco[user_id])
+        player.balance.purse += 100    # or player["balance"]["purse"] += 100
+        player.levels.EXP              # 0, created on first attribute read
+        player["levels"].get("EXP", 1) # 1 if EXP was never set, nothing is filled in
+        eco[user_id] = player          # saved through to_dict
+        ```
+    """
+    __slots__ = (
+        "playerID", "joinTimestamp", "levels", "balance", "inventory", "pets",
+        "gear", "boosts", "points", "cooldowns", "streaks",
+    )
+    _nested = {
+        "levels": LevelsRecord,
+        "balance": BalanceRecord,
+        "gear": GearRecord,
+        "boosts": BoostsRecord,
+        "points": PointsRecord,
+        "streaks": StreaksRecord,
+    }
+    _defaults = {**_nested, "inventory": dict, "pets": dict}
+
+class RecordJsonStore:
+    """
+    Serves economy.json with every player held as a `PlayerRecord`.
+
+    The file format is unchanged; only the in-memory representation differs.
+    `RecordJsonStore` is a `StorageBackend` for `eco_path`.
+    """
+    def __init__(self, path: str = eco_path):
+        self.path = path
+
+    def load(self) -> EconomyData:
+        with open(self.path, "rb") as f:
+            data = loads_json(f.read())
+        return {user_id: PlayerRecord.from_dict(player) for user_id, player in data.items()}
+
+    def save(self, data: EconomyData) -> int:
+        return write_json_atomic(self.path, data)
+
+class EconomyStore:
+    """
+    SQLite storage for economy PlayerData.
+
+    Balances, inventory rows and command/periodic cooldowns live in their own indexed
+    tables, so reading or writing one player touches only that player's rows. Any
+    section that does not fit those tables is kept as JSON in `players.data`, which
+    makes the round trip lossless. Value columns are declared without a type so
+    SQLite keeps ints and floats exactly as given.
+
+    `EconomyStore` is a `StorageBackend`: register it for `eco_path` and `open_json`
+    returns an `EconomyDocument` that loads players on demand.
+
+    ## Methods:
+        load_player(user_id: PlayerId):
+        Returns one player's data, or None if they have no account.
+
+        save_players(players: Dict[PlayerId, PlayerData], deleted: Iterable[PlayerId] = ()):
+        Writes (and deletes) players in a single transaction.
+
+        replace_all(data: EconomyData):
+        Replaces every stored player with the contents of an economy.json document.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            user_id TEXT PRIMARY KEY,
+            player_id INTEGER,
+            join_timestamp INTEGER,
+            data TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE INDEX IF NOT EXISTS players_player_id ON players (player_id);
+
+        CREATE TABLE IF NOT EXISTS balances (
+            user_id TEXT PRIMARY KEY REFERENCES players (user_id) ON DELETE CASCADE,
+            purse, bank, max_bank, fish_tokens
+        );
+
+        CREATE TABLE IF NOT EXISTS inventory (
+            user_id TEXT NOT NULL REFERENCES players (user_id) ON DELETE CASCADE,
+            item TEXT NOT NULL,
+            amount,
+            PRIMARY KEY (user_id, item)
+        );
+        CREATE INDEX IF NOT EXISTS inventory_item ON inventory (item);
+
+        CREATE TABLE IF NOT EXISTS cooldowns (
+            user_id TEXT NOT NULL REFERENCES players (user_id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            uses,
+            cooldown,
+            PRIMARY KEY (user_id, kind, name)
+        );
+    """
+
+    def __init__(self, path: str = eco_db_path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self._lock = threading.RLock()
+
+    def _split(self, user_id: PlayerId, player: Dict[str, Any]) -> Tuple[tuple, Optional[tuple], List[tuple], List[tuple]]:
+        data: Dict[str, Any] = {}
+        player_id = join_timestamp = None
+        balance_row = None
+        inventory_rows: List[tuple] = []
+        cooldown_rows: List[tuple] = []
+
+        for key, value in player.items():
+            if key == "playerID" and _is_number(value):
+                player_id, data[key] = value, _TABLE
+            elif key == "joinTimestamp" and _is_number(value):
+                join_timestamp, data[key] = value, _TABLE
+            elif key == "balance" and isinstance(value, dict) and all(
+                k in _BALANCE_COLUMNS and _is_number(v) for k, v in value.items()
+            ):
+                balance_row = (user_id, *(value.get(k) for k in _BALANCE_COLUMNS))
+                data[key] = _TABLE
+            elif key == "inventory" and isinstance(value, dict) and all(_is_number(v) for v in value.values()):
+                inventory_rows = [(user_id, item, amount) for item, amount in value.items()]
+                data[key] = _TABLE
+            elif key == "commands" and isinstance(value, dict) and all(
+                isinstance(v, dict) and set(v) <= {"uses", "cooldown"} and all(_is_number(n) for n in v.values())
+                for v in value.values()
+            ):
+                cooldown_rows += [(user_id, "command", name, v.get("uses"), v.get("cooldown")) for name, v in value.items()]
+                data[key] = _TABLE
+            elif key == "cooldowns" and isinstance(value, dict) and all(
+                isinstance(v, str) or _is_number(v) for v in value.values()
+            ):
+                cooldown_rows += [(user_id, "periodic", name, None, v) for name, v in value.items()]
+                data[key] = _TABLE
+            else:
+                data[key] = value
+
+        player_row = (user_id, player_id, join_timestamp, dumps_json(data).decode("utf-8"))
+        return player_row, balance_row, inventory_rows, cooldown_rows
+
+    def exists(self, user_id: PlayerId) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM players WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def iter_ids(self, reverse: bool = False) -> Iterator[PlayerId]:
+        with self._lock:
+            rows = self.conn.execute(f"SELECT user_id FROM players ORDER BY rowid {'DESC' if reverse else 'ASC'}").fetchall()
+        return (row[0] for row in rows)
+
+    def load_player(self, user_id: PlayerId) -> Optional[PlayerData]:
+        """
+        Returns one player's data, or None if they have no account.
+
+        Parameters:
+            user_id (PlayerId): The player's Discord ID
+
+        Returns:
+            Optional[PlayerData]: The player's data in the same shape as economy.json
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT player_id, join_timestamp, data FROM players WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            player_id, join_timestamp, raw = row
+            data = loads_json(raw)
+            player: Dict[str, Any] = {}
+            for key, value in data.items():
+                if value != _TABLE:
+                    player[key] = value
+                elif key == "playerID":
+                    player[key] = player_id
+                elif key == "joinTimestamp":
+                    player[key] = join_timestamp
+                elif key == "balance":
+                    balance = self.conn.execute(
+                        "SELECT purse, bank, max_bank, fish_tokens FROM balances WHERE user_id = ?", (user_id,)
+                    ).fetchone() or ()
+                    player[key] = {k: v for k, v in zip(_BALANCE_COLUMNS, balance) if v is not None}
+                elif key == "inventory":
+                    player[key] = dict(self.conn.execute(
+                        "SELECT item, amount FROM inventory WHERE user_id = ? ORDER BY rowid", (user_id,)
+                    ))
+                elif key in ("commands", "cooldowns"):
+                    kind = "command" if key == "commands" else "periodic"
+                    rows = self.conn.execute(
+                        "SELECT name, uses, cooldown FROM cooldowns WHERE user_id = ? AND kind = ? ORDER BY rowid", (user_id, kind)
+                    )
+                    if kind == "command":
+                        player[key] = {
+                            name: {k: v for k, v in (("uses", uses), ("cooldown", cooldown)) if v is not None}
+                            for name, uses, cooldown in rows
+                        }
+                    else:
+                        player[key] = {name: cooldown for name, _, cooldown in rows}
+            return player
+
+    def _write_player(self, user_id: PlayerId, player: Dict[str, Any]) -> None:
+        player_row, balance_row, inventory_rows, cooldown_rows = self._split(user_id, player)
+        self.conn.execute(
+            "INSERT INTO players (user_id, player_id, join_timestamp, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (user_id) DO UPDATE SET player_id = excluded.player_id, "
+            "join_timestamp = excluded.join_timestamp, data = excluded.data",
+            player_row,
+        )
+        self.conn.execute("DELETE FROM balances WHERE user_id = ?", (user_id,))
+        self.conn.execute("DELETE FROM inventory WHERE user_id = ?", (user_id,))
+        self.conn.execute("DELETE FROM cooldowns WHERE user_id = ?", (user_id,))
+        if balance_row:
+            self.conn.execute("INSERT INTO balances VALUES (?, ?, ?, ?, ?)", balance_row)
+        self.conn.executemany("INSERT INTO inventory VALUES (?, ?, ?)", inventory_rows)
+        self.conn.executemany("INSERT INTO cooldowns VALUES (?, ?, ?, ?, ?)", cooldown_rows)
+
+    def save_players(self, players: Dict[PlayerId, PlayerData], deleted: Iterable[PlayerId] = ()) -> int:
+        """
+        Writes (and deletes) players in a single transaction.
+
+        Parameters:
+            players (Dict[PlayerId, PlayerData]): Players to insert or overwrite
+            deleted (Iterable[PlayerId]): Players to remove
+
+        Returns:
+            int: The number of players written or deleted
+        """
+        deleted = list(deleted)
+        with self._lock, self.conn:
+            for user_id, player in players.items():
+                self._write_player(user_id, player)
+            self.conn.executemany("DELETE FROM players WHERE user_id = ?", [(user_id,) for user_id in deleted])
+        return len(players) + len(deleted)
+
+    def replace_all(self, data: EconomyData) -> int:
+        """
+        Replaces every stored player with the contents of an economy.json document.
+
+        Parameters:
+            data (EconomyData): The whole economy document
+
+        Returns:
+            int: The number of players written
+        """
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM players")
+            for user_id, player in data.items():
+                self._write_player(str(user_id), player)
+        return len(data)
+
+    def load(self) -> "EconomyDocument":
+        return EconomyDocument(self)
+
+    def save(self, data: EconomyData) -> int:
+        if isinstance(data, EconomyDocument) and data.store is self:
+            return data.flush()
+        return self.replace_all(data)
+
+class EconomyDocument(MutableMapping):
+    """
+    A dict-like view of an `EconomyStore` that loads players on first access.
+
+    Loaded players are kept in memory and shared, like any cached document. On
+    flush only players whose data changed since they were loaded are written.
+    """
+    def __init__(self, store: EconomyStore):
+        self.store = store
+        self._players: Dict[PlayerId, PlayerData] = {}
+        self._snapshots: Dict[PlayerId, bytes] = {}
+        self._deleted: set = set()
+
+    def __getitem__(self, user_id: PlayerId) -> PlayerData:
+        if user_id in self._players:
+            return self._players[user_id]
+        if user_id in self._deleted:
+            raise KeyError(user_id)
+
+        player = self.store.load_player(user_id)
+        if player is None:
+            raise KeyError(user_id)
+        self._players[user_id] = player
+        self._snapshots[user_id] = dumps_json(player)
+        return player
+
+    def __setitem__(self, user_id: PlayerId, player: PlayerData) -> None:
+        self._players[user_id] = player
+        self._deleted.discard(user_id)
+
+    def __delitem__(self, user_id: PlayerId) -> None:
+        if user_id not in self:
+            raise KeyError(user_id)
+        self._players.pop(user_id, None)
+        if self._snapshots.pop(user_id, None) is not None or self.store.exists(user_id):
+            self._deleted.add(user_id)
+
+    def __contains__(self, user_id: object) -> bool:
+        if user_id in self._players:
+            return True
+        if user_id in self._deleted:
+            return False
+        return self.store.exists(user_id)
+
+    def _new_ids(self) -> List[PlayerId]:
+        return [user_id for user_id in self._players if user_id not in self._snapshots and not self.store.exists(user_id)]
+
+    def __iter__(self) -> Iterator[PlayerId]:
+        for user_id in self.store.iter_ids():
+            if user_id not in self._deleted:
+                yield user_id
+        yield from self._new_ids()
+
+    def __reversed__(self) -> Iterator[PlayerId]:
+        yield from reversed(self._new_ids())
+        for user_id in self.store.iter_ids(reverse=True):
+            if user_id not in self._deleted:
+                yield user_id
+
+    def __len__(self) -> int:
+        return self.store.count() + len(self._new_ids()) - len(self._deleted)
+
+    def flush(self) -> int:
+        """
+        Writes players that changed since they were loaded or last flushed.
+
+        Returns:
+            int: The number of players written or deleted
+        """
+        changed: Dict[PlayerId, PlayerData] = {}
+        snapshots: Dict[PlayerId, bytes] = {}
+        for user_id, player in self._players.items():
+            snapshot = dumps_json(player)
+            if snapshot != self._snapshots.get(user_id):
+                changed[user_id] = player
+                snapshots[user_id] = snapshot
+
+        if not changed and not self._deleted:
+            return 0
+
+        written = self.store.save_players(changed, self._deleted)
+        self._snapshots.update(snapshots)
+        self._deleted.clear()
+        return written
+
+def migrate_economy_json(json_path: str = eco_path, db_path: str = eco_db_path) -> int:
+    """
+    Imports economy.json into the SQLite economy store, replacing what is stored there.
+
+    Flush `json_cache` first so the file on disk is current. Afterwards, set
+    `economy_backend=sqlite` in secrets.env and restart to serve the economy from SQLite.
+
+    Parameters:
+        json_path (str): Path of the economy JSON file
+        db_path (str): Path of the SQLite database to create or overwrite
+
+    Returns:
+        int: The number of players imported
+    """
+    with open(json_path, "rb") as f:
+        data = loads_json(f.read())
+    store = EconomyStore(db_path)
+    try:
+        return store.replace_all(data)
+    finally:
+        store.conn.close()
+
+class TrackedEconomy(dict):
+    """
+    The economy document served by `EconomyLedger`, noting which players were touched.
+
+    Players are changed in place, so every player read or written through `[]`,
+    `get`, `setdefault`, `pop` or `del` counts as possibly changed, and the ledger
+    only re-serialises those on save. `items()` and `values()` hand out every
+    player at once, so they mark the whole document.
+    """
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.touched: Set[PlayerId] = set()
+        self.all_touched = False
+
+    def take_touched(self) -> Optional[Set[PlayerId]]:
+        """Returns the touched player IDs (None for all of them) and starts a new set."""
+        touched = None if self.all_touched else self.touched
+        self.touched = set()
+        self.all_touched = False
+        return touched
+
+    def __getitem__(self, user_id: PlayerId) -> Any:
+        self.touched.add(user_id)
+        return super().__getitem__(user_id)
+
+    def __setitem__(self, user_id: PlayerId, player: Any) -> None:
+        self.touched.add(user_id)
+        super().__setitem__(user_id, player)
+
+    def __delitem__(self, user_id: PlayerId) -> None:
+        self.touched.add(user_id)
+        super().__delitem__(user_id)
+
+    def get(self, user_id: PlayerId, default: Any = None) -> Any:
+        self.touched.add(user_id)
+        return super().get(user_id, default)
+
+    def setdefault(self, user_id: PlayerId, default: Any = None) -> Any:
+        self.touched.add(user_id)
+        return super().setdefault(user_id, default)
+
+    def pop(self, user_id: PlayerId, *default: Any) -> Any:
+        self.touched.add(user_id)
+        return super().pop(user_id, *default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.all_touched = True
+        super().update(*args, **kwargs)
+
+    def clear(self) -> None:
+        self.all_touched = True
+        super().clear()
+
+    def items(self):
+        self.all_touched = True
+        return super().items()
+
+    def values(self):
+        self.all_touched = True
+        return super().values()
+
+class EconomyLedger:
+    """
+    Append-only journal storage for the economy, compacted into periodic snapshots.
+
+    Every change is appended to `journal.jsonl` as a sequenced entry: a `delta`
+    from `change_balance`/`change_item`, or a full `set` (or `delete`) for players
+    changed any other way. Loading reads the newest `snapshot-<seq>.json` and
+    replays the entries after it. The loaded document is a `TrackedEconomy`, so a
+    save only compares the players touched since the last one. `compact` writes a new snapshot and moves the
+    journal to `archive/`, where it stays as an audit trail.
+
+    `EconomyLedger` is a `StorageBackend` for `eco_path`.
+
+    ## Methods:
+        record_delta(user_id: PlayerId, section: str, key: str, delta: float, reason: str = ""):
+        Journals a balance or inventory change without rewriting the player.
+
+        compact():
+        Writes a snapshot of the journaled state and rotates the journal.
+
+        entries(since: int = 0):
+        Yields journal entries (including archived ones) after a sequence number.
+    """
+    def __init__(self, directory: str = eco_ledger_dir, legacy_path: Optional[str] = eco_path):
+        self.directory = directory
+        self.legacy_path = legacy_path
+        self.journal_path = os.path.join(directory, "journal.jsonl")
+        self.archive_dir = os.path.join(directory, "archive")
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._shadow: Dict[PlayerId, bytes] = {}
+        self._journal = None
+        self._lock = threading.RLock()
+
+    def _require_journal(self) -> None:
+        if self._journal is None:
+            raise RuntimeError("EconomyLedger is not loaded yet, open the economy with open_json first.")
+
+    def _snapshots(self) -> List[Tuple[int, str]]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            (int(name[9:-5]), os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+            if name.startswith("snapshot-") and name.endswith(".json")
+        )
+
+    def _journal_files(self, since: int) -> List[str]:
+        files = []
+        if os.path.isdir(self.archive_dir):
+            archived = sorted(
+                (int(name[8:-6]), os.path.join(self.archive_dir, name))
+                for name in os.listdir(self.archive_dir)
+                if name.startswith("journal-") and name.endswith(".jsonl")
+            )
+            files += [path for last_seq, path in archived if last_seq > since]
+        if os.path.exists(self.journal_path):
+            files.append(self.journal_path)
+        return files
+
+    def entries(self, since: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Yields journal entries (including archived ones) after a sequence number.
+
+        A torn final line from a crash mid-append is skipped.
+
+        Parameters:
+            since (int): Only yield entries with a higher sequence number
+
+        Yields:
+            Dict[str, Any]: The journal entries in sequence order
+        """
+        for path in self._journal_files(since):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = loads_json(line)
+                    except ValueError:
+                        continue
+                    if entry["seq"] > since:
+                        yield entry
+
+    @staticmethod
+    def _apply(eco: Dict[PlayerId, Any], entry: Dict[str, Any]) -> None:
+        op, user_id = entry["op"], entry["user"]
+        if op == "set":
+            eco[user_id] = entry["data"]
+        elif op == "delete":
+            eco.pop(user_id, None)
+        elif op == "delta":
+            section = eco.setdefault(user_id, {}).setdefault(entry["section"], {})
+            section[entry["key"]] = section.get(entry["key"], 0) + entry["delta"]
+
+    def load(self) -> EconomyData:
+        with self._lock:
+            snapshots = self._snapshots()
+            if snapshots:
+                self.snapshot_seq, path = snapshots[-1]
+                with open(path, "rb") as f:
+                    eco = loads_json(f.read())
+            elif self.legacy_path and os.path.exists(self.legacy_path):
+                with open(self.legacy_path, "rb") as f:
+                    eco = loads_json(f.read())
+            else:
+                eco = {}
+
+            self.seq = self.snapshot_seq
+            for entry in self.entries(self.snapshot_seq):
+                self._apply(eco, entry)
+                self.seq = entry["seq"]
+
+            self._shadow = {user_id: dumps_json(player) for user_id, player in eco.items()}
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self.journal_path, "ab")
+            return TrackedEconomy(eco)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self.seq += 1
+        entry = {"seq": self.seq, "ts": int(time.time()), **entry}
+        self._journal.write(dumps_json(entry) + b"\n")
+
+    def record_delta(self, user_id: PlayerId, section: str, key: str, delta: float, reason: str = "") -> None:
+        """
+        Journals a balance or inventory change without rewriting the player.
+
+        The caller applies the same change to the cached document. Changes made
+        inside a transaction are not passed here, since the journal cannot be
+        rolled back; they are journaled as a "set" when the transaction commits.
+
+        Parameters:
+            user_id (PlayerId): The player whose data changed
+            section (str): "balance" or "inventory"
+            key (str): The balance field or item name
+            delta (float): The amount added (negative to remove)
+            reason (str): Free text kept in the journal for auditing
+        """
+        with self._lock:
+            self._require_journal()
+            shadow = {user_id: loads_json(self._shadow[user_id])} if user_id in self._shadow else {}
+            entry = {"op": "delta", "user": user_id, "section": section, "key": key, "delta": delta, "reason": reason}
+            self._apply(shadow, entry)
+            self._shadow[user_id] = dumps_json(shadow[user_id])
+            self._append(entry)
+            self._journal.flush()
+
+    def save(self, data: EconomyData) -> int:
+        with self._lock:
+            self._require_journal()
+            # A document other than the loaded one (a replacement passed to save_json) is compared in full
+            touched = data.take_touched() if isinstance(data, TrackedEconomy) else None
+            if touched is None:
+                touched = set(data) | set(self._shadow)
+
+            written = 0
+            for user_id in touched:
+                player = dict.get(data, user_id, None)
+                if player is None:
+                    if user_id in self._shadow:
+                        self._append({"op": "delete", "user": user_id})
+                        del self._shadow[user_id]
+                        written += 1
+                    continue
+
+                snapshot = dumps_json(player)
+                if snapshot != self._shadow.get(user_id):
+                    self._append({"op": "set", "user": user_id, "data": player})
+                    self._shadow[user_id] = snapshot
+                    written += 1
+
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            return written
+
+    async def compact(self) -> int:
+        """
+        Writes a snapshot of the journaled state and rotates the journal.
+
+        Flush `json_cache` first so pending changes are journaled. The snapshot is
+        written on a worker thread.
+
+        Returns:
+            int: The sequence number the snapshot covers
+        """
+        with self._lock:
+            if self._journal is None or self.seq == self.snapshot_seq:
+                return self.snapshot_seq
+
+            seq = self.seq
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal.close()
+            os.makedirs(self.archive_dir, exist_ok=True)
+            archive_path = os.path.join(self.archive_dir, f"journal-{seq}.jsonl")
+            if os.path.exists(archive_path):
+                with open(self.journal_path, "rb") as src, open(archive_path, "ab") as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, archive_path)
+            self._journal = open(self.journal_path, "ab")
+            shadow = dict(self._shadow)
+
+        def write_snapshot() -> None:
+            payload = b"{" + b",".join(dumps_json(user_id) + b":" + player for user_id, player in shadow.items()) + b"}"
+            path = os.path.join(self.directory, f"snapshot-{seq}.json")
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            for old_seq, old_path in self._snapshots()[:-2]:
+                os.remove(old_path)
+
+        await asyncio.to_thread(write_snapshot)
+        self.snapshot_seq = seq
+        return seq
+
+def _change(user_id: PlayerId, section: str, key: str, delta: float, reason: str) -> None:
+    user_id = str(user_id)
+    eco = open_json(eco_path)
+    if user_id not in eco:
+        create_account(user_id)
+
+    values = eco[user_id].setdefault(section, {})
+    values[key] = values.get(key, 0) + delta
+
+    ledger = json_cache.backend_for(eco_path)
+    # Inside json_transaction the change can still be rolled back, so it is not journaled
+    # now; the touched-player diff in `EconomyLedger.save` records it once the transaction commits
+    if isinstance(ledger, EconomyLedger) and not isinstance(eco, TransactionView):
+        ledger.record_delta(user_id, section, key, delta, reason)
+    save_json(eco_path, eco)
+
+def change_balance(user_id: PlayerId, delta: float, field: str = "purse", reason: str = "") -> None:
+    """
+    Adds to (or with a negative delta, takes from) one of a player's balances.
+
+    With the ledger backend this is journaled as a delta instead of a full rewrite
+    (inside json_transaction, as part of the commit instead).
+
+    Parameters:
+        user_id (PlayerId): The player's Discord ID
+        delta (float): The amount to add
+        field (str): The balance field, e.g. "purse" or "bank"
+        reason (str): Free text kept in the ledger for auditing
+
+    Example:
+        ```
+        change_balance(buyer, -total_cost, reason=f"market buy {listing_id}")
+        ```
+    """
+    _change(user_id, "balance", field, delta, reason)
+
+def change_item(user_id: PlayerId, item: str, delta: int, reason: str = "") -> None:
+    """
+    Adds to (or with a negative delta, takes from) a player's inventory.
+
+    With the ledger backend this is journaled as a delta instead of a full rewrite
+    (inside json_transaction, as part of the commit instead).
+
+    Parameters:
+        user_id (PlayerId): The player's Discord ID
+        item (str): The item name
+        delta (int): The amount to add
+        reason (str): Free text kept in the ledger for auditing
+    """
+    _change(user_id, "inventory", item, delta, reason)
+
+if os.getenv("economy_backend") == "sqlite":
+    json_cache.register_backend(eco_path, EconomyStore(eco_db_path))
+elif os.getenv("economy_backend") == "ledger":
+    json_cache.register_backend(eco_path, EconomyLedger(eco_ledger_dir))
+elif os.getenv("economy_backend") == "records":
+    json_cache.register_backend(eco_path, RecordJsonStore(eco_path))
 
 def display_item_name(item_name: str) -> str:
     """Convert item name to display format."""
@@ -117,7 +1032,7 @@ def create_account(id: PlayerId) -> None:
     players: EconomyData = open_json(eco_path)
 
     try:
-        lastPlayerData = next(reversed(players.values()))
+        lastPlayerData = players[next(reversed(players))]
         playerID = lastPlayerData["playerID"] + 1
     except (StopIteration, KeyError):
         playerID = 1
@@ -238,23 +1153,18 @@ async def process_transaction(
     return True, f"{transaction_type.capitalize()} of {amount} Coins has been processed."
 
 def command_cooldown(cooldown: int, command_name: str, user_id: str) -> tuple[bool, int]:
-    current_time = int(time.time())
-    eco = open_json("storage/economy/economy.json")
-    
-    if str(user_id) not in eco:
-        eco[str(user_id)] = {}
-    if "commands" not in eco[str(user_id)]:
-        eco[str(user_id)]["commands"] = {}
-    if command_name not in eco[str(user_id)]["commands"]:
-        eco[str(user_id)]["commands"][command_name] = {"uses": 0, "cooldown": 0}
-    
-    last_used = eco[str(user_id)]["commands"][command_name]["cooldown"]
-    
-    if current_time - last_used < cooldown:
-        return False, last_used + cooldown
-    
-    eco[str(user_id)]["commands"][command_name]["uses"] += 1
-    eco[str(user_id)]["commands"][command_name]["cooldown"] = current_time
-    save_json("storage/economy/economy.json", eco)
-    
+    """
+    Starts an economy command's cooldown if it has passed, see `CooldownManager`.
+
+    Parameters:
+        cooldown (int): The command's cooldown in seconds
+        command_name (str): The command name
+        user_id (str): The user running the command
+
+    Returns:
+        tuple[bool, int]: Whether the command may run and, if not, the Unix time its cooldown ends
+    """
+    allowed, remaining = cooldown_manager.try_use(str(user_id), command_name, cooldown)
+    if not allowed:
+        return False, int(time.time()) + remaining
     return True, 0
\ No newline at end of file
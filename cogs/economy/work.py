@@ -342,8 +342,6 @@ class WorkCommandGroup(app_commands.Group):
             check_user_stat(["work", "last_shift"], user_id, 0)
             check_user_stat(["work", "promotions"], user_id, 0)
             check_user_stat(["balance", "purse"], user_id, 0)
-            check_user_stat(["commands"], user_id, {})
-            check_user_stat(["commands", "work"], user_id, {"cooldown": 0, "uses": 0})
             check_user_stat(["inventory"], user_id, {})
             
             eco = open_json(self.eco_path)
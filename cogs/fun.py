@@ -1,4 +1,5 @@
 from bot_utils import (
+    http_session,
     get_member_color,
     open_json,
     handle_logs,
@@ -11,7 +12,6 @@ from discord.ui import Button, View
 
 import random
 from datetime import datetime, timezone
-from aiohttp import ClientSession
 
 class TriviaView(View):
     def __init__(self, correct_answer: str, question: str):
@@ -77,7 +77,7 @@ class QuestionView(View):
             question_type = random.choice(["truth", "dare", "wyr", "nhie", "paranoia"])
         
         url = f"https://api.truthordarebot.xyz/v1/{question_type.lower()}?rating={self.rating}"
-        async with ClientSession() as session:
+        async with http_session() as session:
             async with session.get(url) as response:
                 if response.status == 200:
                     return await response.json()
@@ -153,7 +153,7 @@ class FunCommandGroup(app_commands.Group):
     async def trivia(self, interaction: discord.Interaction):
         await interaction.response.defer()
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://opentdb.com/api.php?amount=1") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -213,7 +213,7 @@ class FunCommandGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             url = f"https://api.truthordarebot.xyz/v1/truth?rating={rating}"
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -239,7 +239,7 @@ class FunCommandGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             url = f"https://api.truthordarebot.xyz/v1/dare?rating={rating}"
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -267,7 +267,7 @@ class FunCommandGroup(app_commands.Group):
             endpoint = "truth" if random.random() < 0.5 else "dare"
             url = f"https://api.truthordarebot.xyz/v1/{endpoint}?rating={rating}"
             
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -294,7 +294,7 @@ class FunCommandGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             url = f"https://api.truthordarebot.xyz/v1/wyr?rating={rating}"
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -320,7 +320,7 @@ class FunCommandGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             url = f"https://api.truthordarebot.xyz/v1/nhie?rating={rating}"
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -346,7 +346,7 @@ class FunCommandGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             url = f"https://api.truthordarebot.xyz/v1/paranoia?rating={rating}"
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -507,7 +507,7 @@ class FunCog(commands.Cog):
     async def fact(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://uselessfacts.jsph.pl/random.json?language=en") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -530,7 +530,7 @@ class FunCog(commands.Cog):
     async def joke(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://official-joke-api.appspot.com/jokes/random") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -556,7 +556,7 @@ class FunCog(commands.Cog):
     async def cat(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://api.thecatapi.com/v1/images/search") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -579,7 +579,7 @@ class FunCog(commands.Cog):
     async def dog(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://dog.ceo/api/breeds/image/random") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -602,7 +602,7 @@ class FunCog(commands.Cog):
     async def duck(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://random-d.uk/api/random") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -627,7 +627,7 @@ class FunCog(commands.Cog):
     async def quote(self, interaction: discord.Interaction, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://zenquotes.io/api/random") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -652,7 +652,7 @@ class FunCog(commands.Cog):
                   allow_spoilers: bool = False, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 max_retries = 5
                 for _ in range(max_retries):
                     async with session.get("https://meme-api.com/gimme") as response:
@@ -726,7 +726,7 @@ class FunCog(commands.Cog):
     async def xkcd(self, interaction: discord.Interaction, comic_id: int = None, ephemeral: bool = False):
         await interaction.response.defer(ephemeral=ephemeral)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get("https://xkcd.com/info.0.json") as latest_response:
                     if latest_response.status != 200:
                         return await interaction.followup.send("An error occurred while fetching the latest xkcd comic.")
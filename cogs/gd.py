@@ -1,4 +1,5 @@
 from bot_utils import (
+    http_session,
     handle_logs,
 )
 
@@ -6,7 +7,6 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
-from aiohttp import ClientSession
 
 @app_commands.allowed_installs(guilds=True, users=True)
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
@@ -19,7 +19,7 @@ class GeometryDashCommandGroup(app_commands.Group):
     async def profile(self, interaction: discord.Interaction, username: str):
         await interaction.response.defer()
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(f"https://gdbrowser.com/api/profile/{username}") as response:
                     if response.status == 200:
                         data = await response.json()
@@ -1,6 +1,7 @@
 from bot_utils import (
     mc_fetchUUID,
-    hypixelAPI,
+    hy_fetchPlayerData,
+    hy_fetchSkyblockProfiles,
     handle_logs,
 )
 
@@ -10,7 +11,6 @@ from discord.ui import View, Button
 from discord import app_commands, ButtonStyle
 
 import re
-from aiohttp import ClientSession
 from datetime import datetime, timezone
 
 class HypixelView(View):
@@ -336,16 +336,14 @@ class HypixelCommandsGroup(app_commands.Group):
             await interaction.response.defer()
         try:
             uuid = await mc_fetchUUID(interaction, username)
-            async with ClientSession() as session:
-                async with session.get(f"https://api.hypixel.net/player?key={hypixelAPI}&uuid={uuid}") as response:
-                    if response.status == 200:
-                        message = await interaction.followup.send("Fetching profile...")
-                        data = await response.json()
-                        view = HypixelView(data, message)
-                        embed = view.create_main_embed()
-                        await message.edit(embed=embed, view=view, content=None)
-                    else:
-                        await interaction.followup.send(f"Failed to retrieve data. Status code: {response.status}")
+            status, data = await hy_fetchPlayerData(uuid)
+            if status == 200:
+                message = await interaction.followup.send("Fetching profile...")
+                view = HypixelView(data, message)
+                embed = view.create_main_embed()
+                await message.edit(embed=embed, view=view, content=None)
+            else:
+                await interaction.followup.send(f"Failed to retrieve data. Status code: {status}")
         except Exception as e:
             await handle_logs(interaction, e)
 
@@ -895,24 +893,22 @@ class SkyblockCommandsGroup(app_commands.Group):
         await interaction.response.defer()
         try:
             uuid = await mc_fetchUUID(interaction, username)
-            async with ClientSession() as session:
-                async with session.get(f"https://api.hypixel.net/v2/skyblock/profiles?key={hypixelAPI}&uuid={uuid}") as response:
-                    if response.status == 200:
-                        message = await interaction.followup.send("Fetching profiles...")
-                        data = await response.json()
-
-                        if profile_id is None:
-                            profiles = data.get("profiles", [])
-                            selected_profile_index = next(
-                                (i for i, profile in enumerate(profiles) if profile.get("selected")), 0
-                            )
-                            profile_id = selected_profile_index
-
-                        view = SkyblockView(data, message, uuid, profile_id)
-                        embed = view.create_main_embed()
-                        await message.edit(content=None, view=view, embed=embed)
-                    else:
-                        await interaction.followup.send(f"Failed to retrieve data. Status code: {response.status}")
+            status, data = await hy_fetchSkyblockProfiles(uuid)
+            if status == 200:
+                message = await interaction.followup.send("Fetching profiles...")
+
+                if profile_id is None:
+                    profiles = data.get("profiles", [])
+                    selected_profile_index = next(
+                        (i for i, profile in enumerate(profiles) if profile.get("selected")), 0
+                    )
+                    profile_id = selected_profile_index
+
+                view = SkyblockView(data, message, uuid, profile_id)
+                embed = view.create_main_embed()
+                await message.edit(content=None, view=view, embed=embed)
+            else:
+                await interaction.followup.send(f"Failed to retrieve data. Status code: {status}")
 
         except Exception as e:
             await handle_logs(interaction, e)
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 
 from bot_utils import (
+    http_session,
     handle_logs,
 )
 
@@ -11,7 +12,6 @@ import numpy as np
 import asyncio, tempfile, io, random
 from PIL import Image, ImageSequence, ImageOps, ImageFilter, ImageEnhance
 from moviepy.editor import VideoFileClip, AudioFileClip
-from aiohttp import ClientSession
 from urllib.parse import urlparse
 class ImageCog(commands.Cog):
     def __init__(self, bot):
@@ -27,7 +27,7 @@ class ImageCog(commands.Cog):
             return await ctx.send("Please provide an image attachment or a link to an image.")
                 
         if link is not None:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(link) as response:
                     if response.status != 200:
                         return await ctx.send("Failed to fetch the image from the provided URL.")
@@ -4,15 +4,17 @@ from discord.ui import View, Button
 from discord import app_commands
 
 from bot_utils import (
+	http_session,
 	get_dominant_color,
 	__version__,
 	__status__,
 	open_json,
 	handle_logs,
+	exp_tracker,
 )
 
 import time, asyncio, os, tempfile
-from aiohttp import ClientSession, ClientError
+from aiohttp import ClientError
 from datetime import datetime, timezone
 from moviepy.editor import VideoFileClip, AudioFileClip
 from PIL import Image
@@ -164,34 +166,17 @@ class InfoCog(commands.Cog):
 				
 			member_id = str(interaction.user.id)
 			server_id = str(interaction.guild.id)
-			server_info = open_json("storage/server_info.json")
-				
+			# Leaderboards are kept sorted by exp_tracker as EXP is awarded
+			ranks = await exp_tracker.ranks(server_id if where == "guild" else None)
+			user_exp = ranks.scores.get(member_id, 0)
+			rank = ranks.rank(member_id)
+			total_users = len(ranks)
+
 			if where == "guild": 
-				server_exp = server_info.get("exp", {}).get(server_id, {})
-				user_exp = server_exp.get(member_id, 0)
-				
-				exp_list = [(uid, exp) for uid, exp in server_exp.items()]
-				exp_list.sort(key=lambda x: x[1], reverse=True)
-				rank = next((i for i, (uid, _) in enumerate(exp_list, 1) if uid == member_id), 0)
-				total_users = len(exp_list)
-				
 				title = f"Server Level - {interaction.user.name}"
-				rank_text = f"Rank: #{rank}/{total_users}"
 			else:
-				global_exp_dict = {}
-				for server_data in server_info.get("exp", {}).values():
-					for uid, exp in server_data.items():
-						global_exp_dict[uid] = global_exp_dict.get(uid, 0) + exp
-				
-				user_exp = global_exp_dict.get(member_id, 0)
-				
-				exp_list = [(uid, exp) for uid, exp in global_exp_dict.items()]
-				exp_list.sort(key=lambda x: x[1], reverse=True)
-				rank = next((i for i, (uid, _) in enumerate(exp_list, 1) if uid == member_id), 0)
-				total_users = len(exp_list)
-				
 				title = f"Global Level - {interaction.user.name}"
-				rank_text = f"Rank: #{rank}/{total_users}"
+			rank_text = f"Rank: #{rank}/{total_users}"
 
 			info = calculate_level_info(user_exp)
 			
@@ -228,6 +213,34 @@ class InfoCog(commands.Cog):
 		except Exception as e:
 			await interaction.followup.send(f"An error occurred: {str(e)}", ephemeral=True)
 
+	@app_commands.command(name="leaderboard")
+	@app_commands.choices(
+		where=[app_commands.Choice(name="Local (Server)", value="guild"), app_commands.Choice(name="Global", value="global")]
+	)
+	async def leaderboard(self, interaction: discord.Interaction, where: str = "guild", page: int = 1):
+		await interaction.response.defer()
+		try:
+			server_id = str(interaction.guild.id)
+			ranks = await exp_tracker.ranks(server_id if where == "guild" else None)
+
+			per_page = 10
+			pages = max(1, -(-len(ranks) // per_page))
+			page = min(max(page, 1), pages)
+			entries = ranks.top(per_page, (page - 1) * per_page)
+
+			lines = [f"**#{ranks.rank(uid)}** <@{uid}> • {exp:,} XP" for uid, exp in entries]
+			embed = discord.Embed(
+				title="Server Leaderboard" if where == "guild" else "Global Leaderboard",
+				description="\n".join(lines) or "Nobody has any XP yet.",
+				color=discord.Color.blue()
+			)
+			embed.set_footer(text=f"Page {page}/{pages}")
+
+			await interaction.followup.send(embed=embed)
+
+		except Exception as e:
+			await interaction.followup.send(f"An error occurred: {str(e)}", ephemeral=True)
+
 	@app_commands.allowed_installs(guilds=True, users=True)
 	@app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 	@app_commands.command(name="ping")
@@ -415,7 +428,7 @@ class InfoCog(commands.Cog):
 		if not website.startswith(("http://", "https://")):
 			website = "http://" + website
 
-		async with ClientSession() as session:
+		async with http_session() as session:
 			try:
 				async with session.get(website, timeout=5) as response:
 					status_code = response.status
@@ -434,7 +447,7 @@ class InfoCog(commands.Cog):
 	async def define(self, interaction: discord.Interaction, word: str):
 		await interaction.response.defer(ephemeral=True)
 		try:
-			async with ClientSession() as session:
+			async with http_session() as session:
 				async with session.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}") as response:
 					if response.status != 200:
 						await interaction.followup.send("Could not find the definition.")
@@ -475,7 +488,7 @@ class InfoCog(commands.Cog):
 				audio_url = audio_urls[0].lstrip("//")
 				audio_file_name = f"{word}_pronunciation.mp3"
 
-				async with ClientSession() as session:
+				async with http_session() as session:
 					async with session.get(audio_url) as audio_response:
 						if audio_response.status == 200:
 							with open(audio_file_name, 'wb') as f:
@@ -575,7 +588,7 @@ class InfoCog(commands.Cog):
 	async def pokemon(self, interaction: discord.Interaction, pokemon: str):
 		await interaction.response.defer()
 		try:
-			async with ClientSession() as session:
+			async with http_session() as session:
 				async with session.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon.lower()}") as response:
 					if response.status != 200:
 						await interaction.followup.send(f"Pokemon '{pokemon}' not found.", ephemeral=True)
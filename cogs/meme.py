@@ -1,4 +1,5 @@
 from bot_utils import (
+    http_session,
     handle_logs,
 )
 
@@ -8,7 +9,6 @@ from discord import app_commands
 
 import io, os
 
-from aiohttp import ClientSession
 from petpetgif import petpet 
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
@@ -22,7 +22,7 @@ class MemeCog(commands.Cog):
     async def spongebob(self, interaction: discord.Interaction, text: str):
         await interaction.response.defer(ephemeral=True)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(f"https://memeado.vercel.app/api/spongebob?text={text}") as response:
                     if response.status == 200:
                         meme_url = str(response.url)
@@ -36,7 +36,7 @@ class MemeCog(commands.Cog):
     async def likehate(self, interaction: discord.Interaction, text1: str, text2: str):
         await interaction.response.defer(ephemeral=True)
         try:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 url = f"https://memeado.vercel.app/api/drakelikehate?text1={text1}&text2={text2}"
                 async with session.get(url) as response:
                     if response.status == 200:
@@ -55,7 +55,7 @@ class MemeCog(commands.Cog):
                 image_data = await attachment.read()
 
             elif url:
-                async with ClientSession() as session:
+                async with http_session() as session:
                     async with session.get(url) as response:
                         if response.status != 200:
                             await interaction.followup.send("Failed to retrieve the image from the URL.")
@@ -82,7 +82,7 @@ class MemeCog(commands.Cog):
         try:
             text1 = quote(text1, "~")
             text2 = quote(text2, "~")
-            async with ClientSession() as session:
+            async with http_session() as session:
                 url = f"https://api.memegen.link/images/ds/{text1}/{text2}.png"
                 async with session.get(url) as response:
                     if response.status == 200:
@@ -104,7 +104,7 @@ class MemeCog(commands.Cog):
                 image_data = await attachment.read()
                 image = "attachment"
             elif image:
-                async with ClientSession() as session:
+                async with http_session() as session:
                     async with session.get(image) as response:
                         if response.status != 200:
                             await interaction.followup.send("Failed to retrieve the image from the URL.")
@@ -118,7 +118,7 @@ class MemeCog(commands.Cog):
             if image:
                 meme_url += f"?background={quote(image, safe='')}"
 
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(meme_url) as response:
                     if response.status == 200:
                         meme_image_url = str(response.url)
@@ -145,7 +145,7 @@ class MemeCog(commands.Cog):
             base_url = "https://api.memegen.link/images/custom"
             meme_url = f"{base_url}/_/{text}.png?background={quote(image_url, safe='')}"
 
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(meme_url) as response:
                     if response.status == 200:
                         meme_image_url = str(response.url)
@@ -164,7 +164,7 @@ class MemeCog(commands.Cog):
                 image_data = await attachment.read()
                 image = Image.open(io.BytesIO(image_data))
             elif link:
-                async with ClientSession() as session:
+                async with http_session() as session:
                     async with session.get(link) as response:
                         if response.status != 200:
                             await interaction.followup.send("Failed to retrieve the image from the URL.")
@@ -31,12 +31,12 @@ class GiveawayButtonView(discord.ui.View):
     async def enter_leave_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
             server_info = open_json("storage/server_info.json")
-            server_info.setdefault(self.server_id, {}).setdefault("giveaways", {})
+            giveaways = server_info.get("giveaways", {}).get(self.server_id, {})
 
-            if self.giveaway_id not in server_info[self.server_id]["giveaways"]:
+            if self.giveaway_id not in giveaways:
                 raise KeyError(f"Giveaway ID {self.giveaway_id} not found in server {self.server_id}.")
 
-            giveaway = server_info[self.server_id]["giveaways"][self.giveaway_id]
+            giveaway = giveaways[self.giveaway_id]
             participants = giveaway["participants"]
 
             required_role_id = giveaway.get("requirement")
@@ -85,7 +85,7 @@ class GiveawayButtonView(discord.ui.View):
 async def end_giveaway(interaction: discord.Interaction, giveaway_id: str, server_id: str):
     try:
         server_info = open_json("storage/server_info.json")
-        giveaway = server_info.get(server_id, {}).get("giveaways", {}).get(giveaway_id)
+        giveaway = server_info.get("giveaways", {}).get(server_id, {}).get(giveaway_id)
 
         if not giveaway:
             await interaction.followup.send("The specified giveaway could not be found.", ephemeral=True)
@@ -95,7 +95,7 @@ async def end_giveaway(interaction: discord.Interaction, giveaway_id: str, serve
         await asyncio.sleep(duration)
 
         server_info = open_json("storage/server_info.json")
-        giveaway = server_info.get(server_id, {}).get("giveaways", {}).get(giveaway_id)
+        giveaway = server_info.get("giveaways", {}).get(server_id, {}).get(giveaway_id)
 
         if not giveaway:
             return
@@ -151,10 +151,10 @@ class GiveawayGroup(app_commands.Group):
             server_id = str(interaction.guild_id)
             server_info = open_json("storage/server_info.json")
             
-            if server_id not in server_info or "giveaways" not in server_info[server_id]:
+            giveaways = server_info.get("giveaways", {}).get(server_id)
+            if not giveaways:
                 return await interaction.followup.send("No giveaways found for this server.", ephemeral=True)
 
-            giveaways = server_info[server_id]["giveaways"]
             if id not in giveaways:
                 return await interaction.followup.send(f"Giveaway with ID `{id}` not found.", ephemeral=True)
 
@@ -199,13 +199,9 @@ class GiveawayGroup(app_commands.Group):
             giveaway_id = str(int(time.time()))
 
             server_id = str(interaction.guild.id)
-            if server_id not in server_info:
-                server_info[server_id] = {}
+            giveaways = server_info.setdefault("giveaways", {}).setdefault(server_id, {})
 
-            if "giveaways" not in server_info[server_id]:
-                server_info[server_id]["giveaways"] = {}
-
-            server_info[server_id]["giveaways"][giveaway_id] = {
+            giveaways[giveaway_id] = {
                 "host": interaction.user.id,
                 "prize": prize,
                 "startTime": start_time,
@@ -229,8 +225,8 @@ class GiveawayGroup(app_commands.Group):
             view = GiveawayButtonView(giveaway_id, server_id)
 
             message = await interaction.followup.send(embed=embed, view=view)
-            server_info[server_id]["giveaways"][giveaway_id]["channel_id"] = interaction.channel_id
-            server_info[server_id]["giveaways"][giveaway_id]["message_id"] = message.id
+            giveaways[giveaway_id]["channel_id"] = interaction.channel_id
+            giveaways[giveaway_id]["message_id"] = message.id
             save_json("storage/server_info.json", server_info)
 
             asyncio.create_task(end_giveaway(interaction, giveaway_id, server_id))
@@ -386,6 +382,30 @@ class MiscCog(commands.Cog):
             asyncio.create_task(self.send_alert_message(interaction))
         return True
 
+def migrate_giveaways() -> int:
+    """
+    Moves giveaways saved under server_info[guild_id]["giveaways"] into the "giveaways" section.
+
+    Returns:
+        int: The number of guilds whose giveaways were moved
+    """
+    server_info = open_json("storage/server_info.json")
+    moved = 0
+    for key in list(server_info):
+        value = server_info[key]
+        if not key.isdigit() or not isinstance(value, dict) or "giveaways" not in value:
+            continue
+
+        server_info.setdefault("giveaways", {}).setdefault(key, {}).update(value.pop("giveaways"))
+        if not value:
+            del server_info[key]
+        moved += 1
+
+    if moved:
+        save_json("storage/server_info.json", server_info)
+    return moved
+
 async def setup(bot):
+    migrate_giveaways()
     await bot.add_cog(MiscCog(bot))
     bot.tree.interaction_check = bot.get_cog("MiscCog").interaction_check   
\ No newline at end of file
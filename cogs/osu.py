@@ -2,9 +2,7 @@ from bot_utils import (
     get_dominant_color,
     handle_logs,
 
-    OsuAPI,
-    osuAPI,
-    osuSecret
+    osu_api
 )
 
 import discord
@@ -23,7 +21,6 @@ class OsuCommandGroup(app_commands.Group):
     async def profile(self, interaction: discord.Interaction, username: str):
         await interaction.response.defer()
         try:
-            osu_api = OsuAPI(osuAPI, osuSecret)
             try:
                 user = await osu_api.user(username, key=UserLookupKey.USERNAME)
             except ValueError:
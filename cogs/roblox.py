@@ -1,6 +1,16 @@
 from bot_utils import (
+    http_session,
+    api_request,
+    BACKGROUND,
     rbx_fetchUserID,
     rbx_fetchUserBio,
+    rbx_fetchUserInfo,
+    rbx_fetchCount,
+    rbx_fetchPresence,
+    rbx_fetchBadgeAwards,
+    rbx_friend_graph,
+    RateLimitedError,
+    CircuitOpenError,
 
     check_user,
     open_json,
@@ -16,7 +26,6 @@ from discord import app_commands, ButtonStyle
 
 from main import botAdmins
 import random, asyncio, aiohttp
-from collections import deque
 from datetime import datetime
 from typing import List
 import time
@@ -98,166 +107,141 @@ class CGlovesGroup(app_commands.Group):
             badge_gloves = {name: data for name, data in gloves.items() if 'badges' in data}
             all_badge_ids = [badge_id for badge_ids in [glove['badges'] for glove in badge_gloves.values()] for badge_id in badge_ids]
 
-            def split_into_chunks(lst, chunk_size):
-                for i in range(0, len(lst), chunk_size):
-                    yield lst[i:i + chunk_size]
-
-            badge_chunks = list(split_into_chunks(all_badge_ids, 99))
-            all_badge_data = []
-
-            async with aiohttp.ClientSession() as session:
-                for chunk in badge_chunks:
-                    url = f"https://badges.roblox.com/v1/users/{roblox_id}/badges/awarded-dates?badgeIds={','.join(map(str, chunk))}"
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            all_badge_data.extend(data["data"])
-                        else:
-                            await interaction.followup.send("An error occurred while fetching the user's gloves.")
-                            return
+            awards = await rbx_fetchBadgeAwards(roblox_id, all_badge_ids)
+            if awards is None:
+                await interaction.followup.send("An error occurred while fetching the user's gloves.")
+                return
 
-                if not all_badge_data:
-                    await interaction.followup.send(f"No badges found for the user: {username if username else interaction.user.name}")
-                    return
+            if all(date is None for date in awards.values()):
+                await interaction.followup.send(f"No badges found for the user: {username if username else interaction.user.name}")
+                return
 
-                owned = [
-                    glove
-                    for glove, glove_data in badge_gloves.items()
-                    if 'badges' in glove_data and all(
-                        any(badge.get("badgeId") == badge_id for badge in all_badge_data)
-                        for badge_id in glove_data['badges']
-                    )
-                ]
-                not_owned = [glove for glove in badge_gloves.keys() if glove not in owned]
+            owned = [
+                glove
+                for glove, glove_data in badge_gloves.items()
+                if all(awards.get(badge_id) is not None for badge_id in glove_data['badges'])
+            ]
+            not_owned = [glove for glove in badge_gloves.keys() if glove not in owned]
 
-                total_gloves = len(badge_gloves)
-                owned_gloves = len(owned)
-                glove_percentage = (owned_gloves / total_gloves) * 100
-                glove_percentage_str = f"{glove_percentage:.1f}"
+            total_gloves = len(badge_gloves)
+            owned_gloves = len(owned)
+            glove_percentage = (owned_gloves / total_gloves) * 100
+            glove_percentage_str = f"{glove_percentage:.1f}"
+
+            glove_embed = discord.Embed(
+                title=f"SB Gloves Data for {username if username else interaction.user.name} ({roblox_id}):",
+                description=f"Badge gloves:\n{owned_gloves}/{total_gloves} badge gloves owned ({glove_percentage_str}%)",
+                color=0xDA8EE7,
+            )
+            glove_embed.add_field(
+                name="OWNED", 
+                value=", ".join(owned) if owned else "None", 
+                inline=False
+            )
+            glove_embed.add_field(
+                name="NOT OWNED",
+                value=", ".join(not_owned) if not_owned else "None",
+                inline=False,
+            )
 
-                glove_embed = discord.Embed(
-                    title=f"SB Gloves Data for {username if username else interaction.user.name} ({roblox_id}):",
-                    description=f"Badge gloves:\n{owned_gloves}/{total_gloves} badge gloves owned ({glove_percentage_str}%)",
+            obtained_gloves = {
+                glove: awards[badge_id]
+                for glove, glove_data in badge_gloves.items()
+                for badge_id in glove_data['badges']
+                if awards.get(badge_id) is not None
+            }
+
+            additional_badges = {
+                "Welcome": 2124743766,
+                "You met the owner": 2124760252,
+                "you met snow": 2124760875,
+                "[REDACTED]": 2124760911,
+                "Divine Punishment": 2124760917,
+                "really?": 2124760923,
+                "barzil": 2124775097,
+                "The one": 2124807750,
+                "Ascend": 2124807752,
+                "1 0 0": 2124836270,
+                'The "Reverse" Incident': 2124912059,
+                "Clipped Wings": 2147535393,
+                "Apostle of Judgement": 4414399146292319,
+                "court evidence": 2124760907,
+                "duck": 2124760916,
+                "The Lone Orange": 2128220957,
+                "The Hunt Event": 1195935784919838,
+                "The Backrooms": 2124929812,
+                "pog": 2124760877,
+            }
+
+            additional_awards = await rbx_fetchBadgeAwards(roblox_id, list(additional_badges.values()))
+            if additional_awards is not None:
+                badge_embed = discord.Embed(
+                    title=f"Additional Badges for {username if username else interaction.user.name} ({roblox_id}):",
                     color=0xDA8EE7,
                 )
-                glove_embed.add_field(
-                    name="OWNED", 
-                    value=", ".join(owned) if owned else "None", 
-                    inline=False
-                )
-                glove_embed.add_field(
-                    name="NOT OWNED",
-                    value=", ".join(not_owned) if not_owned else "None",
-                    inline=False,
-                )
 
-                obtained_gloves = {
-                    glove: badge["awardedDate"]
-                    for glove, glove_data in badge_gloves.items()
-                    if 'badges' in glove_data
-                    for badge_id in glove_data['badges']
-                    for badge in all_badge_data
-                    if badge.get("badgeId") == badge_id
-                }
+                obtained_badges = {badge_id: date for badge_id, date in additional_awards.items() if date is not None}
+
+                for badge_name, badge_id in additional_badges.items():
+                    if badge_id in obtained_badges:
+                        awarded_date = obtained_badges[badge_id]
+                        date, time, fraction = awarded_date.replace("Z", "+0000").partition(".")
+                        fraction = fraction[: fraction.index("+")][:6] + "+0000"
+                        awarded_date = f"{date}.{fraction}"
+                        awarded_date = datetime.strptime(awarded_date, "%Y-%m-%dT%H:%M:%S.%f%z")
+                        epoch_time = int(awarded_date.timestamp())
+                        badge_embed.add_field(
+                            name=f"<:check:1292269189536682004> | {badge_name}",
+                            value=f"Obtained on <t:{epoch_time}:F>",
+                            inline=False,
+                        )
+                    else:
+                        badge_embed.add_field(
+                            name=f"❌ | {badge_name}",
+                            value="Not obtained",
+                            inline=False,
+                        )
 
-                additional_badges = {
-                    "Welcome": 2124743766,
-                    "You met the owner": 2124760252,
-                    "you met snow": 2124760875,
-                    "[REDACTED]": 2124760911,
-                    "Divine Punishment": 2124760917,
-                    "really?": 2124760923,
-                    "barzil": 2124775097,
-                    "The one": 2124807750,
-                    "Ascend": 2124807752,
-                    "1 0 0": 2124836270,
-                    'The "Reverse" Incident': 2124912059,
-                    "Clipped Wings": 2147535393,
-                    "Apostle of Judgement": 4414399146292319,
-                    "court evidence": 2124760907,
-                    "duck": 2124760916,
-                    "The Lone Orange": 2128220957,
-                    "The Hunt Event": 1195935784919838,
-                    "The Backrooms": 2124929812,
-                    "pog": 2124760877,
+                gamepass_items = {
+                    "2x Slaps": 15037108,
+                    "5x Slaps": 15037147,
+                    "Radio": 16067226,
+                    "nothing": 16127797,
+                    "OVERKILL": 16361133,
+                    "Spectator": 19150776,
+                    "Custom death audio": 21651535,
+                    "CUSTOM GLOVE": 33742082,
+                    "Animation Pack": 37665008,
+                    "Vampire": 45176930,
+                    "Ultra Instinct": 85895851,
+                    "Cannoneer": 174818129,
                 }
 
-                badge_ids = ",".join(map(str, additional_badges.values()))
-                url = f"https://badges.roblox.com/v1/users/{roblox_id}/badges/awarded-dates?badgeIds={badge_ids}"
-
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-
-                        badge_embed = discord.Embed(
-                            title=f"Additional Badges for {username if username else interaction.user.name} ({roblox_id}):",
-                            color=0xDA8EE7,
-                        )
+                async def is_owned(item_id):
+                    url = f"https://inventory.roblox.com/v1/users/{roblox_id}/items/1/{item_id}/is-owned"
+                    async with api_request("roblox", "GET", url) as item_response:
+                        if item_response.status == 200:
+                            return bool(await item_response.json())
+                        return None
 
-                        obtained_badges = {badge["badgeId"]: badge["awardedDate"] for badge in data["data"]}
-
-                        for badge_name, badge_id in additional_badges.items():
-                            if badge_id in obtained_badges:
-                                awarded_date = obtained_badges[badge_id]
-                                date, time, fraction = awarded_date.replace("Z", "+0000").partition(".")
-                                fraction = fraction[: fraction.index("+")][:6] + "+0000"
-                                awarded_date = f"{date}.{fraction}"
-                                awarded_date = datetime.strptime(awarded_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-                                epoch_time = int(awarded_date.timestamp())
-                                badge_embed.add_field(
-                                    name=f"<:check:1292269189536682004> | {badge_name}",
-                                    value=f"Obtained on <t:{epoch_time}:F>",
-                                    inline=False,
-                                )
-                            else:
-                                badge_embed.add_field(
-                                    name=f"❌ | {badge_name}",
-                                    value="Not obtained",
-                                    inline=False,
-                                )
-
-                        gamepass_items = {
-                            "2x Slaps": 15037108,
-                            "5x Slaps": 15037147,
-                            "Radio": 16067226,
-                            "nothing": 16127797,
-                            "OVERKILL": 16361133,
-                            "Spectator": 19150776,
-                            "Custom death audio": 21651535,
-                            "CUSTOM GLOVE": 33742082,
-                            "Animation Pack": 37665008,
-                            "Vampire": 45176930,
-                            "Ultra Instinct": 85895851,
-                            "Cannoneer": 174818129,
-                        }
-
-                        owned_gamepasses = []
-                        not_owned_gamepasses = []
-
-                        for item_name, item_id in gamepass_items.items():
-                            url = f"https://inventory.roblox.com/v1/users/{roblox_id}/items/1/{item_id}/is-owned"
-                            async with session.get(url) as item_response:
-                                if item_response.status == 200:
-                                    item_data = await item_response.json()
-                                    if item_data:
-                                        owned_gamepasses.append(item_name)
-                                    else:
-                                        not_owned_gamepasses.append(item_name)
-
-                        view = GloveView(
-                            badge_embed,
-                            glove_embed,
-                            full_glove_data=obtained_gloves,
-                            obtained_gloves=obtained_gloves,
-                            roblox_id=roblox_id,
-                            owned_gamepasses=owned_gamepasses,
-                            not_owned_gamepasses=not_owned_gamepasses,
-                        )
+                ownership = await asyncio.gather(*(is_owned(item_id) for item_id in gamepass_items.values()))
+                owned_gamepasses = [name for name, owned in zip(gamepass_items, ownership) if owned is True]
+                not_owned_gamepasses = [name for name, owned in zip(gamepass_items, ownership) if owned is False]
+
+                view = GloveView(
+                    badge_embed,
+                    glove_embed,
+                    full_glove_data=obtained_gloves,
+                    obtained_gloves=obtained_gloves,
+                    roblox_id=roblox_id,
+                    owned_gamepasses=owned_gamepasses,
+                    not_owned_gamepasses=not_owned_gamepasses,
+                )
 
-                        await interaction.followup.send(embeds=[glove_embed], view=view)
+                await interaction.followup.send(embeds=[glove_embed], view=view)
 
-                    else:
-                        await interaction.followup.send("An error occurred while fetching the user's badges.")
+            else:
+                await interaction.followup.send("An error occurred while fetching the user's badges.")
 
         except Exception as error:
             await handle_logs(interaction, error)
@@ -303,34 +287,15 @@ class CGlovesGroup(app_commands.Group):
             badge_gloves = {name: data for name, data in gloves.items() if 'badges' in data}
             all_badge_ids = [badge_id for badge_ids in [glove['badges'] for glove in badge_gloves.values()] for badge_id in badge_ids]
 
-            def split_into_chunks(lst, chunk_size):
-                for i in range(0, len(lst), chunk_size):
-                    yield lst[i:i + chunk_size]
-
-            badge_chunks = list(split_into_chunks(all_badge_ids, 99))
-
             async def get_user_data(roblox_id):
-                all_badge_data = []
-                async with aiohttp.ClientSession() as session:
-                    for chunk in badge_chunks:
-                        url = f"https://badges.roblox.com/v1/users/{roblox_id}/badges/awarded-dates?badgeIds={','.join(map(str, chunk))}"
-                        async with session.get(url) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                all_badge_data.extend(data["data"])
-
-                owned = [
+                awards = await rbx_fetchBadgeAwards(roblox_id, all_badge_ids) or {}
+                return [
                     glove
                     for glove, glove_data in badge_gloves.items()
-                    if 'badges' in glove_data and all(
-                        any(badge.get("badgeId") == badge_id for badge in all_badge_data)
-                        for badge_id in glove_data['badges']
-                    )
+                    if all(awards.get(badge_id) is not None for badge_id in glove_data['badges'])
                 ]
-                return owned
 
-            owned1 = await get_user_data(roblox_id1)
-            owned2 = await get_user_data(roblox_id2)
+            owned1, owned2 = await asyncio.gather(get_user_data(roblox_id1), get_user_data(roblox_id2))
 
             compare_embed = discord.Embed(
                 title=f"Glove Comparison",
@@ -402,28 +367,27 @@ class CGlovesGroup(app_commands.Group):
             glove_data = gloves[glove]
             
             if 'badges' in glove_data:
-                async with aiohttp.ClientSession() as session:
-                    badge_id = glove_data['badges'][0]
-                    async with session.get(f"https://badges.roblox.com/v1/badges/{badge_id}") as response:
-                        if response.status == 200:
-                            badge_info = await response.json()
-                            embed = discord.Embed(
-                                title=badge_info.get("name", glove),
-                                description=badge_info.get("description", "No description available"),
-                                color=0xDA8EE7
-                            )
+                badge_id = glove_data['badges'][0]
+                async with api_request("roblox", "GET", f"https://badges.roblox.com/v1/badges/{badge_id}") as response:
+                    if response.status == 200:
+                        badge_info = await response.json()
+                        embed = discord.Embed(
+                            title=badge_info.get("name", glove),
+                            description=badge_info.get("description", "No description available"),
+                            color=0xDA8EE7
+                        )
                             
-                            if "iconImageId" in badge_info:
-                                async with session.get(f"https://thumbnails.roblox.com/v1/assets?assetIds={badge_info['iconImageId']}&returnPolicy=PlaceHolder&size=512x512&format=Png&isCircular=false") as thumb_response:
-                                    if thumb_response.status == 200:
-                                        thumb_data = await thumb_response.json()
-                                        if thumb_data.get("data") and thumb_data["data"][0].get("imageUrl"):
-                                            embed.set_thumbnail(url=thumb_data["data"][0]["imageUrl"])
-                        else:
-                            embed = discord.Embed(
-                                title=glove_data.get("name", glove),
-                                color=0xDA8EE7
-                            )
+                        if "iconImageId" in badge_info:
+                            async with api_request("roblox", "GET", f"https://thumbnails.roblox.com/v1/assets?assetIds={badge_info['iconImageId']}&returnPolicy=PlaceHolder&size=512x512&format=Png&isCircular=false") as thumb_response:
+                                if thumb_response.status == 200:
+                                    thumb_data = await thumb_response.json()
+                                    if thumb_data.get("data") and thumb_data["data"][0].get("imageUrl"):
+                                        embed.set_thumbnail(url=thumb_data["data"][0]["imageUrl"])
+                    else:
+                        embed = discord.Embed(
+                            title=glove_data.get("name", glove),
+                            color=0xDA8EE7
+                        )
             else:
                 embed = discord.Embed(
                     title=glove_data.get("name", glove),
@@ -558,17 +522,16 @@ class CGlovesGroup(app_commands.Group):
                     
                     if "image" in self.glove_data:
                         if 'badges' in self.glove_data:
-                            async with aiohttp.ClientSession() as session:
-                                badge_id = self.glove_data['badges'][0]
-                                async with session.get(f"https://badges.roblox.com/v1/badges/{badge_id}") as response:
-                                    if response.status == 200:
-                                        badge_info = await response.json()
-                                        if "iconImageId" in badge_info:
-                                            async with session.get(f"https://thumbnails.roblox.com/v1/assets?assetIds={badge_info['iconImageId']}&returnPolicy=PlaceHolder&size=512x512&format=Png&isCircular=false") as thumb_response:
-                                                if thumb_response.status == 200:
-                                                    thumb_data = await thumb_response.json()
-                                                    if thumb_data.get("data") and thumb_data["data"][0].get("imageUrl"):
-                                                        details_embed.set_thumbnail(url=thumb_data["data"][0]["imageUrl"])
+                            badge_id = self.glove_data['badges'][0]
+                            async with api_request("roblox", "GET", f"https://badges.roblox.com/v1/badges/{badge_id}") as response:
+                                if response.status == 200:
+                                    badge_info = await response.json()
+                                    if "iconImageId" in badge_info:
+                                        async with api_request("roblox", "GET", f"https://thumbnails.roblox.com/v1/assets?assetIds={badge_info['iconImageId']}&returnPolicy=PlaceHolder&size=512x512&format=Png&isCircular=false") as thumb_response:
+                                            if thumb_response.status == 200:
+                                                thumb_data = await thumb_response.json()
+                                                if thumb_data.get("data") and thumb_data["data"][0].get("imageUrl"):
+                                                    details_embed.set_thumbnail(url=thumb_data["data"][0]["imageUrl"])
                         else:
                             details_embed.set_thumbnail(url=self.glove_data["image"])
                     
@@ -585,25 +548,24 @@ class CGlovesGroup(app_commands.Group):
             await handle_logs(interaction, error)
 
     async def check_badge_status(self, roblox_id: int, badge_ids: list) -> str:
-        url = f"https://badges.roblox.com/v1/users/{roblox_id}/badges/awarded-dates?badgeIds={','.join(map(str, badge_ids))}"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if not data["data"]:
-                        return "Not obtained"
-    
-                    awarded_date = data["data"][0]["awardedDate"]
-                    date = datetime.strptime(awarded_date.split('.')[0], "%Y-%m-%dT%H:%M:%S")
-                    epoch_time = int(date.timestamp())
-                    return f"Obtained on <t:{epoch_time}:F>"
-                
-                return "Failed to check badge status"
+        awards = await rbx_fetchBadgeAwards(roblox_id, badge_ids)
+        if awards is None:
+            return "Failed to check badge status"
+
+        awarded = [date for date in awards.values() if date is not None]
+        if not awarded:
+            return "Not obtained"
+
+        date = datetime.strptime(awarded[0].split('.')[0], "%Y-%m-%dT%H:%M:%S")
+        epoch_time = int(date.timestamp())
+        return f"Obtained on <t:{epoch_time}:F>"
 
 async def get_friends(session: aiohttp.ClientSession, user_id: int) -> dict:
     url = f"https://friends.roblox.com/v1/users/{user_id}/friends"
-    async with session.get(url) as response:
+    async with api_request("roblox", "GET", url) as response:
+        # A server error is not an empty friends list
+        if response.status >= 500:
+            response.raise_for_status()
         data = await response.json()
         if response.status == 200:
             return {int(friend['id']): friend['name'] for friend in data.get('data', [])}
@@ -614,6 +576,14 @@ async def get_friends(session: aiohttp.ClientSession, user_id: int) -> dict:
 @app_commands.allowed_installs(guilds=True, users=True)
 @app_commands.allowed_contexts(guilds=True, dms=True, private_channels=True)
 class RobloxGroup(app_commands.Group):
+    # /roblox friendswith search limits: hops, users visited, seconds, friend lists fetched at once,
+    # and fetch tasks created per round
+    bfs_max_depth = 6
+    bfs_max_nodes = 20000
+    bfs_timeout = 120
+    bfs_concurrency = 8
+    bfs_round_size = 64
+
     def __init__(self):
         super().__init__(name="roblox", description="Roblox account-related commands", guild_only=False)
 
@@ -634,12 +604,12 @@ class RobloxGroup(app_commands.Group):
 
             await asyncio.sleep(60)
 
-            roblox_user_id = await rbx_fetchUserID(username)
+            roblox_user_id = await rbx_fetchUserID(username, priority=BACKGROUND)
             if roblox_user_id is None:
                 await interaction.followup.send(f"Failed to retrieve Roblox ID for {username}.")
                 return
 
-            bio = await rbx_fetchUserBio(roblox_user_id)
+            bio = await rbx_fetchUserBio(roblox_user_id, priority=BACKGROUND)
 
             if color_sequence in bio:
                 member_info = open_json("storage/member_info.json")
@@ -705,79 +675,58 @@ class RobloxGroup(app_commands.Group):
 
                 roblox_user_id = member_info[discord_user_id]["roblox_id"]
 
-            async with aiohttp.ClientSession() as session:
-                async def fetch_count(roblox_user_id: int, type: str):
-                    async with session.get(f"https://friends.roblox.com/v1/users/{roblox_user_id}/{type}/count") as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            return data.get("count", 0)
-
-                async def fetch_user_presence(roblox_user_id: int):
-                    async with session.post("https://presence.roblox.com/v1/presence/users", json={"userIds": [roblox_user_id]}) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if data.get("userPresences") and len(data["userPresences"]) > 0:
-                                return data["userPresences"][0]
-                        return None
-
-                async def fetch_user_info(roblox_user_id: int):
-                    async with session.get(f"https://users.roblox.com/v1/users/{roblox_user_id}") as response:
-                        if response.status == 200:
-                            return await response.json()
-                        return None
-
-                    '''                
-                    async def check_premium(user_id: int):
-                    url = f"https://www.roblox.com/users/{user_id}/profile"
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-                    }
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, headers=headers) as response:
-                            if response.status == 200:
-                                print(await response.text())
-                                return bool('icon-premium' in await response.text())
-                            return False
-                    '''
-                    
-                is_premium = False # await check_premium(roblox_user_id)
-                friends_count = await fetch_count(roblox_user_id, "friends")
-                followers_count = await fetch_count(roblox_user_id, "followers")
-                following_count = await fetch_count(roblox_user_id, "followings")
-                presence_data = await fetch_user_presence(roblox_user_id)
-                user_info = await fetch_user_info(roblox_user_id)
-
-                if not user_info:
-                    return await interaction.followup.send("Failed to fetch user information.")
-
-                embed = discord.Embed(title=f"{'<:Premium:1298832636805910589> ' if is_premium else ''}Roblox Account Info", color=0x808080)
-                display_name = user_info.get("displayName", "N/A")
-                username = user_info.get("name", "N/A")
-                embed.add_field(name="Username", value=f"{display_name} (@{username})", inline=False)
-                embed.add_field(name="Friends/Followers/Following", value=f"Friends: {friends_count}\nFollowers: {followers_count}\nFollowing: {following_count}", inline=False)
-
-                if presence_data:
-                    status = "Offline"
-                    if presence_data.get("userPresenceType") == 1:
-                        status = "Online"
-                    elif presence_data.get("userPresenceType") > 1:
-                        status = "Ingame"
-
-                    embed.add_field(name="Status", value=f"{status}", inline=False)
-                else:
-                    embed.add_field(name="Status", value="Status unavailable", inline=False)
+            '''                
+            async def check_premium(user_id: int):
+            url = f"https://www.roblox.com/users/{user_id}/profile"
+            headers = {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+            }
+            async with http_session() as session:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 200:
+                        print(await response.text())
+                        return bool('icon-premium' in await response.text())
+                    return False
+            '''
+
+            is_premium = False # await check_premium(roblox_user_id)
+            friends_count = await rbx_fetchCount(roblox_user_id, "friends")
+            followers_count = await rbx_fetchCount(roblox_user_id, "followers")
+            following_count = await rbx_fetchCount(roblox_user_id, "followings")
+            presence_data = await rbx_fetchPresence(roblox_user_id)
+            user_info = await rbx_fetchUserInfo(roblox_user_id)
+
+            if not user_info:
+                return await interaction.followup.send("Failed to fetch user information.")
+
+            embed = discord.Embed(title=f"{'<:Premium:1298832636805910589> ' if is_premium else ''}Roblox Account Info", color=0x808080)
+            display_name = user_info.get("displayName", "N/A")
+            username = user_info.get("name", "N/A")
+            embed.add_field(name="Username", value=f"{display_name} (@{username})", inline=False)
+            embed.add_field(name="Friends/Followers/Following", value=f"Friends: {friends_count}\nFollowers: {followers_count}\nFollowing: {following_count}", inline=False)
+
+            if presence_data:
+                status = "Offline"
+                if presence_data.get("userPresenceType") == 1:
+                    status = "Online"
+                elif presence_data.get("userPresenceType") > 1:
+                    status = "Ingame"
+
+                embed.add_field(name="Status", value=f"{status}", inline=False)
+            else:
+                embed.add_field(name="Status", value="Status unavailable", inline=False)
 
-                if "created" in user_info:
-                    try:
-                        creation_date = datetime.strptime(user_info["created"][:-1], "%Y-%m-%dT%H:%M:%S.%f")
-                        creation_date_str = creation_date.strftime("%m-%d-%Y")
-                        embed.set_footer(text=f"Account created: {creation_date_str} | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
-                    except (ValueError, TypeError):
-                        embed.set_footer(text=f"Account creation date unknown | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
-                else:
-                    embed.set_footer(text=f"Account creation date unavailable | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
+            if "created" in user_info:
+                try:
+                    creation_date = datetime.strptime(user_info["created"][:-1], "%Y-%m-%dT%H:%M:%S.%f")
+                    creation_date_str = creation_date.strftime("%m-%d-%Y")
+                    embed.set_footer(text=f"Account created: {creation_date_str} | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
+                except (ValueError, TypeError):
+                    embed.set_footer(text=f"Account creation date unknown | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
+            else:
+                embed.set_footer(text=f"Account creation date unavailable | Requested by {interaction.user}", icon_url=interaction.user.avatar.url)
 
-                await interaction.followup.send(embed=embed)
+            await interaction.followup.send(embed=embed)
         except Exception as error:
             await handle_logs(interaction, error)
 
@@ -801,10 +750,10 @@ class RobloxGroup(app_commands.Group):
 
                 roblox_user_id = member_info[discord_user_id]["roblox_id"]
 
-            async with aiohttp.ClientSession() as session:
+            async with http_session() as session:
                 async def get_avatar_items(session, roblox_user_id: int):
                     url = f"https://avatar.roblox.com/v1/users/{roblox_user_id}/currently-wearing"
-                    async with session.get(url) as response:
+                    async with api_request("roblox", "GET", url) as response:
                         if response.status == 200:
                             data = await response.json()
                             if not data['assetIds']:  
@@ -815,7 +764,7 @@ class RobloxGroup(app_commands.Group):
 
                 async def get_avatar_thumbnail(session, roblox_user_id: int):
                     url = f"https://thumbnails.roblox.com/v1/users/avatar?userIds={roblox_user_id}&size=720x720&format=Png&isCircular=false"
-                    async with session.get(url) as response:
+                    async with api_request("roblox", "GET", url) as response:
                         if response.status == 200:
                             data = await response.json()
                             if data and data['data'][0]['state'] == 'Completed':
@@ -861,7 +810,7 @@ class RobloxGroup(app_commands.Group):
 
         status_msg = await interaction.followup.send("⚠️ Starting search...", ephemeral=True)
         
-        async with aiohttp.ClientSession() as session:
+        async with http_session() as session:
             try:
                 id1, id2 = await asyncio.gather(
                     rbx_fetchUserID(username1), rbx_fetchUserID(username2)
@@ -878,9 +827,19 @@ class RobloxGroup(app_commands.Group):
                 return await interaction.followup.send("You cannot check closeness with the same user!")
 
             try:
-                friends1, friends2 = await asyncio.gather(
-                    get_friends(session, id1), get_friends(session, id2)
-                )
+                cached = await rbx_friend_graph.get_many([id1, id2])
+
+                async def lookup(user_id):
+                    if user_id in cached:
+                        return cached[user_id]
+                    return await get_friends(session, user_id)
+
+                friends1, friends2 = await asyncio.gather(lookup(id1), lookup(id2))
+                search_stats = {"hits": len(cached), "fetches": 2 - len(cached)}
+                await rbx_friend_graph.put_many({
+                    user_id: friends for user_id, friends in ((id1, friends1), (id2, friends2))
+                    if user_id not in cached and friends is not None
+                })
                 if friends1 is None or friends2 is None:
                     await status_msg.delete()
                     return await interaction.followup.send(f"Cannot access friend list for {username1 if friends1 is None else username2}. Their friends list may be private.")
@@ -890,85 +849,176 @@ class RobloxGroup(app_commands.Group):
 
             if id2 in friends1:
                 await status_msg.delete()
-                return await self.send_embed(interaction, [id1, id2], [username1, username2], 1, start_time)
+                return await self.send_embed(interaction, [id1, id2], [username1, username2], 1, start_time, search_stats=search_stats)
 
             await status_msg.edit(content="⚠️ Users aren't direct friends. Starting breadth-first search...")
-            path, total_checked = await self.bidirectional_bfs(session, id1, id2, friends1, friends2, status_msg)
+            try:
+                path, total_checked, names, stopped = await self.bidirectional_bfs(session, id1, id2, friends1, friends2, status_msg, search_stats)
+            except (RateLimitedError, CircuitOpenError) as e:
+                return await interaction.followup.send(f"Search stopped: {e}")
             
             if not path:
+                if stopped:
+                    return await interaction.followup.send(
+                        f"Search stopped after checking {total_checked} users ({stopped}) without finding a connection "
+                        f"between {username1} and {username2}. They may still be connected further out."
+                    )
                 return await interaction.followup.send(f"No connection found between {username1} and {username2} after checking {total_checked} users.")
             
-            await self.send_embed(interaction, path, [username1, username2], len(path) - 1, start_time, total_checked)
-
-    async def bidirectional_bfs(self, session, id1, id2, friends1, friends2, status_msg):
-        forward_queue, backward_queue = deque([(id1, None)]), deque([(id2, None)])
-        forward_visited, backward_visited = {id1: None}, {id2: None}
-        usernames, total_checked = {id1: "User1", id2: "User2"}, 0
-        last_update = time.time()
-        
-        while forward_queue and backward_queue:
-            total_checked += 1
-            current_time = time.time()
-            
-            if current_time - last_update >= 1:
-                forward_depth = len(forward_visited)
-                backward_depth = len(backward_visited)
-                total_visited = forward_depth + backward_depth
-                status = (
-                    f"⚠️ Searching...\n"
-                    f"Users checked: {total_checked}\n"
-                    f"Forward search depth: {forward_depth}\n"
-                    f"Backward search depth: {backward_depth}\n"
-                    f"Total visited users: {total_visited}"
-                )
-                await status_msg.edit(content=status)
-                last_update = current_time
-
-            if await self.process_queue(session, forward_queue, forward_visited, backward_visited, usernames):
-                return self.build_path(forward_visited, backward_visited), total_checked
-            
-            if await self.process_queue(session, backward_queue, backward_visited, forward_visited, usernames):
-                return self.build_path(forward_visited, backward_visited), total_checked
-        
-        return None, total_checked
-
-    async def process_queue(self, session, queue, visited, opposite_visited, usernames):
-        if queue:
-            current_id, parent = queue.popleft()
-            friends = await get_friends(session, current_id)
-            if friends is None:
-                return False
-
-            for friend_id, friend_name in friends.items():
-                if friend_id in opposite_visited:
-                    visited[friend_id] = current_id
-                    return True
-                if friend_id not in visited:
+            names.update({id1: username1, id2: username2})
+            await self.send_embed(interaction, path, [names.get(uid, str(uid)) for uid in path], len(path) - 1, start_time, total_checked, search_stats)
+
+    async def bidirectional_bfs(self, session, id1, id2, friends1, friends2, status_msg, search_stats=None):
+        # Each side starts with its friends list already known (depth 1); the smaller
+        # frontier is expanded one whole level at a time: friend lists in `rbx_friend_graph`
+        # first, then the rest fetched concurrently
+        if search_stats is None:
+            search_stats = {"hits": 0, "fetches": 0}
+        forward_visited = {id1: None, **{friend_id: id1 for friend_id in friends1}}
+        backward_visited = {id2: None, **{friend_id: id2 for friend_id in friends2}}
+        usernames = {**friends1, **friends2}
+        sides = {
+            "forward": {"visited": forward_visited, "frontier": list(friends1), "depth": 1},
+            "backward": {"visited": backward_visited, "frontier": list(friends2), "depth": 1},
+        }
+        total_checked = 2
+        started = last_update = time.time()
+        semaphore = asyncio.Semaphore(self.bfs_concurrency)
+        # Why the search gave up before the frontiers ran out, shown to the user
+        stopped = None
+
+        if set(friends1) & set(friends2):
+            return self.build_path(forward_visited, backward_visited), total_checked, usernames, None
+
+        async def fetch(user_id):
+            async with semaphore:
+                return user_id, await get_friends(session, user_id)
+
+        def over_budget():
+            return len(forward_visited) + len(backward_visited) >= self.bfs_max_nodes
+
+        while sides["forward"]["frontier"] and sides["backward"]["frontier"]:
+            hops = sides["forward"]["depth"] + sides["backward"]["depth"] + 1
+            if hops > self.bfs_max_depth:
+                stopped = f"reached {self.bfs_max_depth} degrees of separation"
+            elif over_budget():
+                stopped = f"visited {self.bfs_max_nodes} users"
+            elif time.time() - started >= self.bfs_timeout:
+                stopped = f"ran for {self.bfs_timeout} seconds"
+            if stopped:
+                break
+
+            name = "forward" if len(sides["forward"]["frontier"]) <= len(sides["backward"]["frontier"]) else "backward"
+            side, other = sides[name], sides["backward" if name == "forward" else "forward"]
+            visited, opposite_visited = side["visited"], other["visited"]
+            next_frontier = []
+
+            def expand(current_id, friends):
+                nonlocal stopped
+                for friend_id, friend_name in (friends or {}).items():
+                    if friend_id in visited:
+                        continue
+                    if over_budget():
+                        stopped = f"visited {self.bfs_max_nodes} users"
+                        return None
                     visited[friend_id] = current_id
-                    queue.append((friend_id, current_id))
                     usernames[friend_id] = friend_name
-        return False
-
-    def build_path(self, forward_visited, backward_visited):
+                    if friend_id in opposite_visited:
+                        return friend_id
+                    next_frontier.append(friend_id)
+                return None
+
+            meeting = None
+            cached = await rbx_friend_graph.get_many(side["frontier"])
+            search_stats["hits"] += len(cached)
+            for current_id, friends in cached.items():
+                total_checked += 1
+                meeting = expand(current_id, friends)
+                if meeting is not None:
+                    return self.build_path(forward_visited, backward_visited, meeting), total_checked, usernames, None
+                if stopped:
+                    break
+
+            uncached = [user_id for user_id in side["frontier"] if user_id not in cached]
+            # Friend lists fetched this level, written to `rbx_friend_graph` in one transaction
+            fetched_lists = {}
+            try:
+                # Fetched in rounds, so a huge frontier never has more than `bfs_round_size` tasks at once
+                for offset in range(0, len(uncached) if not stopped else 0, self.bfs_round_size):
+                    remaining = self.bfs_timeout - (time.time() - started)
+                    if remaining <= 0:
+                        stopped = f"ran for {self.bfs_timeout} seconds"
+                        break
+
+                    batch = uncached[offset:offset + self.bfs_round_size]
+                    search_stats["fetches"] += len(batch)
+                    tasks = [asyncio.create_task(fetch(user_id)) for user_id in batch]
+                    try:
+                        for completed in asyncio.as_completed(tasks, timeout=remaining):
+                            current_id, friends = await completed
+                            total_checked += 1
+                            if friends is not None:
+                                fetched_lists[current_id] = friends
+                            meeting = expand(current_id, friends)
+                            if meeting is not None or stopped:
+                                break
+
+                            if time.time() - last_update >= 1:
+                                await status_msg.edit(content=(
+                                    f"⚠️ Searching...\n"
+                                    f"Users checked: {total_checked}\n"
+                                    f"Forward search depth: {sides['forward']['depth']}\n"
+                                    f"Backward search depth: {sides['backward']['depth']}\n"
+                                    f"Total visited users: {len(forward_visited) + len(backward_visited)}"
+                                ))
+                                last_update = time.time()
+                    except asyncio.TimeoutError:
+                        stopped = f"ran for {self.bfs_timeout} seconds"
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+
+                    if meeting is not None or stopped:
+                        break
+            finally:
+                await rbx_friend_graph.put_many(fetched_lists)
+
+            if meeting is not None:
+                return self.build_path(forward_visited, backward_visited, meeting), total_checked, usernames, None
+            if stopped:
+                break
+            side["frontier"] = next_frontier
+            side["depth"] += 1
+
+        return None, total_checked, usernames, stopped
+
+    def build_path(self, forward_visited, backward_visited, meeting=None):
         path = []
-        current = next(iter(set(forward_visited) & set(backward_visited)))
+        if meeting is None:
+            meeting = next(iter(set(forward_visited) & set(backward_visited)))
+        current = meeting
         while current:
             path.append(current)
             current = forward_visited[current]
         path.reverse()
         
-        current = backward_visited[next(iter(set(forward_visited) & set(backward_visited)))]
+        current = backward_visited[meeting]
 
         while current:
             path.append(current)
             current = backward_visited[current]
         return path
 
-    async def send_embed(self, interaction, path, usernames, degrees, start_time, total_checked=0):
+    async def send_embed(self, interaction, path, usernames, degrees, start_time, total_checked=0, search_stats=None):
         path_str = " → ".join(f"[{usernames[i]}](https://www.roblox.com/users/{uid}/profile)" for i, uid in enumerate(path))
         elapsed_time = round(time.time() - start_time, 2)
         embed = discord.Embed(title="Friend Connection Path", description=path_str, color=0xDA8EE7)
-        embed.set_footer(text=f"Degrees of separation: {degrees} | Users checked: {total_checked} | Time taken: {elapsed_time}s")
+        footer = f"Degrees of separation: {degrees} | Users checked: {total_checked} | Time taken: {elapsed_time}s"
+        if search_stats:
+            lookups = search_stats["hits"] + search_stats["fetches"]
+            hit_rate = search_stats["hits"] / lookups * 100 if lookups else 0
+            footer += f" | Cache hits: {search_stats['hits']}/{lookups} ({hit_rate:.0f}%) | Fetches avoided: {search_stats['hits']}"
+        embed.set_footer(text=footer)
         await interaction.followup.send(embed=embed)
 
 class GloveView(View):
@@ -3,11 +3,11 @@ from bot_utils import (
     open_json,
     save_json,
     handle_logs,
+    afk_registry,
     DB
 )
 
 import time, asyncio, json
-from datetime import datetime, timezone
 
 import discord
 from discord.ext import commands
@@ -32,10 +32,10 @@ class PollButton(discord.ui.Button):
         try:
             poll_id = int(self.view.poll_id)
 
-            db.execute("DELETE FROM poll_votes WHERE poll_id = %s AND user_id = %s", (poll_id, interaction.user.id))
-            db.execute("INSERT INTO poll_votes (poll_id, user_id, option_index) VALUES (%s, %s, %s)", (poll_id, interaction.user.id, self.index))
+            await db.async_execute("DELETE FROM poll_votes WHERE poll_id = %s AND user_id = %s", (poll_id, interaction.user.id))
+            await db.async_execute("INSERT INTO poll_votes (poll_id, user_id, option_index) VALUES (%s, %s, %s)", (poll_id, interaction.user.id, self.index))
 
-            votes = db.fetch_all("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (poll_id,))
+            votes = await db.async_query("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (poll_id,))
             vote_map = {row["option_index"]: row["count"] for row in votes}
             total = sum(vote_map.values())
 
@@ -65,7 +65,7 @@ async def end_poll(bot: commands.Bot, poll_id: int):
     db = DB()
     await asyncio.sleep(1)
     try:
-        poll = db.fetch_all("SELECT * FROM polls WHERE id = %s", (poll_id,))
+        poll = await db.async_query("SELECT * FROM polls WHERE id = %s", (poll_id,))
         if not poll:
             return
         poll = poll[0]
@@ -74,7 +74,7 @@ async def end_poll(bot: commands.Bot, poll_id: int):
             await asyncio.sleep(wait_time)
 
         options = json.loads(poll["options"])
-        votes = db.fetch_all("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (poll_id,))
+        votes = await db.async_query("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (poll_id,))
         vote_map = {row["option_index"]: row["count"] for row in votes}
         total = sum(vote_map.values())
 
@@ -139,7 +139,7 @@ class PollGroup(app_commands.Group):
             start_time = int(time.time())
             end_time = start_time + int(parsed.total_seconds())
 
-            poll_id = db.insert_record(
+            poll_id = await db.async_insert(
                 "INSERT INTO polls (question, options, start_time, end_time) VALUES (%s, %s, %s, %s)",
                 (question, json.dumps(option_list), start_time, end_time)
             )
@@ -155,7 +155,7 @@ class PollGroup(app_commands.Group):
             view = PollButtonView(str(poll_id), option_list)
             message = await interaction.followup.send(embed=embed, view=view)
 
-            db.execute("UPDATE polls SET message_id = %s, channel_id = %s WHERE id = %s",
+            await db.async_execute("UPDATE polls SET message_id = %s, channel_id = %s WHERE id = %s",
                        (message.id, interaction.channel_id, poll_id))
 
             asyncio.create_task(end_poll(interaction.client, poll_id))
@@ -167,7 +167,7 @@ class PollGroup(app_commands.Group):
     async def view(self, interaction: discord.Interaction, id: int):
         db = DB()
         try:
-            poll = db.fetch_all("SELECT * FROM polls WHERE id = %s", (id,))
+            poll = await db.async_query("SELECT * FROM polls WHERE id = %s", (id,))
             if not poll:
                 return await interaction.response.send_message("Poll not found.", ephemeral=True)
             poll = poll[0]
@@ -175,7 +175,7 @@ class PollGroup(app_commands.Group):
             now = int(time.time())
             status = "Ended" if now >= poll["end_time"] else "Active"
 
-            votes = db.fetch_all("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (id,))
+            votes = await db.async_query("SELECT option_index, COUNT(*) as count FROM poll_votes WHERE poll_id = %s GROUP BY option_index", (id,))
             vote_map = {row["option_index"]: row["count"] for row in votes}
             total = sum(vote_map.values())
             vote_counts = [f"{opt}: {vote_map.get(i, 0)} votes ({(vote_map.get(i, 0) / total * 100) if total else 0:.1f}%)" for i, opt in enumerate(options)]
@@ -321,21 +321,10 @@ class UtilCog(commands.Cog):
                     await interaction.followup.send("This command can only be used in a server.")
                     return
 
-                server_info = open_json("storage/server_info.json")
-                afk_data = server_info.setdefault("afk", {}).setdefault(server_id, {})
-
-                if user_id in afk_data:
+                if not await afk_registry.set(server_id, user_id, reason, interaction.user.display_name):
                     await interaction.followup.send("You are already AFK! Talk if you want to unAFK!")
                     return
 
-                afk_data[user_id] = {
-                    "reason": reason,
-                    "time": datetime.now(timezone.utc).isoformat(),
-                    "original_name": interaction.user.display_name
-                }
-                
-                save_json("storage/server_info.json", server_info)
-
                 try:
                     await interaction.user.edit(nick=f"[AFK] {interaction.user.display_name}")
                     await interaction.followup.send(f"You are now AFK. Reason: {reason or 'None'}")
@@ -3,12 +3,12 @@ from discord.ext import commands
 from discord import app_commands
 
 from bot_utils import (
+    http_session,
     handle_logs,
 )
 
 import asyncio, tempfile, io, random, os
 import moviepy.editor as mp
-from aiohttp import ClientSession
 from moviepy.editor import VideoFileClip, AudioFileClip, vfx, CompositeVideoClip
 from urllib.parse import urlparse
 
@@ -26,7 +26,7 @@ class VideoCog(commands.Cog):
             return None, None
 
         if link is not None:
-            async with ClientSession() as session:
+            async with http_session() as session:
                 async with session.get(link) as response:
                     if response.status != 200:
                         return None, None
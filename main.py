@@ -39,16 +39,23 @@ from datetime import datetime, timezone
 import discord
 from discord.ext import commands
 from discord import app_commands
-from aiohttp import ClientSession
 from ossapi import Ossapi
 
 from typing import Union, List
 
 from bot_utils import (
+    http_client,
+    osu_api,
+    mc_uuid_cache,
+    rbx_friend_graph,
+    http_session,
     open_json,
-    save_json,
+    json_cache,
+    exp_tracker,
+    afk_registry,
+    ShardedJsonStore,
+    DB,
     cr_fetchPlayerData,
-    get_member_cooldown,
     # debug,
     error,
     warn,
@@ -69,6 +76,23 @@ botAdmins = [721151215010054165]
 botMods = [721151215010054165]
 botTesters = [721151215010054165, 776139231583010846, 872706663474429993, 1173963781706088451]
 
+# Large, frequently written data files are saved compactly with atomic writes.
+# Everything else (bot_data.json and other hand-edited files) keeps the indented format,
+# which is written through a temporary file and rename as well.
+json_cache.set_write_mode("storage/member_info.json", "atomic")
+
+# Set server_info_backend=sharded in secrets.env to store server_info.json as one file per
+# (section, guild) under storage/server_info/. The first start with it splits the single
+# file into shards once; switching back afterwards needs the shards merged by hand.
+serverInfoSections = ["afk", "exp", "tempbans", "modlogs", "modstats", "warnings", "notes", "preferences", "giveaways"]
+if os.getenv("server_info_backend", "json") == "sharded":
+    json_cache.register_backend(
+        "storage/server_info.json",
+        ShardedJsonStore("storage/server_info", serverInfoSections, legacy_path="storage/server_info.json")
+    )
+elif os.path.isdir("storage/server_info"):
+    warn("storage/server_info/ exists but server_info_backend is not \"sharded\", using storage/server_info.json instead.")
+
 # Bot status management
 class StatusManager:
     def __init__(self, bot):
@@ -123,6 +147,11 @@ class botMain(commands.Bot):
 
     async def setup_hook(self):
         self.loop.create_task(self.status_manager.change_status())
+        json_cache.start()
+        exp_tracker.start()
+        await http_client.start()
+        mc_uuid_cache.load()
+        rbx_friend_graph.start()
         
         # import logging
         # logging.basicConfig(level=logging.INFO)
@@ -144,6 +173,15 @@ class botMain(commands.Bot):
             error(f"An error occurred when loading cogs: {e}")
         print("Bot is ready.")
 
+    async def close(self):
+        await exp_tracker.close()
+        await json_cache.close()
+        await http_client.close()
+        osu_api.close()
+        await rbx_friend_graph.close()
+        DB.close_all()
+        await super().close()
+
 # Util functions
 async def load_cogs():
     for filename in os.listdir("./cogs"):
@@ -208,7 +246,7 @@ async def load_commands(bot: commands.Bot) -> None:
                         cmd._params[param_name].description = param_desc
 
 async def test_hy_key() -> bool:
-    async with ClientSession() as session:
+    async with http_session() as session:
         async with session.get(f"https://api.hypixel.net/player?key={hypixelAPI}") as response:
             if response.status == 403:
                 data = await response.json()
@@ -266,15 +304,10 @@ async def on_message(message):
     server_id = str(message.guild.id)
     member_id = str(message.author.id)
 
-    server_info = open_json("storage/server_info.json")
-    member_data = open_json("storage/member_info.json")
-
-    afk_data = server_info.setdefault("afk", {}).setdefault(server_id, {})
-
-    if member_id in afk_data:
-        original_name = afk_data[member_id].get("original_name")
-        del afk_data[member_id]
-        save_json("storage/server_info.json", server_info)
+    # AFK state is answered from afk_registry's in-memory sets, server_info is only written when it changes
+    afk_entry = await afk_registry.clear(server_id, member_id)
+    if afk_entry is not None:
+        original_name = afk_entry.get("original_name")
 
         await message.add_reaction("👋")
         await message.channel.send(f"Welcome back, {message.author.mention}! You are no longer AFK.", delete_after=3)
@@ -284,11 +317,12 @@ async def on_message(message):
             except discord.Forbidden:
                 pass
 
-    for user in message.mentions:
-        user_id = str(user.id)
-        if user_id in afk_data:
-            afk_reason = afk_data[user_id].get("reason", None)
-            afk_time = afk_data[user_id].get("time", datetime.now(timezone.utc).isoformat())
+    if message.mentions:
+        mentioned = {str(user.id): user for user in message.mentions}
+        for user_id, afk_entry in afk_registry.mentioned(server_id, mentioned):
+            user = mentioned[user_id]
+            afk_reason = afk_entry.get("reason", None)
+            afk_time = afk_entry.get("time", datetime.now(timezone.utc).isoformat())
             embed = discord.Embed(
                 title=f"{user.display_name} is AFK",
                 description=afk_reason,
@@ -297,27 +331,9 @@ async def on_message(message):
             )
             await message.channel.send(embed=embed)
 
-    cooldown = get_member_cooldown(member_id, exp=True)
-    if cooldown >= 60:
-        message_length = len(message.content)
-        exp_gain = min(75, math.floor(message_length / 15)) + (random.randint(5, 15))
-
-        if member_id not in member_data:
-            member_data[member_id] = {"EXP": {"total": 0, "cooldown": 0}}
-        
-        member_data[member_id]["EXP"]["total"] = member_data[member_id].get("EXP", {}).get("total", 0) + exp_gain
-        member_data[member_id]["EXP"]["cooldown"] = int(datetime.now(timezone.utc).timestamp())
-
-        if "exp" not in server_info:
-            server_info["exp"] = {}
-        if server_id not in server_info["exp"]:
-            server_info["exp"][server_id] = {}
-        if member_id not in server_info["exp"][server_id]:
-            server_info["exp"][server_id][member_id] = 0
-        server_info["exp"][server_id][member_id] += exp_gain
-
-        save_json("storage/member_info.json", member_data)
-        save_json("storage/server_info.json", server_info)
+    # EXP is kept in memory and written in batches by exp_tracker
+    exp_gain = min(75, math.floor(len(message.content) / 15)) + random.randint(5, 15)
+    exp_tracker.award(server_id, member_id, exp_gain)
 
 @bot.event
 async def on_connect():